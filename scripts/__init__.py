@@ -0,0 +1 @@
+"""Benchmark scripts, run from the repository root as `python -m scripts.<name>`."""
@@ -0,0 +1,74 @@
+"""
+Benchmark of the CEP lookup backends against a local mock HTTP server.
+
+Both backends query the same mock ViaCEP service (src/tests/mock_cep_server.py):
+`http` from Python over pooled keep-alive connections, `node` through the
+persistent Node workers with a provider module that calls the mock server with
+fetch(), standing in for cep-promise. Reports lookups per second, and for the
+HTTP backend how many connections were opened.
+
+Usage:
+    python -m scripts.benchmark_cep_backends --qty 5000 --delay-ms 5 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.tests.mock_cep_server import MockCepServer
+from src.utils.cep_http import HttpCepPool
+from src.utils.cep_wrapper import CepWorkerPool, workers_for_multiple_cep
+
+# Provider module for the Node workers: looks CEPs up on the mock server
+FETCH_PROVIDER = """
+export default async function lookupCep(cep) {
+    const response = await fetch(`${process.env.CEP_MOCK_URL}/ws/${cep}/json/`);
+    const payload = await response.json();
+    if (payload.erro) {
+        throw new Error("CEP NAO ENCONTRADO");
+    }
+    return { cep, state: payload.uf, city: payload.localidade, neighborhood: payload.bairro, street: payload.logradouro, service: "mock" };
+}
+"""
+
+
+async def run_lookups(pool, ceps: list[str], max_workers: int) -> float:
+    async with pool:
+        start = time.perf_counter()
+        results = await workers_for_multiple_cep(ceps, max_workers=max_workers, pool=pool)
+        elapsed = time.perf_counter() - start
+    failed = sum('error' in result for result in results)
+    if failed:
+        print(f'  ({failed} lookups failed)')
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--qty', type=int, default=5_000, help='Number of distinct CEPs to look up')
+    parser.add_argument('--delay-ms', type=float, default=5, help='Latency the mock server adds to every response')
+    parser.add_argument('--pool-size', type=int, default=4, help='Node workers, or HTTP connections per provider')
+    parser.add_argument('--max-workers', type=int, default=10, help='Concurrent lookups')
+    args = parser.parse_args()
+
+    ceps = [f'{i:08d}' for i in range(1_000_000, 1_000_000 + args.qty)]
+    with MockCepServer(delay=args.delay_ms / 1000) as server:
+        elapsed = asyncio.run(run_lookups(HttpCepPool(size=args.pool_size, providers=server.providers()), ceps, args.max_workers))
+        print(f'http:  {elapsed:.2f}s ({args.qty / elapsed:,.0f} lookups/s, {server.connections} connections opened)')
+
+        if shutil.which('node') is None:
+            print('node:  skipped, Node is not installed')
+            return
+        with tempfile.TemporaryDirectory() as tmp:
+            provider = Path(tmp) / 'fetch_provider.mjs'
+            provider.write_text(FETCH_PROVIDER, encoding='utf-8')
+            pool = CepWorkerPool(size=args.pool_size, env={'CEP_PROVIDER_MODULE': str(provider), 'CEP_MOCK_URL': server.base_url})
+            elapsed = asyncio.run(run_lookups(pool, ceps, args.max_workers))
+        print(f'node:  {elapsed:.2f}s ({args.qty / elapsed:,.0f} lookups/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of JSONL output: one aiofiles await per record versus JsonlWriter.
+
+Writes --records synthetic records shaped like `parse_result` output, in
+chunks of --chunk-size, with the previous `save_to_jsonl_file` loop and with
+the buffered writer (stdlib json, and orjson when it is installed). Record
+generation is excluded from the timings. The aiofiles baseline needs
+aiofiles installed; pass --skip-aiofiles without it.
+
+Usage:
+    python -m scripts.benchmark_jsonl_writer --records 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils import jsonl_writer
+from src.utils.jsonl_writer import JsonlWriter
+
+
+def _records(n: int) -> list[dict]:
+    return [
+        {
+            'name': 'João',
+            'middle_name': 'Maria',
+            'surnames': 'da Silva Conceição',
+            'city': 'São Paulo',
+            'state': 'São Paulo',
+            'state_abbr': 'SP',
+            'cep': f'{i % 100000:05d}-000',
+            'street': 'Rua Augusta',
+            'neighborhood': 'Consolação',
+            'building_number': str(i % 999 + 1),
+            'cpf': f'{i:011d}',
+            'rg': 'SSP/SP 12.345.678-9',
+            'pis': '',
+            'cnpj': '',
+            'cei': '',
+            'phone': '(11) 91234-5678',
+        }
+        for i in range(n)
+    ]
+
+
+async def _aiofiles_chunk(chunk: list[dict], path: Path) -> None:
+    import aiofiles
+
+    async with aiofiles.open(path, 'a', encoding='utf-8') as f:
+        for item in chunk:
+            await f.write(json.dumps(item, ensure_ascii=False) + '\n')
+
+
+def _write_aiofiles(chunks: list[list[dict]], path: Path) -> None:
+    for chunk in chunks:
+        asyncio.run(_aiofiles_chunk(chunk, path))
+
+
+def _write_buffered(chunks: list[list[dict]], path: Path) -> None:
+    with JsonlWriter(path, append=False) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1_000_000, help='Number of records to write')
+    parser.add_argument('--chunk-size', type=int, default=10_000, help='Records handed to the writer at once')
+    parser.add_argument('--skip-aiofiles', action='store_true', help='Only time JsonlWriter')
+    args = parser.parse_args()
+
+    template = _records(args.chunk_size)
+    chunks = [template[: min(args.chunk_size, args.records - start)] for start in range(0, args.records, args.chunk_size)]
+    orjson = jsonl_writer.orjson
+
+    runs = [] if args.skip_aiofiles else [('aiofiles per line', _write_aiofiles, orjson)]
+    runs.append(('JsonlWriter json', _write_buffered, None))
+    if orjson is not None:
+        runs.append(('JsonlWriter orjson', _write_buffered, orjson))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, write, serializer in runs:
+            path = Path(tmp) / 'out.jsonl'
+            path.unlink(missing_ok=True)
+            jsonl_writer.orjson = serializer
+            start = time.perf_counter()
+            write(chunks, path)
+            elapsed = time.perf_counter() - start
+            size = path.stat().st_size / (1 << 20)
+            print(f'{label:<20} {elapsed:7.2f}s  {args.records / elapsed:>12,.0f} records/s  {size:7.1f} MiB')
+    jsonl_writer.orjson = orjson
+
+
+if __name__ == '__main__':
+    main()
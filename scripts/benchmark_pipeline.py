@@ -0,0 +1,67 @@
+"""
+Benchmark for the SamplerEngine record pipeline.
+
+Reports records per second and how many location draws (state + city) each
+record costs. With the single-pass pipeline every record draws its location
+exactly once. Use --only-document to leave name generation out of the
+measurement and isolate the location, document and address stages, and
+--locations-only to time the vectorized `sample_batch` call on its own.
+
+Usage:
+    python -m scripts.benchmark_pipeline --qty 50000 --names-path ... --surnames-path ...
+"""
+
+import argparse
+import time
+
+from src.sampler import SampleOptions, SamplerEngine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--qty', type=int, default=50_000, help='Number of records to generate')
+    parser.add_argument('--json-path', default='src/data/locations_data_normalized.json')
+    parser.add_argument('--names-path', default='src/data/names_data.json')
+    parser.add_argument('--middle-names-path', default='src/data/middle_names.json')
+    parser.add_argument('--surnames-path', default='src/data/surnames_data.json')
+    parser.add_argument('--only-document', action='store_true', help='Skip name generation')
+    parser.add_argument('--locations-only', action='store_true', help='Only time location_sampler.sample_batch(qty)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = SamplerEngine(args.json_path, args.names_path, args.middle_names_path, args.surnames_path)
+    load_time = time.perf_counter() - start
+
+    if args.locations_only:
+        start = time.perf_counter()
+        engine.location_sampler.sample_batch(args.qty)
+        elapsed = time.perf_counter() - start
+        print(f'Data load:        {load_time:.3f}s')
+        print(f'Locations:        {args.qty}')
+        print(f'sample_batch:     {elapsed:.3f}s ({args.qty / elapsed:,.0f} locations/s)')
+        return
+
+    # Count location draws made while generating
+    draws = 0
+    draw_batch = engine.location_sampler.sample_batch
+
+    def counting_batch(n: int, rng=None):
+        nonlocal draws
+        draws += n
+        return draw_batch(n, rng)
+
+    engine.location_sampler.sample_batch = counting_batch
+
+    start = time.perf_counter()
+    engine.generate(args.qty, SampleOptions(always_pis=True, always_cnpj=True, always_cei=True, only_document=args.only_document))
+    elapsed = time.perf_counter() - start
+
+    print(f'Data load:        {load_time:.3f}s')
+    print(f'Records:          {args.qty}')
+    print(f'Generation time:  {elapsed:.3f}s')
+    print(f'Throughput:       {args.qty / elapsed:,.0f} records/s')
+    print(f'Location draws:   {draws / args.qty:.2f} per record')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of the memory used by worker processes holding a SamplerEngine.
+
+Starts --workers processes that each build an engine, either from the JSON
+data files or from a data bundle exported by the parent, generate a few
+records and report the memory the engine added to the process: private
+(only that worker's) and shared (page cache of the memory-mapped bundle,
+one copy for all workers). Reads /proc/self/smaps_rollup, so Linux only.
+
+Usage:
+    python -m scripts.benchmark_worker_memory --workers 4 --names-path ... --surnames-path ...
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from src.sampler import SampleOptions, SamplerEngine
+
+
+def _memory_kib() -> dict[str, int]:
+    fields = {}
+    for line in Path('/proc/self/smaps_rollup').read_text().splitlines()[1:]:
+        name, value, *_ = line.split()
+        fields[name.rstrip(':')] = int(value)
+    return {'private': fields['Private_Clean'] + fields['Private_Dirty'], 'shared': fields['Shared_Clean'] + fields['Shared_Dirty']}
+
+
+def _worker(paths: dict[str, str], bundle_path: str | None) -> tuple[float, int, int]:
+    before = _memory_kib()
+    start = time.perf_counter()
+    engine = SamplerEngine(**paths, bundle_path=bundle_path)
+    load_time = time.perf_counter() - start
+    engine.generate(1000, SampleOptions(all_data=True))
+    after = _memory_kib()
+    return load_time, after['private'] - before['private'], after['shared'] - before['shared']
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='Number of worker processes')
+    parser.add_argument('--json-path', default='src/data/locations_data_normalized.json')
+    parser.add_argument('--names-path', default='src/data/names_data.json')
+    parser.add_argument('--middle-names-path', default='src/data/middle_names.json')
+    parser.add_argument('--surnames-path', default='src/data/surnames_data.json')
+    args = parser.parse_args()
+
+    paths = {
+        'json_path': args.json_path,
+        'names_path': args.names_path,
+        'middle_names_path': args.middle_names_path,
+        'surnames_path': args.surnames_path,
+    }
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = str(Path(tmp) / 'bundle.pickle')
+        SamplerEngine(**paths).export_bundle(bundle_path)
+
+        for label, bundle in (('JSON', None), ('bundle', bundle_path)):
+            with context.Pool(args.workers) as pool:
+                results = pool.starmap(_worker, [(paths, bundle)] * args.workers)
+            load_time = sum(result[0] for result in results) / len(results)
+            private = sum(result[1] for result in results) / len(results) / 1024
+            shared = max(result[2] for result in results) / 1024
+            print(f'{label:<8} load {load_time * 1000:6.1f} ms   private {private:5.1f} MiB/worker   shared {shared:5.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,28 @@
 import json
 import random
+from bisect import bisect_right
 from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from src.utils.alias_table import AliasTable
+from src.utils.util import cep_to_int, ceps_to_ints
+
+# (first, last) CEP fields of a city's ranges
+CEP_RANGE_FIELDS = (('cep_range_begins', 'cep_range_ends'), ('cep_starts', 'cep_ends'), ('cep_starts_two', 'cep_ends_two'))
+
+
+class LocationBatch(NamedTuple):
+    """Vectorized result of `BrazilianLocationSampler.sample_batch`.
+
+    Indices refer to `batch_state_names`/`batch_state_abbrs` and
+    `batch_city_names` on the sampler that produced the batch.
+    """
+
+    states: np.ndarray  # state index per record
+    cities: np.ndarray  # city index per record
+    ceps: np.ndarray  # CEP as an integer per record, -1 when the city has none
 
 
 class BrazilianLocationSampler:
@@ -107,21 +129,236 @@ class BrazilianLocationSampler:
             if total > 0:
                 self.city_weights_by_state[state] = [w / total for w in self.city_weights_by_state[state]]
 
-    def get_state(self) -> tuple[str, str]:
+        # Alias tables make every state and city draw O(1)
+        self.state_table = AliasTable(self.state_names, self.state_weights)
+        self.city_tables_by_state = {
+            state: AliasTable(self.city_names_by_state[state], weights)
+            for state, weights in self.city_weights_by_state.items()
+            if sum(weights) > 0
+        }
+
+        self._build_batch_tables()
+
+    def _build_batch_tables(self) -> None:
+        """Pre-compute the NumPy arrays used by `sample_batch`.
+
+        The per-state city alias tables are flattened into one array, with cities
+        laid out contiguously per state. `_batch_city_offsets[s]` is where the
+        block of state s starts, so the city stage for every record is a single
+        vectorized alias lookup inside its state's block.
+        """
+        self.batch_state_names = list(self.state_names)
+        self.batch_state_abbrs = [self.data['states'][name]['state_abbr'] for name in self.state_names]
+        self.batch_city_names = []
+
+        city_prob = []
+        city_alias = []
+        cep_begins = []
+        cep_ends = []
+        self._batch_city_ceps = {}  # city index -> explicit CEP list
+        offsets = [0]
+
+        for state_abbr in self.batch_state_abbrs:
+            table = self.city_tables_by_state.get(state_abbr)
+            if table is not None:
+                offset = offsets[-1]
+                prob, alias = table.arrays()
+                city_prob.append(prob)
+                city_alias.append(alias + offset)
+
+                for city_name in table.values:
+                    city_data = self.city_data_by_name[city_name]
+                    explicit_ceps = [cep for cep in map(cep_to_int, city_data.get('ceps') or ()) if cep >= 0]
+                    if explicit_ceps:
+                        self._batch_city_ceps[len(self.batch_city_names)] = explicit_ceps
+                    begin, end = cep_to_int(city_data.get('cep_range_begins')), cep_to_int(city_data.get('cep_range_ends'))
+                    if begin >= 0 and end >= 0:
+                        cep_begins.append(begin)
+                        cep_ends.append(end)
+                    else:
+                        cep_begins.append(-1)
+                        cep_ends.append(-1)
+                    self.batch_city_names.append(city_name)
+            offsets.append(len(self.batch_city_names))
+
+        self._batch_city_prob = np.concatenate(city_prob) if city_prob else np.empty(0)
+        self._batch_city_alias = np.concatenate(city_alias) if city_alias else np.empty(0, dtype=np.int64)
+        self._batch_city_offsets = np.asarray(offsets, dtype=np.int64)
+        self._batch_city_counts = np.diff(self._batch_city_offsets)
+        self._batch_cep_begins = np.asarray(cep_begins, dtype=np.int64)
+        self._batch_cep_ends = np.asarray(cep_ends, dtype=np.int64)
+        self.np_rng = np.random.default_rng()
+        # The reverse CEP -> city table is only built when first needed
+        self._cep_bounds = None
+
+    def sample_batch(self, n: int, rng: np.random.Generator | None = None) -> LocationBatch:
+        """Draw n (state, city, CEP) triples in one vectorized pass.
+
+        Equivalent to n calls to `get_state_and_city` followed by
+        `_get_random_cep_for_city`, without any per-record Python work.
+
+        Args:
+            n: Number of locations to draw
+            rng: Optional NumPy generator (defaults to the sampler's own)
+
+        Returns:
+            LocationBatch with state indices, city indices and integer CEPs
+
+        Raises:
+            ValueError: If a drawn state has no cities with positive weight
+        """
+        rng = rng or self.np_rng
+
+        # Stage 1: states
+        states = self.state_table.sample_indices(n, rng)
+
+        counts = self._batch_city_counts[states]
+        if np.any(counts == 0):
+            missing = self.batch_state_abbrs[int(states[np.argmax(counts == 0)])]
+            raise ValueError(f'No cities found for state: {missing}')
+
+        # Stage 2: cities, an alias lookup inside each state's block
+        u = rng.random(n) * counts
+        columns = u.astype(np.int64)
+        accept = u - columns < self._batch_city_prob[columns + self._batch_city_offsets[states]]
+        columns += self._batch_city_offsets[states]
+        cities = np.where(accept, columns, self._batch_city_alias[columns])
+
+        # Stage 3: CEPs uniformly within each city's range
+        begins = self._batch_cep_begins[cities]
+        ceps = begins + (rng.random(n) * (self._batch_cep_ends[cities] - begins + 1)).astype(np.int64)
+        if self._batch_city_ceps:
+            for i in np.flatnonzero(np.isin(cities, list(self._batch_city_ceps))):
+                city_ceps = self._batch_city_ceps[int(cities[i])]
+                ceps[i] = city_ceps[rng.integers(len(city_ceps))]
+
+        return LocationBatch(states, cities, ceps)
+
+    def batch_cep_ranges(self, cities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the first and last CEP of the range of each city index from `sample_batch`.
+
+        Both are -1 for cities without a CEP range.
+        """
+        return self._batch_cep_begins[cities], self._batch_cep_ends[cities]
+
+    def _build_cep_intervals(self) -> None:
+        """Pre-compute the CEP -> city table used by `city_for_cep`.
+
+        Every range of every city (see `CEP_RANGE_FIELDS`) and every explicit
+        CEP in `ceps` is painted over the CEP line, widest first, so where ranges
+        overlap the narrowest one owns the overlap. What remains is a sorted
+        array of interval starts, `_cep_bounds`, and the city owning each
+        interval, `_cep_owners` (-1 for gaps); `_cep_bounds` has one more entry,
+        the end of the last interval.
+        """
+        self._cep_city_names = list(self.city_data_by_name)
+        starts, ends, owners = [], [], []
+        for city, city_data in enumerate(self.city_data_by_name.values()):
+            ranges = [(city_data.get(begins), city_data.get(ends)) for begins, ends in CEP_RANGE_FIELDS]
+            ranges += [(cep, cep) for cep in city_data.get('ceps') or ()]
+            for first, last in dict.fromkeys((cep_to_int(first), cep_to_int(last)) for first, last in ranges if first and last):
+                if 0 <= first <= last:
+                    starts.append(first)
+                    ends.append(last)
+                    owners.append(city)
+
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64) + 1
+        owners = np.asarray(owners, dtype=np.int64)
+        bounds = np.unique(np.concatenate([starts, ends]))
+        segment_owners = np.full(max(len(bounds) - 1, 0), -1, dtype=np.int64)
+        first_segments = np.searchsorted(bounds, starts)
+        end_segments = np.searchsorted(bounds, ends)
+        # Widest first; among equal ranges the city listed first is painted last and wins
+        for i in np.lexsort((-owners, starts - ends)).tolist():
+            segment_owners[first_segments[i] : end_segments[i]] = owners[i]
+
+        # Merge neighbouring segments of the same owner
+        keep = np.ones(len(segment_owners), dtype=bool)
+        keep[1:] = segment_owners[1:] != segment_owners[:-1]
+        self._cep_bounds = np.append(bounds[:-1][keep], bounds[-1:])
+        self._cep_owners = segment_owners[keep]
+        # Plain lists for scalar lookups, where bisect beats NumPy's per-call overhead
+        self._cep_bounds_list = self._cep_bounds.tolist()
+        self._cep_owners_list = self._cep_owners.tolist()
+
+    def _city_for_owner(self, owner: int) -> tuple[str, str] | None:
+        if owner < 0:
+            return None
+        city_name = self._cep_city_names[owner]
+        return city_name, self.city_data_by_name[city_name]['city_uf']
+
+    def city_for_cep(self, cep: str | int) -> tuple[str, str] | None:
+        """Find the city whose CEP range contains a CEP.
+
+        Args:
+            cep: CEP with or without dash, or as an integer
+
+        Returns:
+            Tuple of (city_name, state_abbreviation), or None if no city's range contains the CEP
+        """
+        if self._cep_bounds is None:
+            self._build_cep_intervals()
+        key = cep_to_int(cep)
+        segment = bisect_right(self._cep_bounds_list, key) - 1
+        if key < 0 or not 0 <= segment < len(self._cep_owners_list):
+            return None
+        return self._city_for_owner(self._cep_owners_list[segment])
+
+    def cities_for_ceps(self, ceps: list[str | int] | np.ndarray) -> list[tuple[str, str] | None]:
+        """Batch version of `city_for_cep`, with one vectorized search for all CEPs.
+
+        Args:
+            ceps: CEPs with or without dash, or an integer array such as `LocationBatch.ceps`
+
+        Returns:
+            One (city_name, state_abbreviation) tuple per CEP, None where no city's range contains it
+        """
+        if self._cep_bounds is None:
+            self._build_cep_intervals()
+        keys = ceps_to_ints(ceps)
+        if not len(self._cep_owners):
+            return [None] * len(keys)
+        segments = np.searchsorted(self._cep_bounds, keys, side='right') - 1
+        valid = (keys >= 0) & (segments >= 0) & (segments < len(self._cep_owners))
+        owners = np.where(valid, self._cep_owners[segments.clip(0, len(self._cep_owners) - 1)], -1).tolist()
+        # One tuple per distinct city, shared by all its CEPs
+        cities = {owner: self._city_for_owner(owner) for owner in set(owners)}
+        return [cities[owner] for owner in owners]
+
+    def format_ceps(self, ceps: np.ndarray, with_dash: bool = True) -> list[str]:
+        """Format integer CEPs from `sample_batch` as strings.
+
+        Args:
+            ceps: Integer CEPs (-1 marks a city without CEP data)
+            with_dash: Whether to include dash in formatted CEP
+
+        Returns:
+            List of formatted CEP strings ('' where no CEP is available)
+        """
+        if with_dash:
+            return [f'{cep // 1000:05d}-{cep % 1000:03d}' if cep >= 0 else '' for cep in ceps.tolist()]
+        return [f'{cep:08d}' if cep >= 0 else '' for cep in ceps.tolist()]
+
+    def get_state(self, rng: random.Random | None = None) -> tuple[str, str]:
         """Get a random state weighted by population percentage.
 
+        Args:
+            rng: Optional random source (defaults to the random module)
+
         Returns:
             Tuple of (state_name, state_abbreviation)
         """
-        state_name = random.choices(self.state_names, weights=self.state_weights, k=1)[0]
+        state_name = self.state_table.draw(rng)
         state_abbr = self.data['states'][state_name]['state_abbr']
         return state_name, state_abbr
 
-    def get_city(self, state_abbr: str | None = None) -> tuple[str, str]:
+    def get_city(self, state_abbr: str | None = None, rng: random.Random | None = None) -> tuple[str, str]:
         """Get a random city weighted by population percentage.
 
         Args:
             state_abbr: Optional state abbreviation to get city from specific state
+            rng: Optional random source (defaults to the random module)
 
         Returns:
             Tuple of (city_name, state_abbreviation)
@@ -130,30 +367,34 @@ class BrazilianLocationSampler:
             ValueError: If no cities found for given state
         """
         if state_abbr is None:
-            _, state_abbr = self.get_state()
+            _, state_abbr = self.get_state(rng)
 
-        if state_abbr not in self.city_weights_by_state:
+        if state_abbr not in self.city_tables_by_state:
             raise ValueError(f'No cities found for state: {state_abbr}')
 
-        city_name = random.choices(self.city_names_by_state[state_abbr], weights=self.city_weights_by_state[state_abbr], k=1)[0]
+        city_name = self.city_tables_by_state[state_abbr].draw(rng)
 
         return city_name, state_abbr
 
-    def get_state_and_city(self) -> tuple[str, str, str]:
+    def get_state_and_city(self, rng: random.Random | None = None) -> tuple[str, str, str]:
         """Get a random state and city combination weighted by population percentage.
 
+        Args:
+            rng: Optional random source (defaults to the random module)
+
         Returns:
             Tuple of (state_name, state_abbreviation, city_name)
         """
-        state_name, state_abbr = self.get_state()
-        city_name, _ = self.get_city(state_abbr)
+        state_name, state_abbr = self.get_state(rng)
+        city_name, _ = self.get_city(state_abbr, rng)
         return state_name, state_abbr, city_name
 
-    def _get_random_cep_for_city(self, city_name: str) -> str:
+    def _get_random_cep_for_city(self, city_name: str, rng: random.Random | None = None) -> str:
         """Generate random CEP from city's available CEPs or CEP range.
 
         Args:
             city_name: Name of city to get CEP for
+            rng: Optional random source (defaults to the random module)
 
         Returns:
             Random valid CEP from city's available CEPs or generated from range
@@ -165,16 +406,18 @@ class BrazilianLocationSampler:
             raise ValueError(f'City not found: {city_name}')
 
         city_data = self.city_data_by_name[city_name]
+        rng = rng or random
 
         # Try using specific CEPs first
         if city_data.get('ceps'):
-            return random.choice(city_data['ceps'])
+            return rng.choice(city_data['ceps'])
 
         # Fall back to generating from CEP range if available
         if city_data.get('cep_range_begins') and city_data.get('cep_range_ends'):
             range_start = int(city_data['cep_range_begins'].replace('-', ''))
             range_end = int(city_data['cep_range_ends'].replace('-', ''))
-            return str(random.randint(range_start, range_end))
+            # Zero-pad so CEPs in the 0xxxx-xxx range keep their leading digit
+            return f'{rng.randint(range_start, range_end):08d}'
 
     def _format_cep(self, cep: str, with_dash: bool = True) -> str:
         """Format CEP string with optional dash.
@@ -190,7 +433,14 @@ class BrazilianLocationSampler:
         return f'{cep[:5]}-{cep[5:]}' if with_dash else cep
 
     def format_full_location(
-        self, city: str, state: str, state_abbr: str, include_cep: bool = True, cep_without_dash: bool = False, name: str | None = None
+        self,
+        city: str,
+        state: str,
+        state_abbr: str,
+        include_cep: bool = True,
+        cep_without_dash: bool = False,
+        name: str | None = None,
+        rng: random.Random | None = None,
     ) -> str:
         """Format location information into a single string.
 
@@ -200,6 +450,7 @@ class BrazilianLocationSampler:
             state_abbr: State abbreviation
             include_cep: Whether to include CEP
             cep_without_dash: Whether to format CEP without dash
+            rng: Optional random source (defaults to the random module)
 
         Returns:
             Formatted location string
@@ -211,7 +462,7 @@ class BrazilianLocationSampler:
         parts = [base]
 
         if include_cep:
-            cep = self._get_random_cep_for_city(city)
+            cep = self._get_random_cep_for_city(city, rng)
             formatted_cep = self._format_cep(cep, not cep_without_dash)
             parts.append(formatted_cep)
 
@@ -224,6 +475,7 @@ class BrazilianLocationSampler:
         state_full_only: bool = False,
         only_cep: bool = False,
         cep_without_dash: bool = False,
+        rng: random.Random | None = None,
     ) -> str:
         """Get a random location with various formatting options.
 
@@ -233,23 +485,24 @@ class BrazilianLocationSampler:
             state_full_only: Return only full state name
             only_cep: Return only CEP
             cep_without_dash: Format CEP without dash
+            rng: Optional random source (defaults to the random module)
 
         Returns:
             Formatted location string according to specified options
         """
         if only_cep:
-            city_name, _ = self.get_city()
-            cep = self._get_random_cep_for_city(city_name)
+            city_name, _ = self.get_city(rng=rng)
+            cep = self._get_random_cep_for_city(city_name, rng)
             return self._format_cep(cep, not cep_without_dash)
 
         if state_abbr_only:
-            return self.get_state()[1]
+            return self.get_state(rng)[1]
 
         if state_full_only:
-            return self.get_state()[0]
+            return self.get_state(rng)[0]
 
         if city_only:
-            return self.get_city()[0]
+            return self.get_city(rng=rng)[0]
 
-        state_name, state_abbr, city_name = self.get_state_and_city()
-        return self.format_full_location(city_name, state_name, state_abbr, True, cep_without_dash)
+        state_name, state_abbr, city_name = self.get_state_and_city(rng)
+        return self.format_full_location(city_name, state_name, state_abbr, True, cep_without_dash, rng=rng)
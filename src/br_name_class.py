@@ -3,7 +3,11 @@ import random
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.utils.alias_table import AliasTable
 
 
 class TimePeriod(str, Enum):
@@ -29,6 +33,24 @@ class NameComponents:
     surname: str
 
 
+class NameBatch(NamedTuple):
+    """Index arrays for a batch of names drawn by `BrazilianNameSampler.sample_names`.
+
+    Each index array points into the vocabulary list next to it; -1 marks a
+    component that was not drawn. Surnames are indices into pre-rendered
+    vocabularies, so prefixes and "Jr." are already part of the strings.
+    """
+
+    first_names: np.ndarray
+    middle_names: np.ndarray
+    surnames: np.ndarray
+    second_surnames: np.ndarray
+    first_name_values: list[str]
+    middle_name_values: list[str]
+    surname_values: list[str]
+    second_surname_values: list[str]
+
+
 class BrazilianNameSampler:
     # Dictionary mapping surnames to their prefixes and weights
     SURNAME_PREFIXES = {
@@ -83,6 +105,71 @@ class BrazilianNameSampler:
         # Load middle names data
         self.middle_names_data = self._load_middle_names(middle_names_path) if middle_names_path else None
         self._validate_data()
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        """Pre-compute alias tables for every weighted draw.
+
+        Built once at construction so each draw is O(1) instead of rebuilding
+        the name and weight lists on every call. Empty vocabularies get no table.
+        """
+        # First names per time period
+        self.name_tables = {}
+        for period in TimePeriod:
+            names_data = self.name_data[period.value]['names']
+            self.name_tables[period.value] = self._alias_table(list(names_data), [info['percentage'] for info in names_data.values()])
+
+        # Surnames (all and top 40)
+        self.surname_table = self._alias_table(*self._surname_vocabulary(top_40=False))
+        self.top_40_table = self._alias_table(*self._surname_vocabulary(top_40=True))
+
+        # Prefix choices for surnames that take one
+        self.prefix_tables = {
+            surname: AliasTable([prefix for prefix, _ in options], [weight for _, weight in options])
+            for surname, options in self.SURNAME_PREFIXES.items()
+        }
+
+        # Middle names with positive, valid percentages
+        self.middle_name_table = None
+        if self.middle_names_data and self.middle_names_data.get('second_names'):
+            names = []
+            weights = []
+            for name, data in self.middle_names_data['second_names'].items():
+                try:
+                    percentage = float(data['percentage'])
+                except (ValueError, TypeError):
+                    continue  # Skip invalid percentage values
+                if percentage > 0:  # Only include names with positive weights
+                    names.append(name)
+                    weights.append(percentage)
+            if names:
+                self.middle_name_table = AliasTable(names, weights)
+
+        # Batch API state: rendered surname tables are built lazily per (top_40, raw, position)
+        self._rendered_surname_tables = {}
+        self.np_rng = np.random.default_rng()
+
+    def _surname_vocabulary(self, top_40: bool) -> tuple[list[str], list[float]]:
+        """Return surnames and their weights, skipping the nested top_40 dictionary."""
+        data = self.top_40_surnames if top_40 else self.surname_data
+        surnames = [surname for surname in data if surname != 'top_40']
+        return surnames, [data[surname]['percentage'] for surname in surnames]
+
+    @staticmethod
+    def _alias_table(values: list[str], weights: list[float]) -> AliasTable | None:
+        """Build an alias table, or None when there is nothing to sample from."""
+        return AliasTable(values, weights) if values else None
+
+    @staticmethod
+    def _draw(table: AliasTable | None, rng: random.Random | None = None) -> str:
+        """Draw one value from an alias table, from rng or the random module.
+
+        Raises:
+            IndexError: If the vocabulary behind the table is empty
+        """
+        if table is None:
+            raise IndexError('Cannot choose from an empty sequence')
+        return table.draw(rng)
 
     def _load_middle_names(self, path: str | Path) -> dict[str, Any]:
         """Load middle names data from JSON file."""
@@ -93,59 +180,23 @@ class BrazilianNameSampler:
                 raise ValueError('Missing required fields in middle names file')
             return data
 
-    def _should_add_middle_name(self) -> bool:
+    def _should_add_middle_name(self, rng: random.Random | None = None) -> bool:
         """Determine if a middle name should be added based on statistical data."""
         if not self.middle_names_data:
             return False
         # Use the overall percentage of people with second names
-        return random.random() < (self.middle_names_data['percentage_with_second'] / 100)
+        return (rng or random).random() < (self.middle_names_data['percentage_with_second'] / 100)
 
-    def _get_random_middle_name(self) -> str:
+    def _get_random_middle_name(self, rng: random.Random | None = None) -> str:
         """Get a random middle name based on precise frequency weights.
 
         Returns:
             A randomly selected middle name weighted by its statistical frequency
-
-        Raises:
-            ValueError: If there's an error processing the middle names data or weights
         """
-        if not self.middle_names_data or 'second_names' not in self.middle_names_data:
+        if not self.middle_name_table:
             return ''
 
-        try:
-            second_names = self.middle_names_data['second_names']
-            if not second_names:
-                return ''
-
-            # Extract names and their corresponding percentages
-            names = []
-            weights = []
-
-            # Process each name and its statistical weight
-            for name, data in second_names.items():
-                try:
-                    percentage = float(data['percentage'])
-                    if percentage > 0:  # Only include names with positive weights
-                        names.append(name)
-                        weights.append(percentage)
-                except (ValueError, TypeError):
-                    continue  # Skip invalid percentage values
-
-            if not names:
-                return ''
-
-            # Normalize weights to ensure they sum to 1.0
-            total_weight = sum(weights)
-            if total_weight <= 0:
-                return ''
-
-            normalized_weights = [w / total_weight for w in weights]
-
-            # Use normalized weights for random selection
-            return random.choices(names, weights=normalized_weights, k=1)[0]
-
-        except (KeyError, ValueError, TypeError) as err:
-            raise ValueError(f'Error processing middle names data: {err}') from err
+        return self._draw(self.middle_name_table, rng)
 
     def get_random_name(
         self,
@@ -157,33 +208,26 @@ class BrazilianNameSampler:
         always_middle: bool = False,
         only_middle: bool = False,
         return_components: bool = False,
+        rng: random.Random | None = None,
     ) -> str | NameComponents:
         """
         Get a random name from the specified time period.
-        Names will preserve their original accents unless raw=True
+        Names will preserve their original accents unless raw=True.
+        Every draw comes from rng when given, else from the random module.
         """
         if only_middle:
-            middle_name = self._get_random_middle_name()
+            middle_name = self._get_random_middle_name(rng)
             if return_components:
                 return NameComponents('', middle_name, '')
             return middle_name.upper() if raw else middle_name
 
-        period_data = self.name_data[time_period.value]
-        names_data = period_data['names']
-
-        names = []
-        weights = []
-        for name, info in names_data.items():
-            names.append(name)
-            weights.append(info['percentage'])
-
-        first_name = random.choices(names, weights=weights, k=1)[0]
+        first_name = self._draw(self.name_tables[time_period.value], rng)
         first_name = first_name.upper() if raw else first_name
 
         # Handle middle name
         middle_name = None
-        if always_middle or self._should_add_middle_name():
-            middle_name = self._get_random_middle_name()
+        if always_middle or self._should_add_middle_name(rng):
+            middle_name = self._get_random_middle_name(rng)
             middle_name = middle_name.upper() if raw else middle_name
 
         if not include_surname:
@@ -195,7 +239,7 @@ class BrazilianNameSampler:
             return full_name
 
         # Get surname
-        surname = self.get_random_surname(top_40=top_40, raw=raw, with_only_one_surname=with_only_one_surname)
+        surname = self.get_random_surname(top_40=top_40, raw=raw, with_only_one_surname=with_only_one_surname, rng=rng)
 
         if return_components:
             return NameComponents(first_name, middle_name, surname)
@@ -207,30 +251,26 @@ class BrazilianNameSampler:
         name_parts.append(surname)
         return ' '.join(name_parts)
 
-    def get_random_surname(self, top_40: bool = False, raw: bool = False, with_only_one_surname: bool = False) -> str:
+    def get_random_surname(
+        self, top_40: bool = False, raw: bool = False, with_only_one_surname: bool = False, rng: random.Random | None = None
+    ) -> str:
         """
         Get random surname(s), optionally from top 40 only.
-        Preserves original accents unless raw=True
+        Preserves original accents unless raw=True.
+        Every draw comes from rng when given, else from the random module.
         """
-        source = self.top_40_surnames if top_40 else self.surname_data
-        surnames = []
-        weights = []
-
-        for surname, info in source.items():
-            if surname != 'top_40':  # Skip the top_40 nested dictionary
-                surnames.append(surname)
-                weights.append(info['percentage'])
+        table = self.top_40_table if top_40 else self.surname_table
 
         # Get first surname
-        surname1 = random.choices(surnames, weights=weights, k=1)[0]
+        surname1 = self._draw(table, rng)
         surname1 = surname1.upper() if raw else surname1
-        surname1 = self._apply_prefix(surname1, allow_prefix=True)
+        surname1 = self._apply_prefix(surname1, allow_prefix=True, rng=rng)
 
         if with_only_one_surname:
             return surname1
 
         # Get second surname
-        surname2 = random.choices(surnames, weights=weights, k=1)[0]
+        surname2 = self._draw(table, rng)
         surname2 = surname2.upper() if raw else surname2
 
         # Don't apply prefix to the last surname to avoid ending with a prefix
@@ -242,6 +282,215 @@ class BrazilianNameSampler:
 
         return f'{surname1} {surname2}'
 
+    def sample_names(
+        self,
+        n: int,
+        time_period: TimePeriod = TimePeriod.UNTIL_2010,
+        raw: bool = False,
+        include_surname: bool = True,
+        top_40: bool = False,
+        with_only_one_surname: bool = False,
+        always_middle: bool = False,
+        only_middle: bool = False,
+        only_surname: bool = False,
+        rng: np.random.Generator | None = None,
+    ) -> NameBatch:
+        """
+        Draw n names as index arrays, without building any strings.
+        Flags mirror `get_random_name`; only_surname mirrors `get_random_surname`.
+
+        Args:
+            n: Number of names to draw
+            rng: Optional NumPy generator (defaults to the sampler's own)
+
+        Returns:
+            NameBatch to pass to `materialize_names`
+        """
+        rng = rng or self.np_rng
+        missing = np.full(n, -1, dtype=np.int64)
+
+        # First names
+        first_names = missing
+        first_name_values = []
+        if not (only_middle or only_surname):
+            table = self.name_tables[time_period.value]
+            if table is None:
+                raise IndexError('Cannot choose from an empty sequence')
+            first_names = table.sample_indices(n, rng)
+            first_name_values = [name.upper() for name in table.values] if raw else table.values
+
+        # Middle names: a presence mask, then one draw for the whole batch
+        middle_names = missing
+        middle_name_values = ['']
+        if only_middle or (not only_surname and (always_middle or self.middle_names_data)):
+            if only_middle or always_middle:
+                has_middle = np.ones(n, dtype=bool)
+            else:
+                has_middle = rng.random(n) < self.middle_names_data['percentage_with_second'] / 100
+            if self.middle_name_table is None:
+                middle_names = np.where(has_middle, 0, -1)
+            else:
+                middle_names = np.where(has_middle, self.middle_name_table.sample_indices(n, rng), -1)
+                values = self.middle_name_table.values
+                middle_name_values = [name.upper() for name in values] if raw else values
+
+        # Surname pairs
+        surnames = second_surnames = missing
+        surname_values = second_surname_values = []
+        if (include_surname or only_surname) and not only_middle:
+            table = self._rendered_surname_table(top_40, raw, second=False)
+            surnames = table.sample_indices(n, rng)
+            surname_values = table.values
+            if not with_only_one_surname:
+                table = self._rendered_surname_table(top_40, raw, second=True)
+                second_surnames = table.sample_indices(n, rng)
+                second_surname_values = table.values
+
+        return NameBatch(
+            first_names,
+            middle_names,
+            surnames,
+            second_surnames,
+            first_name_values,
+            middle_name_values,
+            surname_values,
+            second_surname_values,
+        )
+
+    @staticmethod
+    def materialize_names(batch: NameBatch, return_components: bool = False) -> list[str] | list[NameComponents]:
+        """
+        Build the name strings (or components) for a batch from `sample_names`.
+
+        Args:
+            batch: Index arrays drawn by `sample_names`
+            return_components: Return NameComponents instead of full name strings
+
+        Returns:
+            One name or NameComponents per record
+        """
+
+        def lookup(indices: np.ndarray, values: list[str], default: str | None) -> list[str | None]:
+            return [values[i] if i >= 0 else default for i in indices.tolist()]
+
+        firsts = lookup(batch.first_names, batch.first_name_values, '')
+        middles = lookup(batch.middle_names, batch.middle_name_values, None)
+        surnames = lookup(batch.surnames, batch.surname_values, '')
+        if len(batch.second_surname_values):
+            surnames = [
+                f'{first} {second}'
+                for first, second in zip(surnames, lookup(batch.second_surnames, batch.second_surname_values, ''), strict=True)
+            ]
+
+        if return_components:
+            return [NameComponents(*parts) for parts in zip(firsts, middles, surnames, strict=True)]
+        return [' '.join(part for part in parts if part) for parts in zip(firsts, middles, surnames, strict=True)]
+
+    def get_random_names(
+        self,
+        n: int,
+        time_period: TimePeriod = TimePeriod.UNTIL_2010,
+        raw: bool = False,
+        include_surname: bool = True,
+        top_40: bool = False,
+        with_only_one_surname: bool = False,
+        always_middle: bool = False,
+        only_middle: bool = False,
+        return_components: bool = False,
+        rng: np.random.Generator | None = None,
+    ) -> list[str] | list[NameComponents]:
+        """
+        Get n random names at once; the batch counterpart of `get_random_name`.
+        Names follow the same distribution, but are drawn as NumPy index arrays
+        and only turned into strings at the end.
+        """
+        batch = self.sample_names(
+            n,
+            time_period=time_period,
+            raw=raw,
+            include_surname=include_surname,
+            top_40=top_40,
+            with_only_one_surname=with_only_one_surname,
+            always_middle=always_middle,
+            only_middle=only_middle,
+            rng=rng,
+        )
+        return self.materialize_names(batch, return_components=return_components)
+
+    def get_random_surnames(
+        self, n: int, top_40: bool = False, raw: bool = False, with_only_one_surname: bool = False, rng: np.random.Generator | None = None
+    ) -> list[str]:
+        """Get n random surnames at once; the batch counterpart of `get_random_surname`."""
+        batch = self.sample_names(n, raw=raw, top_40=top_40, with_only_one_surname=with_only_one_surname, only_surname=True, rng=rng)
+        return [components.surname for components in self.materialize_names(batch, return_components=True)]
+
+    def _rendered_surname_table(self, top_40: bool, raw: bool, second: bool) -> AliasTable:
+        """
+        Alias table over fully rendered surnames for one position in the pair.
+
+        The first surname carries every outcome of `_apply_prefix` as its own
+        value, weighted by the surname's weight times the outcome's probability,
+        so a single draw picks both the surname and its prefix. The second
+        surname never takes a prefix and turns JUNIOR/JR into "Jr.".
+
+        Raises:
+            IndexError: If the surname vocabulary is empty
+        """
+        key = (top_40, raw, second)
+        if key not in self._rendered_surname_tables:
+            weights_by_value = {}
+            for name, weight in zip(*self._surname_vocabulary(top_40), strict=True):
+                surname = name.upper() if raw else name
+                if second:
+                    variants = [(('JR' if raw else 'Jr.') if surname.upper() in ('JUNIOR', 'JR') else surname, 1.0)]
+                else:
+                    variants = self._prefix_variants(surname)
+                for value, probability in variants:
+                    weights_by_value[value] = weights_by_value.get(value, 0.0) + weight * probability
+            if not weights_by_value:
+                raise IndexError('Cannot choose from an empty sequence')
+            self._rendered_surname_tables[key] = AliasTable(list(weights_by_value), list(weights_by_value.values()))
+        return self._rendered_surname_tables[key]
+
+    def _prefix_variants(self, surname: str) -> list[tuple[str, float]]:
+        """
+        Enumerate every result of `_apply_prefix(surname)` with its probability.
+
+        Must be kept in sync with `_apply_prefix`.
+        """
+        surname_upper = surname.upper()
+        if surname_upper not in self.SURNAME_PREFIXES:
+            return [(surname, 1.0)]
+
+        is_raw = surname.isupper()
+
+        def cased(prefix: str) -> str:
+            return prefix.upper() if is_raw else prefix
+
+        variants = []
+        remaining = 1.0
+        if surname_upper in ['SANTOS', 'SILVA']:
+            variants.append((f'{surname} {cased("e")}', 0.05))
+            variants.append((f'{surname} {cased("da")}', 0.10 * 0.7))
+            variants.append((f'{surname} {cased("do")}', 0.10 * 0.3))
+            remaining = 0.85
+
+        options = self.SURNAME_PREFIXES[surname_upper]
+        total = sum(weight for _, weight in options)
+        for prefix, weight in options:
+            probability = remaining * weight / total
+            if prefix in ['da', 'do']:
+                plural = 'dos' if prefix == 'do' else 'das'
+                variants.append((f'{cased(plural)} {surname}', probability * 0.08))
+                variants.append((f'{cased(prefix)} {surname}', probability * 0.92))
+            elif prefix == 'de' and surname[0].lower() in 'aeiou':
+                # No space for the d' prefix
+                variants.append((cased("d'") + surname, probability * 0.7))
+                variants.append((f'{cased(prefix)} {surname}', probability * 0.3))
+            else:
+                variants.append((f'{cased(prefix)} {surname}', probability))
+        return variants
+
     def _validate_data(self) -> None:
         """
         Validate the name data structure has all required time periods and correct format.
@@ -280,7 +529,7 @@ class BrazilianNameSampler:
                 if not required_keys.issubset(data.keys()):
                     raise ValueError(f'Invalid middle name entry structure for {name}. Missing required keys.')
 
-    def _apply_prefix(self, surname: str, allow_prefix: bool = True) -> str:
+    def _apply_prefix(self, surname: str, allow_prefix: bool = True, rng: random.Random | None = None) -> str:
         """
         Apply prefix to surname based on complex rules and probabilities.
         Supports multiple prefix options, compound surnames, and special cases.
@@ -288,6 +537,7 @@ class BrazilianNameSampler:
         Args:
             surname: The surname to potentially prefix
             allow_prefix: Whether to allow adding a prefix (default: True)
+            rng: Optional random source (defaults to the random module)
 
         Returns:
             The surname with or without prefix based on probability rules
@@ -301,13 +551,14 @@ class BrazilianNameSampler:
         # If prefixes are not allowed, return the surname as is
         if not allow_prefix:
             return surname
+        rng = rng or random
         is_raw = surname.isupper()
         surname_upper = surname.upper()
 
         if surname_upper in self.SURNAME_PREFIXES:
             # Handle compound surname patterns first
             if surname_upper in ['SANTOS', 'SILVA']:
-                compound_chance = random.random()
+                compound_chance = rng.random()
                 compound_prefix = None  # Using a different variable name to avoid shadowing
 
                 if compound_chance < 0.05:  # 5% chance for compound with "e"
@@ -315,30 +566,22 @@ class BrazilianNameSampler:
                     return f'{surname} {compound_prefix}'
 
                 if compound_chance < 0.15:  # Additional 10% chance for compound with "da/do"
-                    compound_prefix = ('DA' if random.random() < 0.7 else 'DO') if is_raw else ('da' if random.random() < 0.7 else 'do')
+                    compound_prefix = ('DA' if rng.random() < 0.7 else 'DO') if is_raw else ('da' if rng.random() < 0.7 else 'do')
                     return f'{surname} {compound_prefix}'
 
             # Regular prefix handling with multiple options
-            prefix_options = self.SURNAME_PREFIXES[surname_upper]
-            total_weight = sum(weight for _, weight in prefix_options)
-            rand = random.random() * total_weight
-
-            cumulative = 0
-            for candidate_prefix, weight in prefix_options:  # Renamed loop variable to avoid shadowing
-                cumulative += weight
-                if rand <= cumulative:
-                    final_prefix = candidate_prefix  # Store the selected prefix in a new variable
-
-                    # Handle special cases for the selected prefix
-                    if final_prefix in ['da', 'do'] and random.random() < 0.08:
-                        final_prefix = ('DOS' if final_prefix == 'do' else 'DAS') if is_raw else ('dos' if final_prefix == 'do' else 'das')
-                    elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and random.random() < 0.7:
-                        final_prefix = "D'" if is_raw else "d'"
-                        # No space for D' prefix
-                        return f'{final_prefix}{surname}'
-                    else:
-                        final_prefix = final_prefix.upper() if is_raw else final_prefix
-
-                    return f'{final_prefix} {surname}'
+            final_prefix = self.prefix_tables[surname_upper].draw(rng)
+
+            # Handle special cases for the selected prefix
+            if final_prefix in ['da', 'do'] and rng.random() < 0.08:
+                final_prefix = ('DOS' if final_prefix == 'do' else 'DAS') if is_raw else ('dos' if final_prefix == 'do' else 'das')
+            elif final_prefix == 'de' and surname[0].lower() in 'aeiou' and rng.random() < 0.7:
+                final_prefix = "D'" if is_raw else "d'"
+                # No space for D' prefix
+                return f'{final_prefix}{surname}'
+            else:
+                final_prefix = final_prefix.upper() if is_raw else final_prefix
+
+            return f'{final_prefix} {surname}'
 
         return surname
@@ -96,24 +96,35 @@ class BrazilianRG:
         self.include_state_prefix = include_state_prefix
         self.only_rg = only_rg
 
-    def _generate_from_pattern(self, pattern):
+    def _generate_from_pattern(self, pattern, rng=None):
         """
         Generate a string by replacing each '#' in the pattern with a random digit (0-9).
         """
-        return ''.join(str(random.randint(0, 9)) if char == '#' else char for char in pattern)
+        rng = rng or random
+        return ''.join(str(rng.randint(0, 9)) if char == '#' else char for char in pattern)
 
-    def generate(self, state: str | None = None, include_issuer: bool = True, include_state_prefix: bool = False, only_rg: bool = False):
+    def generate(
+        self,
+        state: str | None = None,
+        include_issuer: bool = True,
+        include_state_prefix: bool = False,
+        only_rg: bool = False,
+        rng: random.Random | None = None,
+    ):
         """
         Generate a complete, realistic RG number string according to the state-specific pattern.
 
         For Minas Gerais (MG), a random decision is made whether to include the state prefix.
         For other states, the include_state_prefix flag controls this behavior.
 
+        Args:
+            rng: Random source of the digits and the MG prefix; defaults to the random module
+
         Returns:
             A string representing the final RG number, optionally prefixed with the issuer and/or state code.
         """
         pattern = BrazilianRG.STATE_PATTERNS[self.state]
-        rg_number = self._generate_from_pattern(pattern)
+        rg_number = self._generate_from_pattern(pattern, rng)
 
         if self.only_rg:
             return rg_number
@@ -126,7 +137,7 @@ class BrazilianRG:
         # For MG, randomly decide to include the "MG" prefix (state code).
         if self.state == 'MG':
             # Randomly choose True or False
-            mg_prefix = random.choice([True, False])
+            mg_prefix = (rng or random).choice([True, False])
             if mg_prefix:
                 parts.append('MG')
         else:
@@ -1,17 +1,36 @@
 import os
+import sqlite3
 import sys
+from collections.abc import Iterator
 from datetime import timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 import typer
 from loguru import logger
-from ptbr_sampler.name_generator import NameComponents, TimePeriod
-from ptbr_sampler.sampler import sample as sampler_sample
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 from rich.table import Table
 
+from src.br_name_class import NameComponents, TimePeriod
+from src.data_bundle import DEFAULT_BUNDLE_PATH
+from src.sampler import SamplerEngine, get_engine
+from src.sampler import sample as sampler_sample
+from src.utils.cep_cache import DEFAULT_CACHE_PATH, DEFAULT_ERROR_TTL_HOURS, DEFAULT_TTL_HOURS, CepCache, get_cep_cache
+from src.utils.cep_index import DEFAULT_INDEX_PATH, build_cep_index, read_address_file
+from src.utils.cep_wrapper import DEFAULT_POOL_SIZE, CepBackend
+from src.utils.parquet_writer import OutputFormat
+from src.utils.retry_policy import (
+    DEFAULT_BASE_DELAY,
+    DEFAULT_BREAKER_COOLDOWN,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_DELAY,
+    DEFAULT_MAX_ELAPSED,
+    RetryPolicy,
+)
+from src.validator import DEFAULT_VALIDATION_CHUNK_SIZE, DocumentKind, FileFormat, validate_file
+
 # Configure logger
 logger.remove()  # Remove default handler
 logger.add(
@@ -37,7 +56,19 @@ app = typer.Typer(help='BR data sampler CLI', add_completion=False)
 # Basic options
 DEFAULT_QTY = typer.Option(1, '--qty', '-q', help='Number of samples to generate', rich_help_panel='Basic Options')
 ALL_DATA = typer.Option(False, '--all', '-a', help='Include all possible data in the generated samples', rich_help_panel='Basic Options')
-SAVE_TO_JSONL = typer.Option(None, '--save-to-jsonl', '-sj', help='Save generated samples to a JSONL file', rich_help_panel='Basic Options')
+SAVE_TO_JSONL = typer.Option(
+    None,
+    '--save-to-jsonl',
+    '-sj',
+    help='Save generated samples to a JSONL file (.jsonl.gz or .jsonl.zst to compress it)',
+    rich_help_panel='Basic Options',
+)
+OUTPUT_FORMAT = typer.Option(
+    OutputFormat.JSONL,
+    '--format',
+    help='Format of the --save-to-jsonl file: JSONL, or columnar Parquet written in row groups (needs pyarrow, never appended to)',
+    rich_help_panel='Basic Options',
+)
 APPEND_TO_JSONL = typer.Option(True, '--append', '-ap', help='Append to JSONL file instead of overwriting', rich_help_panel='Basic Options')
 # New convenience options
 BATCH = typer.Option(
@@ -47,6 +78,22 @@ BATCH = typer.Option(
     help='Maximum samples per batch before saving (processes large requests in smaller chunks)',
     rich_help_panel='Basic Options',
 )
+SEED = typer.Option(
+    None, '--seed', help='Seed making the samples reproducible, whatever the number of workers', rich_help_panel='Basic Options'
+)
+OFFSET = typer.Option(
+    0,
+    '--offset',
+    min=0,
+    help='Index of the first sample of the seeded dataset to generate (requires --seed)',
+    rich_help_panel='Basic Options',
+)
+LIMIT = typer.Option(
+    None, '--limit', min=1, help='Number of samples to generate from --offset (overrides --qty)', rich_help_panel='Basic Options'
+)
+WORKERS = typer.Option(
+    1, '--workers', '-w', min=1, help='Number of processes generating samples in parallel', rich_help_panel='Performance Options'
+)
 EASY = typer.Option(
     None, '--easy', '-e', help='Easy mode with integer qty (enables API calls, all data, and auto-saves)', rich_help_panel='Basic Options'
 )
@@ -66,6 +113,78 @@ MAKE_API_CALL = typer.Option(
     help='Make API calls to retrieve real CEP data instead of generating synthetic address data',
     rich_help_panel='Location Options',
 )
+CEP_BACKEND = typer.Option(
+    CepBackend.NODE,
+    '--cep-backend',
+    help='How --make-api-call looks CEPs up: Node workers running cep-promise, or HTTP requests made from Python',
+    rich_help_panel='Location Options',
+)
+CEP_POOL_SIZE = typer.Option(
+    DEFAULT_POOL_SIZE,
+    '--cep-workers',
+    '-cw',
+    help='Number of persistent Node CEP workers (or HTTP connections per provider) used by --make-api-call',
+    rich_help_panel='Location Options',
+)
+CEP_CACHE_PATH = typer.Option(
+    DEFAULT_CACHE_PATH, '--cep-cache', help='SQLite file caching CEP lookups across runs', rich_help_panel='Location Options'
+)
+CEP_INDEX_PATH = typer.Option(
+    None,
+    '--cep-index',
+    exists=True,
+    dir_okay=False,
+    help='CEP index file (see build-cep-index) giving real streets and neighborhoods without --make-api-call',
+    rich_help_panel='Location Options',
+)
+NO_CEP_CACHE = typer.Option(False, '--no-cep-cache', help='Do not read or write the CEP lookup cache', rich_help_panel='Location Options')
+CEP_CACHE_TTL_HOURS = typer.Option(
+    DEFAULT_TTL_HOURS, '--cep-cache-ttl', help='Hours a cached CEP lookup stays valid', rich_help_panel='Location Options'
+)
+CEP_CACHE_ERROR_TTL_HOURS = typer.Option(
+    DEFAULT_ERROR_TTL_HOURS,
+    '--cep-cache-error-ttl',
+    help='Hours a failed CEP lookup (e.g. unknown CEP) stays cached',
+    rich_help_panel='Location Options',
+)
+CEP_MAX_ATTEMPTS = typer.Option(
+    DEFAULT_MAX_ATTEMPTS,
+    '--cep-max-attempts',
+    help='Attempts per CEP lookup when the service or a worker fails',
+    rich_help_panel='Location Options',
+)
+CEP_RETRY_DELAY = typer.Option(
+    DEFAULT_BASE_DELAY,
+    '--cep-retry-delay',
+    help='Seconds before the first CEP lookup retry; doubles on every retry, with jitter',
+    rich_help_panel='Location Options',
+)
+CEP_RETRY_MAX_DELAY = typer.Option(
+    DEFAULT_MAX_DELAY,
+    '--cep-retry-max-delay',
+    help='Longest wait in seconds between two CEP lookup attempts',
+    rich_help_panel='Location Options',
+)
+CEP_RETRY_MAX_TIME = typer.Option(
+    DEFAULT_MAX_ELAPSED,
+    '--cep-retry-max-time',
+    help='Seconds after which a CEP lookup is no longer retried',
+    rich_help_panel='Location Options',
+)
+CEP_BREAKER_THRESHOLD = typer.Option(
+    DEFAULT_BREAKER_THRESHOLD,
+    '--cep-breaker-threshold',
+    min=0.0,
+    max=1.0,
+    help='Share of failed recent CEP lookup attempts that stops further lookups (0 disables)',
+    rich_help_panel='Location Options',
+)
+CEP_BREAKER_COOLDOWN = typer.Option(
+    DEFAULT_BREAKER_COOLDOWN,
+    '--cep-breaker-cooldown',
+    help='Seconds CEP lookups are failed fast before the service is tried again',
+    rich_help_panel='Location Options',
+)
 
 # Name options
 TIME_PERIOD = typer.Option(
@@ -129,6 +248,61 @@ LOCATIONS_PATH = typer.Option(
     help='Path to the locations data JSON file',
     rich_help_panel='Data Source Options',
 )
+DATA_BUNDLE_PATH = typer.Option(
+    DEFAULT_BUNDLE_PATH,
+    '--data-bundle',
+    help='Data bundle (see compile-data) loaded instead of the JSON files while it is up to date',
+    rich_help_panel='Data Source Options',
+)
+NO_DATA_BUNDLE = typer.Option(False, '--no-data-bundle', help='Always load the JSON data files', rich_help_panel='Data Source Options')
+
+# Validation options
+VALIDATE_PATH = typer.Argument(..., help='JSONL or CSV file to validate', exists=True, dir_okay=False)
+VALIDATE_KIND = typer.Option(..., '--kind', '-k', help='Type of document stored in the column', rich_help_panel='Validation Options')
+VALIDATE_COLUMN = typer.Option(
+    None,
+    '--column',
+    '-c',
+    help='JSON key or CSV header of the column (defaults to the document kind)',
+    rich_help_panel='Validation Options',
+)
+VALIDATE_FORMAT = typer.Option(
+    None, '--format', '-f', help='Input format (detected from the file extension by default)', rich_help_panel='Validation Options'
+)
+VALIDATE_DELIMITER = typer.Option(',', '--delimiter', '-d', help='CSV field delimiter', rich_help_panel='Validation Options')
+VALIDATE_NO_PAD = typer.Option(
+    False, '--no-pad', help='Treat identifiers that lost their leading zeros as invalid', rich_help_panel='Validation Options'
+)
+VALIDATE_CHUNK_SIZE = typer.Option(
+    DEFAULT_VALIDATION_CHUNK_SIZE, '--chunk-size', '-cs', help='Number of rows validated per chunk', rich_help_panel='Performance Options'
+)
+VALIDATE_WORKERS = typer.Option(1, '--workers', '-w', help='Number of processes validating chunks', rich_help_panel='Performance Options')
+VALIDATE_SHOW_INVALID = typer.Option(
+    20, '--show-invalid', '-si', help='Number of invalid row numbers to print', rich_help_panel='Output Options'
+)
+VALIDATE_INVALID_ROWS_FILE = typer.Option(
+    None, '--invalid-rows-file', '-irf', help='Write every invalid row number to this file, one per line', rich_help_panel='Output Options'
+)
+
+# CEP index options
+INDEX_OUTPUT = typer.Option(DEFAULT_INDEX_PATH, '--output', '-o', help='Index file to write', rich_help_panel='Output Options')
+INDEX_CEP_CACHE_PATH = typer.Option(
+    DEFAULT_CACHE_PATH, '--cep-cache', help='CEP lookup cache whose successful lookups are indexed', rich_help_panel='Source Options'
+)
+INDEX_NO_CEP_CACHE = typer.Option(False, '--no-cep-cache', help='Do not harvest the CEP lookup cache', rich_help_panel='Source Options')
+INDEX_IMPORT = typer.Option(
+    None,
+    '--import',
+    '-i',
+    help='CSV or JSONL file of addresses to index (cep, street/logradouro, neighborhood/bairro, city/localidade, state/uf); repeatable',
+    exists=True,
+    dir_okay=False,
+    rich_help_panel='Source Options',
+)
+INDEX_DELIMITER = typer.Option(',', '--delimiter', '-d', help='CSV field delimiter of imported files', rich_help_panel='Source Options')
+
+# Data bundle options
+BUNDLE_OUTPUT = typer.Option(DEFAULT_BUNDLE_PATH, '--output', '-o', help='Data bundle file to write', rich_help_panel='Output Options')
 
 
 def _format_document_lines(doc: dict[str, str]) -> list[str]:
@@ -299,6 +473,19 @@ def sample(
     only_cep: bool = ONLY_CEP,
     cep_without_dash: bool = CEP_WITHOUT_DASH,
     make_api_call: bool = MAKE_API_CALL,
+    cep_backend: CepBackend = CEP_BACKEND,
+    cep_pool_size: int = CEP_POOL_SIZE,
+    cep_cache_path: Path = CEP_CACHE_PATH,
+    no_cep_cache: bool = NO_CEP_CACHE,
+    cep_cache_ttl_hours: float = CEP_CACHE_TTL_HOURS,
+    cep_cache_error_ttl_hours: float = CEP_CACHE_ERROR_TTL_HOURS,
+    cep_index_path: Path = CEP_INDEX_PATH,
+    cep_max_attempts: int = CEP_MAX_ATTEMPTS,
+    cep_retry_delay: float = CEP_RETRY_DELAY,
+    cep_retry_max_delay: float = CEP_RETRY_MAX_DELAY,
+    cep_retry_max_time: float = CEP_RETRY_MAX_TIME,
+    cep_breaker_threshold: float = CEP_BREAKER_THRESHOLD,
+    cep_breaker_cooldown: float = CEP_BREAKER_COOLDOWN,
     time_period: TimePeriod = TIME_PERIOD,
     return_only_name: bool = RETURN_ONLY_NAME,
     name_raw: bool = NAME_RAW,
@@ -326,11 +513,18 @@ def sample(
     only_document: bool = ONLY_DOCUMENT,
     surnames_path: Path = SURNAMES_PATH,
     locations_path: Path = LOCATIONS_PATH,
+    data_bundle_path: Path = DATA_BUNDLE_PATH,
+    no_data_bundle: bool = NO_DATA_BUNDLE,
     save_to_jsonl: str = SAVE_TO_JSONL,
+    output_format: OutputFormat = OUTPUT_FORMAT,
     all_data: bool = ALL_DATA,
     batch: int = BATCH,
     easy: int = EASY,
     append_to_jsonl: bool = APPEND_TO_JSONL,
+    seed: int = SEED,
+    offset: int = OFFSET,
+    limit: int = LIMIT,
+    workers: int = WORKERS,
 ) -> None:
     """Generate random Brazilian samples with comprehensive information.
 
@@ -345,6 +539,19 @@ def sample(
         state_full_only: Return only full state names
         only_cep: Return only CEP
         cep_without_dash: Format CEP without dash
+        cep_backend: How CEPs are looked up for API calls (node or http)
+        cep_pool_size: Number of persistent Node CEP workers (or HTTP connections per provider) used for API calls
+        cep_cache_path: SQLite file caching CEP lookups across runs
+        no_cep_cache: Do not read or write the CEP lookup cache
+        cep_cache_ttl_hours: Hours a cached CEP lookup stays valid
+        cep_cache_error_ttl_hours: Hours a failed CEP lookup stays cached
+        cep_index_path: CEP index file giving real streets and neighborhoods without API calls
+        cep_max_attempts: Attempts per CEP lookup when the service or a worker fails
+        cep_retry_delay: Seconds before the first CEP lookup retry
+        cep_retry_max_delay: Longest wait between two CEP lookup attempts
+        cep_retry_max_time: Seconds after which a CEP lookup is no longer retried
+        cep_breaker_threshold: Failure rate of recent attempts that stops further lookups (0 disables)
+        cep_breaker_cooldown: Seconds lookups are failed fast before the service is tried again
         time_period: Time period for name sampling
         return_only_name: Return only names without location
         name_raw: Return names in raw format (all caps)
@@ -370,15 +577,26 @@ def sample(
         only_document: Return only documents
         surnames_path: Path to surnames data file
         locations_path: Path to locations data JSON file
+        data_bundle_path: Data bundle loaded instead of the JSON files while it is up to date
+        no_data_bundle: Always load the JSON data files
         save_to_jsonl: Path to save generated samples as JSONL
+        output_format: Format of the saved file (jsonl or parquet)
         all_data: Include all possible data in the generated samples
         batch: Maximum number of samples per batch before saving to file
         easy: Easy mode with integer qty (enables API calls, all data, and auto-saves)
         append_to_jsonl: Append to JSONL file instead of overwriting
+        seed: Seed making the samples reproducible, whatever the number of workers
+        offset: Index of the first sample of the seeded dataset to generate
+        limit: Number of samples to generate from offset (overrides qty)
+        workers: Number of processes generating samples in parallel
 
     Raises:
         typer.Exit: If an error occurs during execution
     """
+    if offset and seed is None:
+        # Without a seed there is no fixed dataset to take a range of
+        console.print('[red]Error: --offset requires --seed[/red]')
+        raise typer.Exit(code=1)
 
     try:
         # Process easy mode if specified
@@ -389,7 +607,7 @@ def sample(
             make_api_call = True
             all_data = True
             always_phone = True
-            save_to_jsonl = 'output/output.jsonl'
+            save_to_jsonl = f'output/output.{output_format.value}'
 
             # Ensure output directory exists
             output_dir = os.path.dirname(save_to_jsonl)
@@ -398,11 +616,32 @@ def sample(
                 logger.info(f'Creating output directory: {output_dir}')
                 os.makedirs(output_dir)
 
+        cep_retry_policy = RetryPolicy(
+            max_attempts=cep_max_attempts,
+            base_delay=cep_retry_delay,
+            max_delay=cep_retry_max_delay,
+            max_elapsed=cep_retry_max_time,
+            breaker_threshold=cep_breaker_threshold,
+            breaker_cooldown=cep_breaker_cooldown,
+        )
+
         # Set up batch processing if enabled
         use_batches = False
         batch_size = 0
 
-        if batch is not None and batch > 0 and save_to_jsonl:
+        if limit is not None:
+            qty = limit
+
+        sharded = workers > 1 or seed is not None
+        if sharded and batch is not None:
+            # Shards are already written one at a time; batches would restart the seeded streams
+            console.print('[yellow]--batch is ignored with --workers or --seed[/yellow]')
+            logger.info('Batch mode disabled: sharded generation writes shards as they finish')
+        elif output_format == OutputFormat.PARQUET and batch is not None:
+            # Batches append to the file, which Parquet cannot do; row groups already bound memory
+            console.print('[yellow]--batch is ignored with --format parquet[/yellow]')
+            logger.info('Batch mode disabled: Parquet output is written one row group at a time')
+        elif batch is not None and batch > 0 and save_to_jsonl:
             batch_size = min(batch, qty)  # Ensure batch size doesn't exceed total quantity
             use_batches = batch_size < qty  # Only use batches if we have multiple batches
 
@@ -422,7 +661,7 @@ def sample(
                 f'Always phone: [{"green" if always_phone else "red"}]{always_phone}[/]',
             ]
             if save_to_jsonl:
-                save_mode = '[green]append[/]' if append_to_jsonl else '[yellow]overwrite[/]'
+                save_mode = '[green]append[/]' if append_to_jsonl and output_format == OutputFormat.JSONL else '[yellow]overwrite[/]'
                 config_summary.append(f'Save to: [cyan]{save_to_jsonl}[/] ({save_mode})')
                 if use_batches:
                     config_summary.append(f'Batch size: [cyan]{batch_size}[/] samples')
@@ -435,9 +674,11 @@ def sample(
                 console.print(f'  [cyan]•[/cyan] {item}')
             console.print()
 
-        # Process in batches or as a single run
-        all_results = []
+        # Load the datasets once; every batch below reuses the same engine
+        bundle_path = None if no_data_bundle else data_bundle_path
+        engine = get_engine(json_path, names_path, middle_names_path, surnames_path, locations_path, bundle_path)
 
+        # Process in batches or as a single run
         if use_batches:
             # Use batched processing with progress display
             logger.info(f'Starting batch processing of {qty} samples')
@@ -512,7 +753,7 @@ def sample(
 
                     # Process the current batch
                     try:
-                        batch_results = sampler_sample(
+                        sampler_sample(
                             qty=current_batch_size,
                             q=None,
                             city_only=city_only,
@@ -521,6 +762,13 @@ def sample(
                             only_cep=only_cep,
                             cep_without_dash=cep_without_dash,
                             make_api_call=make_api_call,
+                            cep_backend=cep_backend,
+                            cep_index_path=cep_index_path,
+                            cep_pool_size=cep_pool_size,
+                            cep_cache_path=None if no_cep_cache else cep_cache_path,
+                            cep_cache_ttl_hours=cep_cache_ttl_hours,
+                            cep_cache_error_ttl_hours=cep_cache_error_ttl_hours,
+                            cep_retry_policy=cep_retry_policy,
                             time_period=time_period,
                             return_only_name=return_only_name,
                             name_raw=name_raw,
@@ -552,6 +800,8 @@ def sample(
                             all_data=all_data,
                             progress_callback=progress_callback,
                             append_to_jsonl=(append_to_jsonl or not first_batch),  # Force append for all batches after the first
+                            engine=engine,
+                            return_results=False,  # Batches are streamed to the file, not kept in memory
                         )
                         logger.info(f'Batch {batch_num} processed successfully')
                     except Exception as e:
@@ -561,12 +811,6 @@ def sample(
                     # Force append mode after the first batch
                     first_batch = False
 
-                    # Save this batch's results
-                    if isinstance(batch_results, list):
-                        all_results.extend(batch_results)
-                    else:
-                        all_results.append(batch_results)
-
                     # Update completed count
                     samples_completed += current_batch_size
 
@@ -631,7 +875,7 @@ def sample(
 
                 # Call the sample function from the sampler module with all parameters
                 try:
-                    all_results = sampler_sample(
+                    sampler_sample(
                         qty=qty,
                         q=None,  # We don't use this alias in the CLI
                         city_only=city_only,
@@ -640,6 +884,13 @@ def sample(
                         only_cep=only_cep,
                         cep_without_dash=cep_without_dash,
                         make_api_call=make_api_call,
+                        cep_backend=cep_backend,
+                        cep_index_path=cep_index_path,
+                        cep_pool_size=cep_pool_size,
+                        cep_cache_path=None if no_cep_cache else cep_cache_path,
+                        cep_cache_ttl_hours=cep_cache_ttl_hours,
+                        cep_cache_error_ttl_hours=cep_cache_error_ttl_hours,
+                        cep_retry_policy=cep_retry_policy,
                         time_period=time_period,
                         return_only_name=return_only_name,
                         name_raw=name_raw,
@@ -671,6 +922,12 @@ def sample(
                         all_data=all_data,
                         progress_callback=progress_callback,
                         append_to_jsonl=append_to_jsonl,
+                        engine=engine,
+                        return_results=not save_to_jsonl,  # When saving, stream to the file instead of collecting
+                        workers=workers,
+                        seed=seed,
+                        offset=offset,
+                        output_format=output_format,
                     )
                     logger.info(f'All {qty} samples processed successfully')
                 except Exception as e:
@@ -688,12 +945,174 @@ def sample(
                 if save_to_jsonl:
                     console.print(f'[bold green]✓[/] Results saved to [cyan]{save_to_jsonl}[/]')
                     logger.info(f'Results saved to {save_to_jsonl}')
+
+        if make_api_call and not no_cep_cache:
+            cache = get_cep_cache(cep_cache_path, ttl=cep_cache_ttl_hours * 3600, error_ttl=cep_cache_error_ttl_hours * 3600)
+            console.print(f'[bold green]✓[/] CEP cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%} hit rate)')
+            logger.info(f'CEP cache {cache.path}: {cache.hits} hits, {cache.misses} misses')
     except Exception as e:
         logger.error(f'Error in sample generation: {e}')
         console.print(f'[red]Error: {e!s}[/red]')
         raise typer.Exit(code=1) from e
 
 
+@app.command()
+def validate(
+    path: Path = VALIDATE_PATH,
+    kind: DocumentKind = VALIDATE_KIND,
+    column: str = VALIDATE_COLUMN,
+    file_format: FileFormat = VALIDATE_FORMAT,
+    delimiter: str = VALIDATE_DELIMITER,
+    no_pad: bool = VALIDATE_NO_PAD,
+    chunk_size: int = VALIDATE_CHUNK_SIZE,
+    workers: int = VALIDATE_WORKERS,
+    show_invalid: int = VALIDATE_SHOW_INVALID,
+    invalid_rows_file: Path = VALIDATE_INVALID_ROWS_FILE,
+) -> None:
+    """Validate the CPF, CNPJ, PIS or CEI numbers in one column of a JSONL or CSV file.
+
+    The file is streamed and validated in vectorized chunks, so it can be much
+    larger than memory. Reports how many rows are valid and which are not.
+
+    Args:
+        path: JSONL or CSV file to validate
+        kind: Type of document stored in the column
+        column: JSON key or CSV header of the column
+        file_format: Input format (detected from the file extension by default)
+        delimiter: CSV field delimiter
+        no_pad: Treat identifiers that lost their leading zeros as invalid
+        chunk_size: Number of rows validated per chunk
+        workers: Number of processes validating chunks
+        show_invalid: Number of invalid row numbers to print
+        invalid_rows_file: Write every invalid row number to this file
+    """
+    column = column or kind.value
+    logger.info(f'Validating {kind.value.upper()} column {column!r} of {path}')
+
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn('[progress.description]{task.description}'),
+            TextColumn('[cyan]{task.completed:,} rows'),
+            console=console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task('Validating', total=None)
+            report = validate_file(
+                path,
+                kind,
+                column,
+                file_format=file_format,
+                chunk_size=chunk_size,
+                workers=workers,
+                autopad=not no_pad,
+                delimiter=delimiter,
+                progress_callback=lambda done: progress.update(task, completed=done),
+            )
+    except (OSError, ValueError) as e:
+        logger.error(f'Error validating {path}: {e}')
+        console.print(f'[red]Error: {e!s}[/red]')
+        raise typer.Exit(code=1) from e
+
+    table = Table(title=f'{kind.value.upper()} validation: {path.name}', show_header=True, header_style='bold magenta')
+    table.add_column('Rows', justify='right')
+    table.add_column('Valid', justify='right', style='green')
+    table.add_column('Invalid', justify='right', style='red')
+    table.add_row(f'{report.total:,}', f'{report.valid:,}', f'{report.invalid:,}')
+    console.print(table)
+
+    if report.invalid_rows and show_invalid > 0:
+        shown = ', '.join(str(row) for row in report.invalid_rows[:show_invalid])
+        more = f' (+{report.invalid - show_invalid:,} more)' if report.invalid > show_invalid else ''
+        console.print(f'[red]Invalid rows:[/] {shown}{more}')
+
+    if invalid_rows_file:
+        invalid_rows_file.write_text(''.join(f'{row}\n' for row in report.invalid_rows), encoding='utf-8')
+        console.print(f'[bold green]✓[/] Invalid row numbers saved to [cyan]{invalid_rows_file}[/]')
+
+    logger.info(f'Validation completed: {report.valid} valid, {report.invalid} invalid out of {report.total} rows')
+
+
+@app.command('build-cep-index')
+def build_cep_index_command(
+    output: Path = INDEX_OUTPUT,
+    cep_cache_path: Path = INDEX_CEP_CACHE_PATH,
+    no_cep_cache: bool = INDEX_NO_CEP_CACHE,
+    import_paths: list[Path] = INDEX_IMPORT,
+    delimiter: str = INDEX_DELIMITER,
+) -> None:
+    """Compile known CEP addresses into a sorted binary index for offline generation.
+
+    Addresses are harvested from the CEP lookup cache filled by --make-api-call
+    and from any imported files; imported files win over the cache, later ones
+    over earlier ones. Pass the index to `sample --cep-index` to get real
+    streets and neighborhoods without API calls.
+
+    Args:
+        output: Index file to write
+        cep_cache_path: CEP lookup cache whose successful lookups are indexed
+        no_cep_cache: Do not harvest the CEP lookup cache
+        import_paths: CSV or JSONL files of addresses to index
+        delimiter: CSV field delimiter of imported files
+    """
+    harvest_cache = not no_cep_cache and cep_cache_path.exists()
+    if not harvest_cache and not import_paths:
+        console.print(f'[red]Error: nothing to index: no CEP cache at {cep_cache_path} and no --import file[/red]')
+        raise typer.Exit(code=1)
+
+    def records() -> Iterator[dict[str, Any]]:
+        if harvest_cache:
+            with CepCache(cep_cache_path) as cache:
+                yield from cache.iter_addresses()
+        for path in import_paths or []:
+            yield from read_address_file(path, delimiter=delimiter)
+
+    try:
+        count = build_cep_index(records(), output)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.error(f'Error building CEP index {output}: {e}')
+        console.print(f'[red]Error: {e!s}[/red]')
+        raise typer.Exit(code=1) from e
+
+    console.print(f'[bold green]✓[/] Indexed {count:,} CEPs into [cyan]{output}[/] ({output.stat().st_size / 1024**2:.1f} MiB)')
+    logger.info(f'CEP index built: {count} CEPs in {output}')
+
+
+@app.command('compile-data')
+def compile_data(
+    json_path: Path = JSON_PATH,
+    names_path: Path = NAMES_PATH,
+    middle_names_path: Path = MIDDLE_NAMES_PATH,
+    surnames_path: Path = SURNAMES_PATH,
+    locations_path: Path = LOCATIONS_PATH,
+    output: Path = BUNDLE_OUTPUT,
+) -> None:
+    """Precompile the data files into a bundle that `sample` loads in milliseconds.
+
+    The bundle holds the samplers' ready-made tables and remembers the size
+    and modification time of every data file; `sample` ignores it and reads
+    the JSON files again as soon as one of them changes.
+
+    Args:
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Path to locations data JSON file
+        output: Data bundle file to write
+    """
+    try:
+        engine = SamplerEngine(json_path, names_path, middle_names_path, surnames_path, locations_path)
+        size = engine.export_bundle(output)
+    except (OSError, ValueError) as e:
+        logger.error(f'Error compiling data bundle {output}: {e}')
+        console.print(f'[red]Error: {e!s}[/red]')
+        raise typer.Exit(code=1) from e
+
+    console.print(f'[bold green]✓[/] Data compiled into [cyan]{output}[/] ({size / 1024**2:.1f} MiB)')
+    logger.info(f'Data bundle written: {output} ({size} bytes)')
+
+
 def main() -> None:
     """Entry point for the CLI application.
 
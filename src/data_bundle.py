@@ -0,0 +1,215 @@
+"""
+Precompiled Data Bundle
+
+Builds the location and name samplers from their JSON sources once and saves
+their ready-to-use state (string tables, normalized weights, alias tables,
+per-state offsets and CEP arrays) to a single pickle (protocol 5) file, so
+later processes skip the JSON parsing, weight normalization, validation and
+table building.
+
+The bundle records the format version and the size and modification time of
+every source file. It is only used while all of them match; otherwise the
+samplers are built from JSON again. Bundles are pickles: only load files you
+compiled yourself.
+
+File layout:
+
+    header         pickle of the format, version, sources and buffer layout
+    payload        pickle of the sampler state, NumPy arrays left out-of-band
+    buffers        the arrays' data, each 64-byte aligned
+
+The file is memory-mapped on load and the arrays (weights, alias tables,
+offsets, CEP ranges) are read-only views of the mapping, so every process
+loading the same bundle, e.g. parallel workers, shares one copy of them in
+the page cache. Only the Python objects (strings and dicts) are per process.
+"""
+
+import mmap
+import pickle
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .br_location_class import CEP_RANGE_FIELDS, BrazilianLocationSampler
+from .br_name_class import BrazilianNameSampler
+
+DEFAULT_BUNDLE_PATH = Path.home() / '.cache' / 'ptbr_sampler' / 'data_bundle.pickle'
+# Bumped whenever the pickled sampler state changes shape
+BUNDLE_VERSION = 2
+
+_BUNDLE_FORMAT = 'ptbr-sampler-data-bundle'
+# City fields the location sampler reads after construction
+_RUNTIME_CITY_FIELDS = {
+    'city_name',
+    'city_uf',
+    'ddd',
+    'population_percentage_state',
+    'ceps',
+    *(field for fields in CEP_RANGE_FIELDS for field in fields),
+}
+# Attributes rebuilt on load rather than stored: RNGs must not be shared between processes
+_TRANSIENT = {'np_rng'}
+_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def source_fingerprint(**paths: str | Path | None) -> dict[str, tuple[str, int, int] | None]:
+    """Identify the current version of each source file by its resolved path, size and mtime.
+
+    Args:
+        paths: Source files by role (e.g. json_path=...), None for unused ones
+
+    Returns:
+        Mapping of role to (path, size, mtime), None for unused or missing files
+    """
+    fingerprint = {}
+    for role, path in sorted(paths.items()):
+        fingerprint[role] = None
+        if path:
+            resolved = Path(path).resolve()
+            try:
+                stat = resolved.stat()
+            except OSError:
+                continue
+            fingerprint[role] = (str(resolved), stat.st_size, stat.st_mtime_ns)
+    return fingerprint
+
+
+def _location_state(sampler: BrazilianLocationSampler) -> dict[str, Any]:
+    """The location sampler's state, with city records cut down to the fields used at runtime."""
+    sampler.city_for_cep(0)  # Build the lazy reverse CEP table so that it is stored too
+    state = {name: value for name, value in sampler.__dict__.items() if name not in _TRANSIENT}
+    cities = {
+        key: {field: value for field, value in city.items() if field in _RUNTIME_CITY_FIELDS}
+        for key, city in sampler.data['cities'].items()
+    }
+    state['data'] = {**sampler.data, 'cities': cities}
+    # Same last-wins mapping as _calculate_weights, sharing the trimmed records
+    state['city_data_by_name'] = {city['city_name']: city for city in cities.values()}
+    return state
+
+
+def _name_state(sampler: BrazilianNameSampler) -> dict[str, Any]:
+    """The name sampler's state with every rendered surname table built.
+
+    The raw name, surname and middle name percentages are left out: they only
+    feed the alias tables, which are stored.
+    """
+    for top_40 in (False, True):
+        for raw in (False, True):
+            for second in (False, True):
+                try:
+                    sampler._rendered_surname_table(top_40, raw, second)
+                except IndexError:
+                    continue  # Empty vocabulary; drawing from it raises at sampling time as usual
+    state = {name: value for name, value in sampler.__dict__.items() if name not in _TRANSIENT}
+    state['name_data'] = state['surname_data'] = state['top_40_surnames'] = None
+    if sampler.middle_names_data:
+        state['middle_names_data'] = {'percentage_with_second': sampler.middle_names_data['percentage_with_second']}
+    return state
+
+
+def write_bundle(
+    path: str | Path,
+    location_sampler: BrazilianLocationSampler,
+    name_sampler: BrazilianNameSampler,
+    sources: dict[str, tuple[str, int, int] | None],
+) -> int:
+    """
+    Save the state of built samplers as a data bundle.
+
+    Args:
+        path: Bundle file to write (parent directories are created); replaced atomically
+        location_sampler: Sampler built from the sources
+        name_sampler: Sampler built from the sources
+        sources: `source_fingerprint` of the files the samplers were built from
+
+    Returns:
+        Size of the bundle in bytes
+    """
+    state = {'location_sampler': _location_state(location_sampler), 'name_sampler': _name_state(name_sampler)}
+    buffers = []
+    payload = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    spans = []
+    offset = 0
+    for buffer in buffers:
+        offset = _aligned(offset)
+        spans.append((offset, buffer.raw().nbytes))
+        offset += spans[-1][1]
+    header = {'format': _BUNDLE_FORMAT, 'version': BUNDLE_VERSION, 'sources': sources, 'payload_size': len(payload), 'buffers': spans}
+    header_bytes = pickle.dumps(header, protocol=5)
+    data_start = _aligned(len(header_bytes) + len(payload))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('wb') as f:
+        # The small header goes first so that a stale bundle is rejected without reading the rest
+        f.write(header_bytes)
+        f.write(payload)
+        for buffer, (offset, _) in zip(buffers, spans, strict=True):
+            f.seek(data_start + offset)
+            f.write(buffer.raw())
+    tmp_path.replace(path)
+    return path.stat().st_size
+
+
+def bundle_is_current(path: str | Path, sources: dict[str, tuple[str, int, int] | None]) -> bool:
+    """Return whether a bundle exists and was compiled by this version from exactly these sources."""
+    try:
+        with Path(path).open('rb') as f:
+            header = pickle.load(f)  # noqa: S301
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False
+    return _header_matches(header, sources)
+
+
+def _header_matches(header: Any, sources: dict[str, tuple[str, int, int] | None]) -> bool:
+    return (
+        isinstance(header, dict)
+        and header.get('format') == _BUNDLE_FORMAT
+        and header.get('version') == BUNDLE_VERSION
+        and header.get('sources') == sources
+    )
+
+
+def load_bundle(
+    path: str | Path, sources: dict[str, tuple[str, int, int] | None]
+) -> tuple[BrazilianLocationSampler, BrazilianNameSampler] | None:
+    """
+    Restore the samplers saved in a data bundle.
+
+    Args:
+        path: Bundle file written by `write_bundle`
+        sources: `source_fingerprint` of the files the samplers should reflect
+
+    Returns:
+        Tuple of (location sampler, name sampler), or None if the bundle is
+        missing, unreadable, from another version or compiled from other sources
+    """
+    try:
+        with Path(path).open('rb') as f:
+            header = pickle.load(f)  # noqa: S301
+            if not _header_matches(header, sources):
+                return None
+            payload_start = f.tell()
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        data_start = _aligned(payload_start + header['payload_size'])
+        buffers = [view[data_start + offset : data_start + offset + size] for offset, size in header['buffers']]
+        # The arrays keep the mapping alive; it outlives the file if compile-data replaces it
+        payload = pickle.loads(view[payload_start : payload_start + header['payload_size']], buffers=buffers)  # noqa: S301
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+
+    location_sampler = BrazilianLocationSampler.__new__(BrazilianLocationSampler)
+    location_sampler.__dict__.update(payload['location_sampler'])
+    name_sampler = BrazilianNameSampler.__new__(BrazilianNameSampler)
+    name_sampler.__dict__.update(payload['name_sampler'])
+    for sampler in (location_sampler, name_sampler):
+        sampler.np_rng = np.random.default_rng()
+    return location_sampler, name_sampler
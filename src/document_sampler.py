@@ -1,10 +1,21 @@
 """Brazilian document number generator using utility functions."""
 
+import random
+
+import numpy as np
+
 from src.br_rg_class import BrazilianRG
-from src.utils.cei import random_cei
-from src.utils.cnpj import random_cnpj
-from src.utils.cpf import random_cpf
-from src.utils.pis import random_pis
+from src.utils.cei import random_cei, random_cei_batch
+from src.utils.cnpj import random_cnpj, random_cnpj_batch
+from src.utils.cpf import random_cpf, random_cpf_batch
+from src.utils.pis import random_pis, random_pis_batch
+
+BATCH_GENERATORS = {
+    'cpf': random_cpf_batch,
+    'pis': random_pis_batch,
+    'cnpj': random_cnpj_batch,
+    'cei': random_cei_batch,
+}
 
 
 class DocumentSampler:
@@ -13,45 +24,69 @@ class DocumentSampler:
     def __init__(self, only_rg: bool = False):
         """Initialize the document sampler."""
         self.rg_generator = BrazilianRG(only_rg=only_rg)
+        self.np_rng = np.random.default_rng()
 
-    def generate_cpf(self, formatted: bool = True) -> str:
+    def generate_cpf(self, formatted: bool = True, rng: random.Random | None = None) -> str:
         """Generate a valid CPF number.
 
         Args:
             formatted: If True, returns CPF in XXX.XXX.XXX-XX format
+            rng: Optional random source (defaults to the random module)
         """
-        return random_cpf(formatted=formatted)
+        return random_cpf(formatted=formatted, rng=rng)
 
-    def generate_pis(self, formatted: bool = True) -> str:
+    def generate_pis(self, formatted: bool = True, rng: random.Random | None = None) -> str:
         """Generate a valid PIS number.
 
         Args:
             formatted: If True, returns PIS in XXX.XXXXX.XX-X format
+            rng: Optional random source (defaults to the random module)
         """
-        return random_pis(formatted=formatted)
+        return random_pis(formatted=formatted, rng=rng)
 
-    def generate_cnpj(self, formatted: bool = True) -> str:
+    def generate_cnpj(self, formatted: bool = True, rng: random.Random | None = None) -> str:
         """Generate a valid CNPJ number.
 
         Args:
             formatted: If True, returns CNPJ in XX.XXX.XXX/XXXX-XX format
+            rng: Optional random source (defaults to the random module)
         """
-        return random_cnpj(formatted=formatted)
+        return random_cnpj(formatted=formatted, rng=rng)
 
-    def generate_cei(self, formatted: bool = True) -> str:
+    def generate_cei(self, formatted: bool = True, rng: random.Random | None = None) -> str:
         """Generate a valid CEI number.
 
         Args:
             formatted: If True, returns CEI in XX.XXX.XXXXX/XX format
+            rng: Optional random source (defaults to the random module)
+        """
+        return random_cei(formatted=formatted, rng=rng)
+
+    def generate_batch(self, kind: str, n: int, formatted: bool = True, rng: np.random.Generator | None = None) -> list[str]:
+        """Generate n valid documents of one kind in a single vectorized call.
+
+        Args:
+            kind: One of 'cpf', 'pis', 'cnpj' or 'cei'
+            n: Number of documents to generate
+            formatted: If True, returns documents in their usual punctuated format
+            rng: Optional NumPy generator (defaults to the sampler's own)
+
+        Raises:
+            ValueError: If kind has no batch generator
         """
-        return random_cei(formatted=formatted)
+        if kind not in BATCH_GENERATORS:
+            raise ValueError(f'No batch generator for document kind: {kind}')
+        return BATCH_GENERATORS[kind](n, formatted=formatted, rng=rng or self.np_rng)
 
-    def generate_rg(self, state: str | None = None, include_issuer: bool = True, only_rg: bool = False) -> str:
+    def generate_rg(
+        self, state: str | None = None, include_issuer: bool = True, only_rg: bool = False, rng: random.Random | None = None
+    ) -> str:
         """Generate a valid RG number for the given state.
 
         Args:
             state: Two-letter state abbreviation (e.g., 'SP', 'RJ')
             formatted: If True, returns RG in XX.XXX.XXX-X format
             only_rg: If True, returns only the RG number
+            rng: Optional random source (defaults to the random module)
         """
-        return self.rg_generator.generate(state=state, include_issuer=include_issuer, only_rg=only_rg)
+        return self.rg_generator.generate(state=state, include_issuer=include_issuer, only_rg=only_rg, rng=rng)
@@ -6,16 +6,41 @@ Core functionality for generating Brazilian name, location, and document samples
 
 import asyncio
 import json
+import random
+import tempfile
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from multiprocessing.util import Finalize
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import aiofiles
+import numpy as np
 
 from src.utils.address_for_offline import AddressProvider_for_offline
+from src.utils.cep_cache import DEFAULT_ERROR_TTL_HOURS, DEFAULT_TTL_HOURS, CepCache, get_cep_cache
+from src.utils.cep_index import CepIndex, get_cep_index
+from src.utils.cep_wrapper import DEFAULT_POOL_SIZE, CepBackend, CepLookupPool, create_cep_pool, iter_cep_results, lookups_for_pool
+from src.utils.jsonl_writer import JsonlWriter
+from src.utils.parquet_writer import OutputFormat, ParquetWriter, chunks_to_table
 from src.utils.phone import generate_phone_number
+from src.utils.record_rng import DEFAULT_BLOCK_SIZE, BlockRng, block_rng, new_seed
+from src.utils.retry_policy import RetryPolicy
 
 from .br_location_class import BrazilianLocationSampler
 from .br_name_class import BrazilianNameSampler, NameComponents, TimePeriod
-from .document_sampler import DocumentSampler
+from .data_bundle import load_bundle, source_fingerprint, write_bundle
+from .document_sampler import BATCH_GENERATORS, DocumentSampler
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Number of records generated and written per chunk when streaming
+DEFAULT_CHUNK_SIZE = 10_000
+# Number of finished records that may wait for the JSONL writer
+DEFAULT_OUTPUT_QUEUE_SIZE = 1_000
 
 
 def parse_result(
@@ -93,26 +118,210 @@ def parse_result(
     return result
 
 
-async def save_to_jsonl_file(data: list[dict], filename: str, append: bool = True) -> None:
-    """Save generated samples to a JSONL file asynchronously.
+def save_to_jsonl_file(data: list[dict], filename: str, append: bool = True) -> None:
+    """Save generated samples to a JSONL file.
 
     Args:
         data: List of dictionaries containing sample data
         filename: Path to the output JSONL file
         append: If True, append to existing file instead of overwriting
     """
-    mode = 'a' if append else 'w'
+    with JsonlWriter(filename, append=append) as writer:
+        writer.write(data)
+
+
+def save_stream_to_jsonl(chunks: Iterable[list[dict]], filename: str, append: bool = True) -> int:
+    """Write chunks of samples to a JSONL file as they are produced.
+
+    Only one chunk (and the writer's buffer) is held in memory at a time, so
+    the file can grow far beyond what would fit in a single list.
+
+    Args:
+        chunks: Iterable yielding lists of sample dictionaries
+        filename: Path to the output JSONL file
+        append: If True, append to existing file instead of overwriting
+
+    Returns:
+        Number of records written
+    """
+    with JsonlWriter(filename, append=append) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.written
+
+
+def save_stream_to_parquet(chunks: Iterable[list[dict]], filename: str) -> int:
+    """Write chunks of samples to a Parquet file as they are produced, one row group at a time.
+
+    Parquet files cannot be appended to, so an existing file is overwritten.
+
+    Args:
+        chunks: Iterable yielding lists of sample dictionaries
+        filename: Path to the output Parquet file
+
+    Returns:
+        Number of records written
+    """
+    with ParquetWriter(filename) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.written
+
+
+def _api_address_data(cep_data: dict, rng: random.Random | None = None) -> dict:
+    """Build the address data of one record from a CEP lookup result, filling gaps offline from rng."""
+    address_provider = AddressProvider_for_offline(rng)
+    address_data = {
+        'street': '',
+        'neighborhood': '',
+        'building_number': '',
+        'cep': cep_data.get('cep', ''),  # This will have the dash format from the API
+        'state': cep_data.get('state', ''),
+        'city': cep_data.get('city', ''),
+    }
+
+    # Extract data from API response if no error
+    if 'error' not in cep_data:
+        address_data['street'] = cep_data.get('street', '')
+        address_data['neighborhood'] = cep_data.get('neighborhood', '')
+
+    # If neighborhood is empty, use address_for_offline
+    if not address_data['neighborhood']:
+        address_data['neighborhood'] = address_provider.bairro()
+
+    # If street is empty, use address_for_offline
+    if not address_data['street']:
+        address_data['street'] = address_provider.street_prefix() + ' ' + address_provider.last_name()
+
+    # Always get building number from address_for_offline
+    address_data['building_number'] = address_provider.building_number()
+    return address_data
+
+
+def _offline_address_data(cep: str, indexed: dict | None = None, rng: random.Random | None = None) -> dict:
+    """Generate the address data of one record without API calls.
+
+    Args:
+        cep: The record's CEP
+        indexed: Optional `CepIndex` entry for the CEP; its street and neighborhood are used where known
+        rng: Optional random source (defaults to the random module)
+    """
+    # Ensure CEP has dash format
+    formatted_cep = cep
+    if '-' not in formatted_cep and len(formatted_cep) == 8:
+        formatted_cep = f'{formatted_cep[:5]}-{formatted_cep[5:]}'
+
+    address_provider = AddressProvider_for_offline(rng)
+    indexed = indexed or {}
+    return {
+        'street': indexed.get('street') or address_provider.street_prefix() + ' ' + address_provider.last_name(),
+        'neighborhood': indexed.get('neighborhood') or address_provider.bairro(),
+        'building_number': address_provider.building_number(),
+        'cep': formatted_cep,
+    }
 
-    # Create a directory for the file if it doesn't exist
-    file_path = Path(filename)
-    file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    async with aiofiles.open(file_path, mode, encoding='utf-8') as f:
-        for item in data:
-            await f.write(json.dumps(item, ensure_ascii=False) + '\n')
+async def iter_address_data(
+    ceps: list[str],
+    make_api_call: bool = False,
+    cep_pool_size: int = DEFAULT_POOL_SIZE,
+    cep_cache: CepCache | None = None,
+    cep_retry_policy: RetryPolicy | None = None,
+    cep_pool: CepLookupPool | None = None,
+    cep_backend: CepBackend = CepBackend.NODE,
+    cep_index: CepIndex | None = None,
+    rngs: list[random.Random] | None = None,
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    Yield the address data of each CEP as soon as it is available.
 
+    With API calls, results come in the order the lookups complete; generated
+    addresses come in order.
 
-async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, progress_callback: callable = None) -> list[dict]:
+    Args:
+        ceps: List of CEPs to get address data for
+        make_api_call: Whether to make API calls or generate data
+        cep_pool_size: Size of the CEP lookup pool started when no pool is given; also sets how many lookups
+            are kept in flight (see `lookups_for_pool`)
+        cep_cache: Optional CepCache consulted before making API calls
+        cep_retry_policy: Retry and circuit breaker settings for the API calls (defaults if None)
+        cep_pool: Optional running CEP lookup pool to reuse across calls
+        cep_backend: Backend of the pool started when no pool is given
+        cep_index: Optional CepIndex giving the real street and neighborhood of known CEPs when not making API calls
+        rngs: Optional random source of the generated address parts of each CEP (defaults to the random module)
+
+    Yields:
+        Tuples of (position in `ceps`, address data dictionary)
+    """
+    if not make_api_call:
+        # One vectorized search for the whole batch
+        rows = cep_index.find(ceps).tolist() if cep_index is not None else [-1] * len(ceps)
+        for i, (cep, row) in enumerate(zip(ceps, rows, strict=True)):
+            yield i, _offline_address_data(cep, cep_index.record(row) if row >= 0 else None, rngs[i] if rngs else None)
+        return
+
+    # Format CEPs to remove dashes before API call
+    formatted_ceps = [cep.replace('-', '') for cep in ceps]
+    async for i, cep_data in iter_cep_results(
+        formatted_ceps,
+        max_workers=lookups_for_pool(cep_pool_size),
+        pool_size=cep_pool_size,
+        pool=cep_pool,
+        cache=cep_cache,
+        retry_policy=cep_retry_policy,
+        backend=cep_backend,
+    ):
+        yield i, _api_address_data(cep_data, rngs[i] if rngs else None)
+
+
+async def write_jsonl_from_queue(
+    queue: asyncio.Queue,
+    filename: str,
+    append: bool = True,
+    on_record: Callable[[int, dict], None] | None = None,
+) -> int:
+    """Drain (index, record) tuples from a queue into a JSONL file until a None arrives.
+
+    Records that are already waiting are serialized together into the
+    writer's buffer, which reaches the file in large blocks.
+
+    Args:
+        queue: Queue filled by a producer such as `SamplerEngine.stream`
+        filename: Path to the output JSONL file
+        append: If True, append to existing file instead of overwriting
+        on_record: Optional callback receiving each (index, record) as it is written
+
+    Returns:
+        Number of records written
+    """
+    finished = False
+    with JsonlWriter(filename, append=append) as writer:
+        while not finished:
+            items = [await queue.get()]
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            if items[-1] is None:
+                finished = True
+                items.pop()
+            writer.write(record for _, record in items)
+            if on_record:
+                for index, record in items:
+                    on_record(index, record)
+    return writer.written
+
+
+async def get_address_data_batch(
+    ceps: list[str],
+    make_api_call: bool = False,
+    progress_callback: callable = None,
+    cep_pool_size: int = DEFAULT_POOL_SIZE,
+    cep_cache: CepCache | None = None,
+    cep_retry_policy: RetryPolicy | None = None,
+    cep_backend: CepBackend = CepBackend.NODE,
+    cep_index: CepIndex | None = None,
+    rngs: list[random.Random] | None = None,
+    cep_pool: CepLookupPool | None = None,
+) -> list[dict]:
     """
     Get address data for multiple CEPs, either from API or generated.
 
@@ -120,85 +329,42 @@ async def get_address_data_batch(ceps: list[str], make_api_call: bool = False, p
         ceps: List of CEPs to get address data for
         make_api_call: Whether to make API calls or generate data
         progress_callback: Optional callback function to report progress
+        cep_pool_size: Number of Node CEP workers (or HTTP connections per provider) used for the API calls
+        cep_cache: Optional CepCache consulted before making API calls
+        cep_retry_policy: Retry and circuit breaker settings for the API calls (defaults if None)
+        cep_backend: How the CEPs are looked up: Node workers running cep-promise, or HTTP from Python
+        cep_index: Optional CepIndex giving the real street and neighborhood of known CEPs when not making API calls
+        rngs: Optional random source of the generated address parts of each CEP (defaults to the random module)
+        cep_pool: Optional running CEP lookup pool to use instead of starting one
 
     Returns:
         List of dictionaries with address data (street, neighborhood, building_number)
     """
-    address_data_list = []
-
-    if make_api_call:
-        # Use cep_wrapper to get real data for multiple CEPs
-        from .utils.cep_wrapper import workers_for_multiple_cep
-
-        # Format CEPs to remove dashes before API call
-        formatted_ceps = [cep.replace('-', '') for cep in ceps]
+    address_data_list = [{}] * len(ceps)
+    label = 'API calls: Processed' if make_api_call else 'Generating address data:'
 
-        # Update progress if callback is provided
-        if progress_callback:
-            progress_callback(0, 'API calls: Connecting to service')
-
-        # Get data from API
-        cep_data_list = await workers_for_multiple_cep(formatted_ceps)
-
-        # Update progress if callback is provided
-        if progress_callback:
-            progress_callback(0, 'API calls: Processing responses')
-
-        # Process each CEP result
-        for i, cep_data in enumerate(cep_data_list):
-            address_data = {
-                'street': '',
-                'neighborhood': '',
-                'building_number': '',
-                'cep': cep_data.get('cep', ''),  # This will have the dash format from the API
-                'state': cep_data.get('state', ''),
-                'city': cep_data.get('city', ''),
-            }
-
-            # Extract data from API response if no error
-            if 'error' not in cep_data:
-                address_data['street'] = cep_data.get('street', '')
-                address_data['neighborhood'] = cep_data.get('neighborhood', '')
-
-            # If neighborhood is empty, use address_for_offline
-            if not address_data['neighborhood']:
-                address_provider = AddressProvider_for_offline()
-                address_data['neighborhood'] = address_provider.bairro()
-
-            # If street is empty, use address_for_offline
-            if not address_data['street']:
-                address_provider = AddressProvider_for_offline()
-                address_data['street'] = address_provider.street_prefix() + ' ' + address_provider.last_name()
-
-            # Always get building number from address_for_offline
-            address_provider = AddressProvider_for_offline()
-            address_data['building_number'] = address_provider.building_number()
-
-            address_data_list.append(address_data)
-
-            # Update progress occasionally if callback is provided
-            if progress_callback and i % max(1, len(cep_data_list) // 10) == 0:
-                progress_callback(0, f'API calls: Processed {i + 1}/{len(cep_data_list)} addresses')
-    else:
-        # Use address_for_offline to generate all data for each CEP
-        for i, cep in enumerate(ceps):
-            # Ensure CEP has dash format
-            formatted_cep = cep
-            if '-' not in formatted_cep and len(formatted_cep) == 8:
-                formatted_cep = f'{formatted_cep[:5]}-{formatted_cep[5:]}'
-
-            address_provider = AddressProvider_for_offline()
-            address_data = {
-                'street': address_provider.street_prefix() + ' ' + address_provider.last_name(),
-                'neighborhood': address_provider.bairro(),
-                'building_number': address_provider.building_number(),
-                'cep': formatted_cep,
-            }
-            address_data_list.append(address_data)
-
-            # Update progress occasionally if callback is provided
-            if progress_callback and i % max(1, len(ceps) // 10) == 0:
-                progress_callback(0, f'Generating address data: {i + 1}/{len(ceps)}')
+    # Update progress if callback is provided
+    if progress_callback and make_api_call:
+        progress_callback(0, 'API calls: Connecting to service')
+
+    done = 0
+    async for i, address_data in iter_address_data(
+        ceps,
+        make_api_call,
+        cep_pool_size,
+        cep_cache,
+        cep_retry_policy,
+        cep_pool,
+        cep_backend=cep_backend,
+        cep_index=cep_index,
+        rngs=rngs,
+    ):
+        address_data_list[i] = address_data
+        done += 1
+
+        # Update progress occasionally if callback is provided
+        if progress_callback and (done - 1) % max(1, len(ceps) // 10) == 0:
+            progress_callback(0, f'{label} {done}/{len(ceps)} addresses')
 
     # Final update for API calls completion
     if progress_callback and make_api_call:
@@ -222,6 +388,801 @@ async def get_address_data(cep: str, make_api_call: bool = False) -> dict:
     return result[0] if result else {}
 
 
+@dataclass
+class SampleOptions:
+    """Flags controlling what each generated record contains.
+
+    Mirrors the keyword arguments of `sample`. When `all_data` is set, the
+    other flags are overridden so that every field is generated.
+    """
+
+    city_only: bool = False
+    state_abbr_only: bool = False
+    state_full_only: bool = False
+    only_cep: bool = False
+    cep_without_dash: bool = False
+    make_api_call: bool = False
+    cep_pool_size: int = DEFAULT_POOL_SIZE
+    cep_cache_path: str | Path | None = None
+    cep_cache_ttl_hours: float = DEFAULT_TTL_HOURS
+    cep_cache_error_ttl_hours: float = DEFAULT_ERROR_TTL_HOURS
+    cep_retry_policy: RetryPolicy | None = None
+    cep_backend: CepBackend = CepBackend.NODE
+    cep_index_path: str | Path | None = None
+    time_period: TimePeriod = TimePeriod.UNTIL_2010
+    return_only_name: bool = False
+    name_raw: bool = False
+    only_surname: bool = False
+    top_40: bool = False
+    with_only_one_surname: bool = False
+    always_middle: bool = False
+    only_middle: bool = False
+    always_cpf: bool = True
+    always_pis: bool = False
+    always_cnpj: bool = False
+    always_cei: bool = False
+    always_rg: bool = True
+    always_phone: bool = True
+    only_cpf: bool = False
+    only_pis: bool = False
+    only_cnpj: bool = False
+    only_cei: bool = False
+    only_rg: bool = False
+    only_fone: bool = False
+    include_issuer: bool = True
+    only_document: bool = False
+    all_data: bool = False
+
+    def __post_init__(self) -> None:
+        # If all_data is True, override other flags to include everything
+        if self.all_data:
+            self.always_cpf = True
+            self.always_pis = True
+            self.always_cnpj = True
+            self.always_cei = True
+            self.always_rg = True
+            self.always_phone = True
+            self.always_middle = True
+            self.only_cpf = False
+            self.only_pis = False
+            self.only_cnpj = False
+            self.only_cei = False
+            self.only_rg = False
+            self.only_fone = False
+            self.only_surname = False
+            self.only_middle = False
+            self.only_cep = False
+            self.city_only = False
+            self.state_abbr_only = False
+            self.state_full_only = False
+            self.return_only_name = False
+            self.only_document = False
+
+
+class CepPoolRunner:
+    """A CEP lookup pool kept running between `SamplerEngine.generate` calls, on an event loop of its own.
+
+    Each `generate` call would otherwise start and stop a pool of its own.
+    Shards share one runner per process instead, so the pool's workers,
+    connections and circuit breaker last for the whole run.
+    """
+
+    def __init__(self, options: SampleOptions):
+        """Start the pool configured by the options.
+
+        If it cannot start, `pool` is None and each lookup reports the error, as in `SamplerEngine.stream`.
+        """
+        self._runner = asyncio.Runner()
+        self.pool = create_cep_pool(options.cep_backend, size=options.cep_pool_size, retry_policy=options.cep_retry_policy)
+        try:
+            self._runner.run(self.pool.start())
+        except OSError:
+            self.pool = None
+
+    def run(self, coroutine: Coroutine):
+        """Run a coroutine on the pool's event loop and return its result."""
+        return self._runner.run(coroutine)
+
+    def close(self) -> None:
+        """Stop the pool and close its event loop."""
+        try:
+            if self.pool is not None:
+                self._runner.run(self.pool.close())
+                self.pool = None
+        finally:
+            self._runner.close()
+
+    def __enter__(self) -> 'CepPoolRunner':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class SamplerEngine:
+    """Long-lived generator that owns the loaded samplers.
+
+    The location, name and document samplers (and the JSON files behind them)
+    are loaded once at construction. `generate` can then be called any number
+    of times, e.g. once per CLI batch, without touching the disk again.
+    """
+
+    def __init__(
+        self,
+        json_path: str | Path,
+        names_path: str | Path | None,
+        middle_names_path: str | Path | None,
+        surnames_path: str | Path,
+        locations_path: str | Path | None = None,
+        bundle_path: str | Path | None = None,
+    ):
+        """Load all datasets and build the samplers.
+
+        Args:
+            json_path: Path to city/state data JSON file
+            names_path: Path to first names data file
+            middle_names_path: Path to middle names data file
+            surnames_path: Path to surnames data file
+            locations_path: Optional path to locations data JSON file merged over json_path
+            bundle_path: Optional data bundle (see `src.data_bundle`) compiled from these files;
+                the samplers are restored from it unless it is missing or stale
+        """
+        self.doc_sampler = DocumentSampler()
+        # Kept so that worker processes can build the same engine
+        self.data_paths = {
+            'json_path': json_path,
+            'names_path': names_path,
+            'middle_names_path': middle_names_path,
+            'surnames_path': surnames_path,
+            'locations_path': locations_path,
+        }
+        # The data files this engine reflects, recorded in the bundles it exports
+        self.sources = source_fingerprint(**self.data_paths)
+        if bundle_path:
+            samplers = load_bundle(bundle_path, self.sources)
+            if samplers is not None:
+                self.location_sampler, self.name_sampler = samplers
+                return
+            if Path(bundle_path).exists():
+                print(f'Warning: Data bundle {bundle_path} is out of date, loading the JSON files (run compile-data to rebuild it)')
+
+        self.location_sampler = BrazilianLocationSampler(json_path)
+
+        # Load location data if provided
+        if locations_path:
+            try:
+                with Path(locations_path).open(encoding='utf-8') as f:
+                    locations_data = json.load(f)
+                    # Use locations data if available
+                    if 'cities' in locations_data:
+                        self.location_sampler.update_cities(locations_data['cities'])
+                    if 'states' in locations_data:
+                        self.location_sampler.update_states(locations_data['states'])
+            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+                # Log but continue with default data
+                print(f'Warning: Could not use locations_path data: {e}')
+
+        # Load surnames data for name sampler
+        with Path(surnames_path).open(encoding='utf-8') as f:
+            surnames_data = json.load(f)
+
+        # Create complete data for name sampler
+        name_data = {'surnames': surnames_data['surnames']}
+        if names_path:
+            with Path(names_path).open(encoding='utf-8') as f:
+                names_data = json.load(f)
+                name_data.update(names_data)
+
+        self.name_sampler = BrazilianNameSampler(
+            name_data,  # Pass the combined data
+            middle_names_path,
+            None,  # No need for names_path as we've already loaded it
+        )
+
+    def export_bundle(self, path: str | Path) -> int:
+        """Save the samplers as a data bundle for `bundle_path`.
+
+        Engines created with the same data paths and this bundle, e.g. in
+        worker processes, load it instead of the JSON files and share its
+        arrays through the page cache.
+
+        Args:
+            path: Bundle file to write
+
+        Returns:
+            Size of the bundle in bytes
+        """
+        return write_bundle(path, self.location_sampler, self.name_sampler, self.sources)
+
+    def generate_shard(
+        self,
+        options: SampleOptions,
+        seed: int,
+        shard: int,
+        shard_size: int = DEFAULT_BLOCK_SIZE,
+        start: int = 0,
+        stop: int | None = None,
+        cep_pool: CepPoolRunner | None = None,
+    ) -> list[dict]:
+        """Generate records of one shard from its own counter-based stream.
+
+        The random values of the whole shard are always drawn, so that its
+        records are a pure function of (seed, shard, shard_size, options):
+        record i of a seeded dataset is the same whether it is generated alone
+        or with others, and it does not depend on what this engine generated
+        before. Only records start to stop - 1 are finished, so CEP lookups
+        and the per-record stages are not spent on records left out.
+
+        Args:
+            options: Flags controlling which fields are generated
+            seed: Seed of the run
+            shard: Index of the shard, i.e. of its block in `src.utils.record_rng`
+            shard_size: Number of records per shard
+            start: Index within the shard of the first record returned
+            stop: Index within the shard past the last record returned (defaults to the end)
+            cep_pool: Optional running CEP lookup pool shared by the shards, for the API calls
+
+        Returns:
+            List of dictionaries in the `parse_result` format
+        """
+        return self.generate(shard_size, options, rng=block_rng(seed, shard), start=start, stop=stop, cep_pool=cep_pool)
+
+    def iter_shards(
+        self,
+        n: int,
+        options: SampleOptions,
+        workers: int = 1,
+        seed: int | None = None,
+        shard_size: int = DEFAULT_BLOCK_SIZE,
+        offset: int = 0,
+    ) -> Iterator[list[dict]]:
+        """Generate records offset to offset + n - 1 of a seeded dataset, shard by shard.
+
+        Shard k holds records k * shard_size onwards and draws from block k of
+        the seed's counter-based stream (see `src.utils.record_rng`), so any
+        range is regenerated from the shards that overlap it alone, in O(n)
+        time. Shards are yielded in order, optionally after running on a pool
+        of worker processes: for a given seed and shard size the output is the
+        same whatever the number of workers. Addresses looked up with API calls
+        are not reproducible.
+
+        Workers load the samplers from a data bundle exported to a temporary
+        file, sharing its arrays instead of each parsing the JSON files. With
+        API calls, each process starts one CEP lookup pool for all its shards.
+
+        Args:
+            n: Number of records to generate
+            options: Flags controlling which fields are generated
+            workers: Number of processes generating shards (1 generates in this process)
+            seed: Seed of the run; None draws one from OS entropy
+            shard_size: Number of records per shard
+            offset: Index of the first record to generate
+
+        Yields:
+            Lists of at most shard_size dictionaries in the `parse_result` format
+
+        Raises:
+            ValueError: If offset is negative, or set without a seed
+        """
+        if offset < 0:
+            raise ValueError('Offset must not be negative')
+        if offset and seed is None:
+            raise ValueError('An offset needs a seed: without one the records before it are not defined')
+        shard_size = max(1, shard_size)
+        seed = new_seed() if seed is None else seed
+        end = offset + n
+        # (shard, first index, index past the last) of every shard overlapping the range
+        spans = [
+            (shard, max(offset, shard * shard_size) - shard * shard_size, min(end, (shard + 1) * shard_size) - shard * shard_size)
+            for shard in range(offset // shard_size, -(-end // shard_size))
+        ]
+
+        if workers <= 1:
+            # One CEP lookup pool serves every shard
+            with CepPoolRunner(options) if options.make_api_call else nullcontext() as cep_pool:
+                for shard, start, stop in spans:
+                    yield self.generate_shard(options, seed, shard, shard_size, start, stop, cep_pool)
+            return
+
+        with tempfile.TemporaryDirectory() as tmp:
+            bundle_path = Path(tmp) / 'data_bundle.pickle'
+            self.export_bundle(bundle_path)
+            # CEP lookups happen in the workers: add their cache hits and misses to this process's counters
+            cache = self._cep_cache(options)
+
+            def finished(future: Future) -> list[dict]:
+                records, hits, misses = future.result()
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+                return records
+
+            # Keep a bounded number of shards in flight and yield them in order
+            pending: deque[Future] = deque()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for shard, start, stop in spans:
+                    pending.append(
+                        executor.submit(_generate_shard, self.data_paths, bundle_path, options, seed, shard, shard_size, start, stop)
+                    )
+                    if len(pending) >= workers * 2:
+                        yield finished(pending.popleft())
+                while pending:
+                    yield finished(pending.popleft())
+
+    def _generate_phone(self, city_name: str, rng: random.Random | None = None) -> str:
+        """Generate a phone number using the DDD of the given city."""
+        city_data = self.location_sampler.city_data_by_name.get(city_name, {})
+        return generate_phone_number(city_data.get('ddd', None), rng=rng)
+
+    def _document_kinds(self, options: SampleOptions) -> tuple[str, ...]:
+        """Resolve which documents every record of a run should carry.
+
+        Args:
+            options: Flags controlling which fields are generated
+
+        Returns:
+            Tuple of document keys ('cpf', 'pis', 'cnpj', 'cei', 'rg', 'phone')
+        """
+        o = options
+        only = {'cpf': o.only_cpf, 'pis': o.only_pis, 'cnpj': o.only_cnpj, 'cei': o.only_cei, 'rg': o.only_rg, 'phone': o.only_fone}
+        always = {
+            'cpf': o.always_cpf,
+            'pis': o.always_pis,
+            'cnpj': o.always_cnpj,
+            'cei': o.always_cei,
+            'rg': o.always_rg,
+            'phone': o.always_phone,
+        }
+
+        if o.only_document:
+            return tuple(kind for kind in only if always[kind] or only[kind])
+        if any(only.values()):
+            # Specific documents requested: generate only those
+            return tuple(kind for kind in only if only[kind])
+        if o.only_surname or o.only_middle:
+            return ()
+        return tuple(kind for kind in always if always[kind])
+
+    @staticmethod
+    def _cep_cache(options: SampleOptions) -> CepCache | None:
+        """Return the shared CEP cache configured by the options, if API calls are cached."""
+        o = options
+        if not (o.make_api_call and o.cep_cache_path):
+            return None
+        return get_cep_cache(o.cep_cache_path, ttl=o.cep_cache_ttl_hours * 3600, error_ttl=o.cep_cache_error_ttl_hours * 3600)
+
+    @staticmethod
+    def _cep_index(options: SampleOptions) -> CepIndex | None:
+        """Return the shared CEP index configured by the options, if offline addresses should use it."""
+        o = options
+        if o.make_api_call or not o.cep_index_path:
+            return None
+        return get_cep_index(o.cep_index_path)
+
+    def _generate_names(self, n: int, options: SampleOptions, rng: np.random.Generator | None = None) -> list[NameComponents | None]:
+        """Generate the name components requested by the options for n records, in one batch."""
+        o = options
+        if o.only_document or any([o.only_cpf, o.only_pis, o.only_cnpj, o.only_cei, o.only_rg, o.only_fone]):
+            return [None] * n
+        if o.only_surname:
+            surnames = self.name_sampler.get_random_surnames(
+                n, top_40=o.top_40, raw=o.name_raw, with_only_one_surname=o.with_only_one_surname, rng=rng
+            )
+            return [NameComponents('', None, surname) for surname in surnames]
+        if o.only_middle:
+            return self.name_sampler.get_random_names(n, raw=o.name_raw, only_middle=True, return_components=True, rng=rng)
+        return self.name_sampler.get_random_names(
+            n,
+            time_period=o.time_period,
+            raw=o.name_raw,
+            include_surname=True,
+            top_40=o.top_40,
+            with_only_one_surname=o.with_only_one_surname,
+            always_middle=o.always_middle,
+            return_components=True,
+            rng=rng,
+        )
+
+    def _prepare_records(
+        self,
+        n: int,
+        options: SampleOptions,
+        progress_callback: callable = None,
+        rng: BlockRng | None = None,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> tuple[list[tuple[str, NameComponents | None, dict[str, str]]], list[str], list[random.Random] | None]:
+        """Draw everything but the address data for n records, and finish records start to stop - 1.
+
+        The state, city and CEP of every record are drawn once, in a single
+        vectorized `sample_batch` call; the RG, phone, CEP and address stages
+        all reuse that draw. Names are drawn the same way, as one batch.
+        The vectorized draws always cover all n records, so that with rng the
+        records do not depend on start and stop; the per-record stages only
+        run for the records in the range.
+        Without rng, the samplers' own generators and the random module are used.
+
+        Returns:
+            Tuple of (one (location string, name components, documents) entry per record in the range,
+            their CEPs, their per-record random sources or None without rng)
+        """
+        location_sampler = self.location_sampler
+        doc_sampler = self.doc_sampler
+        o = options
+
+        document_kinds = self._document_kinds(o)
+        if o.only_document:
+            stage = 'Generating documents'
+        elif any([o.only_cpf, o.only_pis, o.only_cnpj, o.only_cei, o.only_rg, o.only_fone]):
+            stage = 'Generating specific documents'
+        elif o.return_only_name or o.only_surname or o.only_middle:
+            stage = 'Generating names'
+        else:
+            stage = 'Generating complete profiles'
+
+        # One entry per record: (location string, name components, documents)
+        results: list[tuple[str, NameComponents | None, dict[str, str]]] = []
+        all_ceps = []
+        stop = n if stop is None else min(stop, n)
+
+        # Draw every location up front in one vectorized pass; every later stage reuses it
+        np_rng = rng.np_rng if rng else None
+        record_rngs = [random.Random(seed) for seed in rng.record_seeds(n)[start:stop]] if rng else None
+        batch = location_sampler.sample_batch(n, np_rng)
+        state_names = [location_sampler.batch_state_names[s] for s in batch.states.tolist()]
+        state_abbrs = [location_sampler.batch_state_abbrs[s] for s in batch.states.tolist()]
+        city_names = [location_sampler.batch_city_names[c] for c in batch.cities.tolist()]
+        ceps = batch.ceps
+        cep_index = self._cep_index(o)
+        if cep_index is not None:
+            # Move each random CEP onto the closest real one of its city, so its street and neighborhood are known
+            ceps = cep_index.snap(ceps, *location_sampler.batch_cep_ranges(batch.cities))
+        formatted_ceps = location_sampler.format_ceps(ceps, not o.cep_without_dash)
+        names = self._generate_names(n, o, np_rng)
+        # CPF, PIS, CNPJ and CEI do not depend on the location: draw each kind as one batch
+        batch_documents = {kind: doc_sampler.generate_batch(kind, n, rng=np_rng) for kind in document_kinds if kind in BATCH_GENERATORS}
+
+        for i in range(start, stop):
+            state_name, state_abbr, city_name, formatted_cep = state_names[i], state_abbrs[i], city_names[i], formatted_ceps[i]
+            py_rng = record_rngs[i - start] if record_rngs else None
+            documents = {}
+            for kind in document_kinds:
+                if kind in batch_documents:
+                    documents[kind] = batch_documents[kind][i]
+                elif kind == 'rg':
+                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, o.include_issuer, rng=py_rng)}'
+                else:
+                    documents['phone'] = self._generate_phone(city_name, py_rng)
+
+            # The parse_result function expects the format: "city - cep, state (abbr)"
+            location_str = f'{city_name} - {formatted_cep}, {state_name} ({state_abbr})'
+            results.append((location_str, names[i], documents))
+            all_ceps.append(formatted_cep)
+
+            # Report progress if callback is provided
+            if progress_callback and i % max(1, n // 100) == 0:
+                progress_callback(i + 1, stage)
+
+        return results, all_ceps, record_rngs
+
+    def generate(
+        self,
+        n: int,
+        options: SampleOptions,
+        progress_callback: callable = None,
+        rng: BlockRng | None = None,
+        start: int = 0,
+        stop: int | None = None,
+        cep_pool: CepPoolRunner | None = None,
+    ) -> list[dict]:
+        """Generate n records with the loaded samplers.
+
+        Args:
+            n: Number of records to generate
+            options: Flags controlling which fields are generated
+            progress_callback: Optional callback function to report progress (takes completed count as parameter)
+            rng: Optional random sources of every draw (see `src.utils.record_rng`); without them the
+                samplers' own generators and the random module are used
+            start: Index of the first record finished and returned
+            stop: Index past the last record finished and returned (defaults to n); the random values
+                of all n records are still drawn, but only the returned ones get addresses looked up
+            cep_pool: Optional running CEP lookup pool for the API calls; without it, one is started for this call
+
+        Returns:
+            List of dictionaries in the `parse_result` format
+        """
+        o = options
+        results, all_ceps, record_rngs = self._prepare_records(n, o, progress_callback, rng, start, stop)
+
+        # Update progress to indicate we're making API calls if applicable
+        if progress_callback and o.make_api_call:
+            progress_callback(n * 3 // 4, 'API calls starting')  # Show approximately 75% progress
+
+        # Get address data for all CEPs at once
+        lookups = get_address_data_batch(
+            all_ceps,
+            o.make_api_call,
+            progress_callback,
+            o.cep_pool_size,
+            self._cep_cache(o),
+            o.cep_retry_policy,
+            o.cep_backend,
+            self._cep_index(o),
+            record_rngs,
+            cep_pool.pool if cep_pool else None,
+        )
+        address_data_list = cep_pool.run(lookups) if cep_pool else asyncio.run(lookups)
+
+        # Update progress to indicate API calls are complete
+        if progress_callback and o.make_api_call:
+            progress_callback(n * 4 // 5, 'API calls completed')
+
+        # Update progress to indicate we're finalizing results
+        if progress_callback:
+            progress_callback(n * 9 // 10, 'Finalizing results')  # Show approximately 90% progress
+
+        # Convert results to dictionary format
+        return [
+            parse_result(location, name_components, documents, state_info=None, address_data=address_data)
+            for (location, name_components, documents), address_data in zip(results, address_data_list, strict=True)
+        ]
+
+    def iter_samples(
+        self, n: int, options: SampleOptions, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: callable = None
+    ) -> Iterator[list[dict]]:
+        """Generate n records lazily, yielding them in chunks.
+
+        Memory use is bounded by chunk_size rather than n.
+
+        Args:
+            n: Total number of records to generate
+            options: Flags controlling which fields are generated
+            chunk_size: Maximum number of records per yielded chunk
+            progress_callback: Optional callback function to report progress over all n records
+
+        Yields:
+            Lists of at most chunk_size dictionaries in the `parse_result` format
+        """
+        chunk_size = max(1, chunk_size)
+        done = 0
+        while done < n:
+            size = min(chunk_size, n - done)
+
+            chunk_callback = None
+            if progress_callback:
+                # Translate the chunk-relative progress into overall progress
+                def chunk_callback(completed: int, stage: str | None = None, offset: int = done, size: int = size) -> None:
+                    progress_callback(offset + min(completed, size), stage)
+
+            yield self.generate(size, options, chunk_callback)
+            done += size
+
+    def generate_table(
+        self, n: int, options: SampleOptions, chunk_size: int = DEFAULT_CHUNK_SIZE, progress_callback: callable = None
+    ) -> 'pa.Table':
+        """Generate n records as an Arrow table (see `src.utils.parquet_writer.record_schema`).
+
+        Records are converted to columns a chunk at a time, so at most
+        chunk_size of them are held as dictionaries at once.
+
+        Args:
+            n: Number of records to generate
+            options: Flags controlling which fields are generated
+            chunk_size: Maximum number of records generated at once
+            progress_callback: Optional callback function to report progress over all n records
+
+        Returns:
+            Table with one row per record and one column per `parse_result` field
+
+        Raises:
+            ValueError: If pyarrow is not installed
+        """
+        return chunks_to_table(self.iter_samples(n, options, chunk_size, progress_callback))
+
+    async def stream(
+        self,
+        n: int,
+        options: SampleOptions,
+        output: asyncio.Queue,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress_callback: callable = None,
+    ) -> None:
+        """Generate n records onto a queue, each one as soon as its address data is ready.
+
+        Records are prepared chunk by chunk; within a chunk they are finished in
+        the order their CEP lookups complete, so a slow CEP only delays its own
+        record. One CEP lookup pool serves every chunk.
+
+        Args:
+            n: Total number of records to generate
+            options: Flags controlling which fields are generated
+            output: Queue receiving (record index, record) tuples, then None once all are done;
+                bound its size to bound memory use
+            chunk_size: Maximum number of records prepared at once
+            progress_callback: Optional callback function to report progress over all n records
+        """
+        o = options
+        chunk_size = max(1, chunk_size)
+        pool = None
+        try:
+            if o.make_api_call:
+                pool = create_cep_pool(o.cep_backend, size=o.cep_pool_size, retry_policy=o.cep_retry_policy)
+                try:
+                    await pool.start()
+                except OSError:
+                    pool = None  # Each lookup reports the error and the address is generated instead
+                if progress_callback:
+                    progress_callback(0, 'API calls starting')
+
+            stage = 'API calls: Processing responses' if o.make_api_call else 'Writing records'
+            done = 0
+            while done < n:
+                size = min(chunk_size, n - done)
+                results, ceps, _ = self._prepare_records(size, o)
+                async for i, address_data in iter_address_data(
+                    ceps,
+                    o.make_api_call,
+                    o.cep_pool_size,
+                    self._cep_cache(o),
+                    o.cep_retry_policy,
+                    pool,
+                    cep_backend=o.cep_backend,
+                    cep_index=self._cep_index(o),
+                ):
+                    location, name_components, documents = results[i]
+                    await output.put((done + i, parse_result(location, name_components, documents, address_data=address_data)))
+                    finished = done + i + 1
+                    if progress_callback and finished % max(1, n // 100) == 0:
+                        progress_callback(finished, stage)
+                done += size
+
+            if progress_callback and o.make_api_call:
+                progress_callback(n, 'API calls completed')
+        finally:
+            if pool is not None:
+                await pool.close()
+            await output.put(None)
+
+    async def write_jsonl(
+        self,
+        n: int,
+        options: SampleOptions,
+        filename: str,
+        append: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        queue_size: int = DEFAULT_OUTPUT_QUEUE_SIZE,
+        progress_callback: callable = None,
+        on_record: Callable[[int, dict], None] | None = None,
+    ) -> int:
+        """Generate n records straight into a JSONL file.
+
+        `stream` and `write_jsonl_from_queue` run concurrently, joined by a
+        bounded queue: records are written while others are still being looked
+        up, and at most `queue_size` finished records wait in memory. With API
+        calls, records are written in the order their lookups complete.
+
+        Args:
+            n: Total number of records to generate
+            options: Flags controlling which fields are generated
+            filename: Path to the output JSONL file
+            append: If True, append to existing file instead of overwriting
+            chunk_size: Maximum number of records prepared at once
+            queue_size: Maximum number of finished records waiting for the writer
+            progress_callback: Optional callback function to report progress over all n records
+            on_record: Optional callback receiving each (record index, record) as it is written
+
+        Returns:
+            Number of records written
+        """
+        queue = asyncio.Queue(maxsize=max(1, queue_size))
+        producer = asyncio.create_task(self.stream(n, options, queue, chunk_size, progress_callback))
+        try:
+            written = await write_jsonl_from_queue(queue, filename, append=append, on_record=on_record)
+        except BaseException:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+        # Re-raise anything that stopped the producer early
+        await producer
+        return written
+
+
+# Engines already built in this process, keyed by their data paths
+_ENGINES: dict[tuple[str, ...], SamplerEngine] = {}
+
+
+def get_engine(
+    json_path: str | Path,
+    names_path: str | Path | None,
+    middle_names_path: str | Path | None,
+    surnames_path: str | Path,
+    locations_path: str | Path | None = None,
+    bundle_path: str | Path | None = None,
+) -> SamplerEngine:
+    """Return the shared SamplerEngine for the given data paths, building it on first use.
+
+    Args:
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Optional path to locations data JSON file
+        bundle_path: Optional data bundle to restore the samplers from when it is current
+
+    Returns:
+        SamplerEngine instance reused across calls with the same paths
+    """
+    key = tuple(str(p) if p else '' for p in (json_path, names_path, middle_names_path, surnames_path, locations_path, bundle_path))
+    if key not in _ENGINES:
+        _ENGINES[key] = SamplerEngine(json_path, names_path, middle_names_path, surnames_path, locations_path, bundle_path)
+    return _ENGINES[key]
+
+
+# CEP lookup pool of the shards generated by this worker process (see `_generate_shard`)
+_WORKER_CEP_POOL: CepPoolRunner | None = None
+
+
+def _generate_shard(
+    data_paths: dict[str, str | Path | None],
+    bundle_path: Path,
+    options: SampleOptions,
+    seed: int,
+    shard: int,
+    shard_size: int,
+    start: int,
+    stop: int,
+) -> tuple[list[dict], int, int]:
+    """Generate one shard of `SamplerEngine.iter_shards` in a worker process. Must stay picklable.
+
+    Returns:
+        Tuple of (records, CEP cache hits, CEP cache misses) of this shard
+    """
+    global _WORKER_CEP_POOL  # noqa: PLW0603
+    engine = get_engine(**data_paths, bundle_path=bundle_path)
+    if options.make_api_call and _WORKER_CEP_POOL is None:
+        # Started on this worker's first shard, stopped when the worker process exits
+        _WORKER_CEP_POOL = CepPoolRunner(options)
+        Finalize(_WORKER_CEP_POOL, _WORKER_CEP_POOL.close, exitpriority=10)
+    cache = engine._cep_cache(options)
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    records = engine.generate_shard(options, seed, shard, shard_size, start, stop, _WORKER_CEP_POOL)
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return records, hits, misses
+
+
+def iter_samples(
+    qty: int,
+    options: SampleOptions | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    engine: SamplerEngine | None = None,
+    json_path: str | Path | None = None,
+    names_path: str | Path | None = None,
+    middle_names_path: str | Path | None = None,
+    surnames_path: str | Path | None = None,
+    locations_path: str | Path | None = None,
+) -> Iterator[list[dict]]:
+    """Stream generated samples in chunks with constant memory.
+
+    Args:
+        qty: Number of samples to generate
+        options: Flags controlling which fields are generated (defaults to SampleOptions())
+        chunk_size: Maximum number of records per yielded chunk
+        engine: Optional pre-built SamplerEngine; defaults to the shared engine for the given paths
+        json_path: Path to city/state data JSON file
+        names_path: Path to first names data file
+        middle_names_path: Path to middle names data file
+        surnames_path: Path to surnames data file
+        locations_path: Path to locations data JSON file
+
+    Yields:
+        Lists of at most chunk_size dictionaries in the `parse_result` format
+    """
+    if engine is None:
+        engine = get_engine(json_path, names_path, middle_names_path, surnames_path, locations_path)
+    yield from engine.iter_samples(qty, options or SampleOptions(), chunk_size)
+
+
 def sample(
     qty: int,
     q: int | None,
@@ -262,7 +1223,20 @@ def sample(
     all_data: bool,
     progress_callback: callable = None,
     append_to_jsonl: bool = False,
-) -> dict | list[dict]:
+    engine: SamplerEngine | None = None,
+    return_results: bool = True,
+    cep_pool_size: int = DEFAULT_POOL_SIZE,
+    cep_cache_path: str | Path | None = None,
+    cep_cache_ttl_hours: float = DEFAULT_TTL_HOURS,
+    cep_cache_error_ttl_hours: float = DEFAULT_ERROR_TTL_HOURS,
+    cep_retry_policy: RetryPolicy | None = None,
+    cep_backend: CepBackend = CepBackend.NODE,
+    cep_index_path: str | Path | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    offset: int = 0,
+    output_format: OutputFormat = OutputFormat.JSONL,
+) -> dict | list[dict] | None:
     """Generate random Brazilian samples with comprehensive information.
 
     This function generates random Brazilian location, name, and document samples
@@ -303,340 +1277,127 @@ def sample(
         only_document: Return only documents
         surnames_path: Path to surnames data file
         locations_path: Path to locations data JSON file
-        save_to_jsonl: Path to save generated samples as JSONL
+        save_to_jsonl: Path to save generated samples to (as JSONL unless output_format says otherwise)
         all_data: Include all possible data in the generated samples
         progress_callback: Optional callback function to report progress (takes completed count as parameter)
         append_to_jsonl: If True, append to existing JSONL file instead of overwriting
+        engine: Optional pre-built SamplerEngine; defaults to the shared engine for the given paths
+        return_results: If False, samples are only streamed to save_to_jsonl and None is returned
+        cep_pool_size: Number of Node CEP workers (or HTTP connections per provider) used when make_api_call is set
+        cep_cache_path: SQLite file caching CEP lookups across runs (None disables the cache)
+        cep_cache_ttl_hours: Hours a cached CEP lookup stays valid
+        cep_cache_error_ttl_hours: Hours a cached failed CEP lookup stays valid
+        cep_retry_policy: Retry and circuit breaker settings for the API calls (defaults if None)
+        cep_backend: How the CEPs are looked up: Node workers running cep-promise, or HTTP from Python
+        cep_index_path: CEP index file (see `build_cep_index`) giving real streets and neighborhoods without API calls
+        workers: Number of processes generating shards of records in parallel (see `SamplerEngine.iter_shards`)
+        seed: Seed making the records reproducible whatever the number of workers
+        offset: Index in the seeded dataset of the first record to generate (requires seed)
+        output_format: Format of the save_to_jsonl file; Parquet files are written in row groups and always overwritten
 
     Returns:
-        Dictionary or list of dictionaries containing the generated samples
+        Dictionary or list of dictionaries containing the generated samples, or None if return_results is False
     """
     # Handle q parameter alias (takes precedence over qty)
     actual_qty = q if q is not None else qty
 
-    # If all_data is True, override other flags to include everything
-    if all_data:
-        always_cpf = True
-        always_pis = True
-        always_cnpj = True
-        always_cei = True
-        always_rg = True
-        always_phone = True
-        always_middle = True
-        only_cpf = False
-        only_pis = False
-        only_cnpj = False
-        only_cei = False
-        only_rg = False
-        only_fone = False
-        only_surname = False
-        only_middle = False
-        only_cep = False
-        city_only = False
-        state_abbr_only = False
-        state_full_only = False
-        return_only_name = False
-        only_document = False
+    options = SampleOptions(
+        city_only=city_only,
+        state_abbr_only=state_abbr_only,
+        state_full_only=state_full_only,
+        only_cep=only_cep,
+        cep_without_dash=cep_without_dash,
+        make_api_call=make_api_call,
+        cep_pool_size=cep_pool_size,
+        cep_cache_path=cep_cache_path,
+        cep_cache_ttl_hours=cep_cache_ttl_hours,
+        cep_cache_error_ttl_hours=cep_cache_error_ttl_hours,
+        cep_retry_policy=cep_retry_policy,
+        cep_backend=cep_backend,
+        cep_index_path=cep_index_path,
+        time_period=time_period,
+        return_only_name=return_only_name,
+        name_raw=name_raw,
+        only_surname=only_surname,
+        top_40=top_40,
+        with_only_one_surname=with_only_one_surname,
+        always_middle=always_middle,
+        only_middle=only_middle,
+        always_cpf=always_cpf,
+        always_pis=always_pis,
+        always_cnpj=always_cnpj,
+        always_cei=always_cei,
+        always_rg=always_rg,
+        always_phone=always_phone,
+        only_cpf=only_cpf,
+        only_pis=only_pis,
+        only_cnpj=only_cnpj,
+        only_cei=only_cei,
+        only_rg=only_rg,
+        only_fone=only_fone,
+        include_issuer=include_issuer,
+        only_document=only_document,
+        all_data=all_data,
+    )
 
     try:
-        # Initialize samplers only once
-        location_sampler = BrazilianLocationSampler(json_path)
-        doc_sampler = DocumentSampler()
-
-        # Load location data if provided - do this only once
-        if locations_path:
-            try:
-                with Path(locations_path).open(encoding='utf-8') as f:
-                    locations_data = json.load(f)
-                    # Use locations data if available
-                    if 'cities' in locations_data:
-                        location_sampler.update_cities(locations_data['cities'])
-                    if 'states' in locations_data:
-                        location_sampler.update_states(locations_data['states'])
-            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-                # Log but continue with default data
-                print(f'Warning: Could not use locations_path data: {e}')
-
-        # Load surnames data for name sampler
-        with Path(surnames_path).open(encoding='utf-8') as f:
-            surnames_data = json.load(f)
-
-        # Create complete data for name sampler
-        name_data = {'surnames': surnames_data['surnames']}
-        if names_path:
-            with Path(names_path).open(encoding='utf-8') as f:
-                names_data = json.load(f)
-                name_data.update(names_data)
-
-        name_sampler = BrazilianNameSampler(
-            name_data,  # Pass the combined data
-            middle_names_path,
-            None,  # No need for names_path as we've already loaded it
-        )
-
-        # Initialize results list
-        results: list[tuple[str, NameComponents, dict[str, str]]] = []
-
-        if only_document:
-            # Document-only generation with proper state handling
-            for i in range(actual_qty):
-                documents = {}
-
-                # Generate location first to get proper state for RG
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                # Generate all requested documents
-                if always_cpf or only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if always_pis or only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if always_cnpj or only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if always_cei or only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if always_rg or only_rg:
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if always_phone or only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                results.append((None, None, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating documents')
-
-        elif any([only_cpf, only_pis, only_cnpj, only_cei, only_rg, only_fone]):
-            # Handle document-only generation with proper state handling
-            for i in range(actual_qty):
-                documents = {}
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to get proper state for RG
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-                if only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if only_rg:
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                results.append((None, None, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating specific documents')
-
-        elif return_only_name or only_surname or only_middle:
-            # Name-only generation
-            for i in range(actual_qty):
-                documents = {}
-                name_components = None
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to get proper state and DDD
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                if only_surname:
-                    name_components = NameComponents(
-                        '', None, name_sampler.get_random_surname(top_40=top_40, raw=name_raw, with_only_one_surname=with_only_one_surname)
-                    )
-                elif only_middle:
-                    name_components = name_sampler.get_random_name(raw=name_raw, only_middle=True, return_components=True)
-                else:
-                    name_components = name_sampler.get_random_name(
-                        time_period=time_period,
-                        raw=name_raw,
-                        include_surname=True,
-                        top_40=top_40,
-                        with_only_one_surname=with_only_one_surname,
-                        always_middle=always_middle,
-                        return_components=True,
-                    )
-
-                    # Add documents for full names
-                    if always_cpf:
-                        documents['cpf'] = doc_sampler.generate_cpf()
-                    if always_pis:
-                        documents['pis'] = doc_sampler.generate_pis()
-                    if always_cnpj:
-                        documents['cnpj'] = doc_sampler.generate_cnpj()
-                    if always_cei:
-                        documents['cei'] = doc_sampler.generate_cei()
-                    if always_rg:
-                        # Use the generated state for RG
-                        documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                    if always_phone:
-                        # Get the DDD from the city data
-                        city_data = location_sampler.city_data_by_name.get(city_name, {})
-                        ddd = city_data.get('ddd', None)
-                        documents['phone'] = generate_phone_number(ddd)
-
-                # Add the location string for name-only results
-                location_str = f'{city_name} - , {state_name} ({state_abbr})'
-                results.append((location_str, name_components, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating names')
-        else:
-            # Full sample generation with location, name, and documents
-            for i in range(actual_qty):
-                documents = {}
-
-                # No need to reload location data - already loaded once at the beginning
-
-                # Generate location first to ensure proper state handling
-                state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-                # Format location string
-                if city_only:
-                    location = city_name
-                elif state_abbr_only:
-                    location = state_abbr
-                elif state_full_only:
-                    location = state_name
-                elif only_cep:
-                    location = location_sampler._get_random_cep_for_city(city_name)
-                    location = location_sampler._format_cep(location, not cep_without_dash)
-                else:
-                    location = location_sampler.format_full_location(
-                        city_name, state_name, state_abbr, include_cep=True, cep_without_dash=cep_without_dash
-                    )
-
-                # Generate documents using the correct state
-                if always_cpf or only_cpf:
-                    documents['cpf'] = doc_sampler.generate_cpf()
-                if always_pis or only_pis:
-                    documents['pis'] = doc_sampler.generate_pis()
-                if always_cnpj or only_cnpj:
-                    documents['cnpj'] = doc_sampler.generate_cnpj()
-                if always_cei or only_cei:
-                    documents['cei'] = doc_sampler.generate_cei()
-                if always_rg or only_rg:
-                    # Always use the state from our location for RG generation
-                    documents['rg'] = f'{doc_sampler.generate_rg(state_abbr, include_issuer)}'
-                if always_phone or only_fone:
-                    # Get the DDD from the city data
-                    city_data = location_sampler.city_data_by_name.get(city_name, {})
-                    ddd = city_data.get('ddd', None)
-                    documents['phone'] = generate_phone_number(ddd)
-
-                # Generate name components if needed
-                name_components = None
-
-                name_components = name_sampler.get_random_name(
-                    time_period=time_period,
-                    raw=name_raw,
-                    include_surname=True,
-                    top_40=top_40,
-                    with_only_one_surname=with_only_one_surname,
-                    always_middle=always_middle,
-                    return_components=True,
-                )
-
-                results.append((location, name_components, documents))
-
-                # Report progress if callback is provided
-                if progress_callback and i % max(1, actual_qty // 100) == 0:
-                    progress_callback(i + 1, 'Generating complete profiles')
-
-        # Collect all CEPs that will be used
-        all_ceps = []
-        all_state_city_info = []
+        # Reuse the already-loaded samplers instead of re-reading the JSON files
+        if engine is None:
+            engine = get_engine(json_path, names_path, middle_names_path, surnames_path, locations_path)
 
-        # Update progress to indicate we're starting address generation
-        if progress_callback:
-            progress_callback(actual_qty // 2, 'Preparing address data')  # Show approximately half-way progress
-
-        # For all types of generation
-        for i in range(actual_qty):
-            # Generate a new state and city
-            state_name, state_abbr, city_name = location_sampler.get_state_and_city()
-
-            all_state_city_info.append((state_name, state_abbr, city_name))
-
-            # Get a random CEP for the city
-            cep = location_sampler._get_random_cep_for_city(city_name)
-            formatted_cep = location_sampler._format_cep(cep, not cep_without_dash)
-            all_ceps.append(formatted_cep)
-
-        # Update progress to indicate we're making API calls if applicable
-        if progress_callback and make_api_call:
-            progress_callback(actual_qty * 3 // 4, 'API calls starting')  # Show approximately 75% progress
-
-        # Get address data for all CEPs at once
-        address_data_list = asyncio.run(get_address_data_batch(all_ceps, make_api_call, progress_callback))
-
-        # Update progress to indicate API calls are complete
-        if progress_callback and make_api_call:
-            progress_callback(actual_qty * 4 // 5, 'API calls completed')
-
-        # Update progress to indicate we're finalizing results
-        if progress_callback:
-            progress_callback(actual_qty * 9 // 10, 'Finalizing results')  # Show approximately 90% progress
-
-        # Modify the results to include state_info and address data
-        results_with_state_info = []
-
-        for i in range(actual_qty):
-            state_name, state_abbr, city_name = all_state_city_info[i]
-            formatted_cep = all_ceps[i]
-
-            # Format the full location string with CEP
-            # The parse_result function expects the format: "city - cep, state (abbr)"
-            location_str = f'{city_name} - {formatted_cep}, {state_name} ({state_abbr})'
-
-            # Get the corresponding result
-            location, name_components, documents = results[i]
-
-            # Update the phone number to use the correct DDD
-            if 'phone' in documents:
-                # Get the DDD from the city data
-                city_data = location_sampler.city_data_by_name.get(city_name, {})
-                ddd = city_data.get('ddd', None)
-                documents['phone'] = generate_phone_number(ddd)
-
-            # Add to the new results list with state_info
-            results_with_state_info.append((location_str, name_components, documents))
-
-        # Convert results to dictionary format
         parsed_results = []
-        for i, (location, name_components, documents) in enumerate(results_with_state_info):
-            # Get the corresponding address data
-            address_data = address_data_list[i] if i < len(address_data_list) else {}
 
-            # Parse the location string to extract city, state, and CEP
-            result_dict = parse_result(location, name_components, documents, state_info=None, address_data=address_data)
-            parsed_results.append(result_dict)
-
-        # Save to JSONL if requested
-        if save_to_jsonl:
-            if progress_callback:
-                progress_callback(actual_qty * 95 // 100, 'Saving to JSONL file')
-
-            if isinstance(parsed_results, list):
-                asyncio.run(save_to_jsonl_file(parsed_results, save_to_jsonl, append=append_to_jsonl))
+        if workers > 1 or seed is not None or offset:
+            # Independently seeded shards, generated in worker processes and merged in order
+            def collected_shards() -> Iterator[list[dict]]:
+                done = 0
+                for shard in engine.iter_shards(actual_qty, options, workers=workers, seed=seed, offset=offset):
+                    if return_results:
+                        parsed_results.extend(shard)
+                    done += len(shard)
+                    if progress_callback:
+                        progress_callback(done, 'Generating shards')
+                    yield shard
+
+            if save_to_jsonl and output_format == OutputFormat.PARQUET:
+                save_stream_to_parquet(collected_shards(), save_to_jsonl)
+            elif save_to_jsonl:
+                save_stream_to_jsonl(collected_shards(), save_to_jsonl, append=append_to_jsonl)
             else:
-                asyncio.run(save_to_jsonl_file([parsed_results], save_to_jsonl, append=append_to_jsonl))
+                for _ in collected_shards():
+                    pass
+        elif save_to_jsonl and output_format == OutputFormat.PARQUET:
+            # Row groups need the records in order, so chunks are generated one after another
+            def collected_chunks() -> Iterator[list[dict]]:
+                for chunk in engine.iter_samples(actual_qty, options, progress_callback=progress_callback):
+                    if return_results:
+                        parsed_results.extend(chunk)
+                    yield chunk
+
+            save_stream_to_parquet(collected_chunks(), save_to_jsonl)
+        elif save_to_jsonl:
+            # Stream records straight to the file; keep them only if the caller wants them back
+            on_record = None
+            if return_results:
+                parsed_results = [None] * actual_qty
+
+                def on_record(index: int, record: dict) -> None:
+                    parsed_results[index] = record
+
+            asyncio.run(
+                engine.write_jsonl(
+                    actual_qty, options, save_to_jsonl, append=append_to_jsonl, progress_callback=progress_callback, on_record=on_record
+                )
+            )
+        else:
+            parsed_results = engine.generate(actual_qty, options, progress_callback)
 
         # Final progress update to indicate completion
         if progress_callback:
             progress_callback(actual_qty, 'Complete')
 
+        if not return_results:
+            return None
         return parsed_results[0] if actual_qty == 1 else parsed_results
     except Exception as e:
         # Re-raise the exception with more context
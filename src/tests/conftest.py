@@ -6,7 +6,7 @@ from typing import Any
 
 import pytest
 
-from src.time_period import TimePeriod
+from src.br_name_class import TimePeriod
 
 
 @pytest.fixture
@@ -32,3 +32,56 @@ def minimal_test_data() -> dict[str, Any]:
             'top_40': {'TEST': {'percentage': 1.0}},
         },
     }
+
+
+@pytest.fixture
+def engine_data_paths(tmp_path, minimal_test_data) -> dict[str, Path]:
+    """Write a small but complete dataset to disk and return the paths used by SamplerEngine."""
+    locations = {
+        'states': {
+            'São Paulo': {'state_abbr': 'SP', 'population_percentage': 0.6},
+            'Rio de Janeiro': {'state_abbr': 'RJ', 'population_percentage': 0.4},
+        },
+        'cities': {
+            'São Paulo': {
+                'city_name': 'São Paulo',
+                'city_uf': 'SP',
+                'ddd': '11',
+                'population_percentage_state': 0.5,
+                'cep_range_begins': '01000-000',
+                'cep_range_ends': '05999-999',
+            },
+            'Campinas': {
+                'city_name': 'Campinas',
+                'city_uf': 'SP',
+                'ddd': '19',
+                'population_percentage_state': 0.5,
+                'cep_range_begins': '13000-000',
+                'cep_range_ends': '13139-999',
+            },
+            'Rio de Janeiro': {
+                'city_name': 'Rio de Janeiro',
+                'city_uf': 'RJ',
+                'ddd': '21',
+                'population_percentage_state': 1.0,
+                'cep_range_begins': '20000-000',
+                'cep_range_ends': '23799-999',
+            },
+        },
+    }
+    middle_names = {
+        'percentage_with_second': 50.0,
+        'second_names': {'Maria': {'count': 3, 'percentage': 75.0}, 'José': {'count': 1, 'percentage': 25.0}},
+    }
+    files = {
+        'json_path': locations,
+        'names_path': {'common_names_percentage': minimal_test_data['common_names_percentage']},
+        'middle_names_path': middle_names,
+        'surnames_path': {'surnames': minimal_test_data['surnames']},
+    }
+    paths = {}
+    for key, content in files.items():
+        path = tmp_path / f'{key}.json'
+        path.write_text(json.dumps(content, ensure_ascii=False), encoding='utf-8')
+        paths[key] = path
+    return paths
@@ -0,0 +1,95 @@
+"""Local stand-in for the ViaCEP and BrasilAPI web services, used by the HTTP backend tests and benchmark.
+
+- CEPs starting with 999 are unknown (ViaCEP answers {"erro": true}, BrasilAPI 404).
+- CEPs starting with 555 fail with HTTP 503 as many times as their last digit (over both services), then succeed.
+- Every response waits `delay` seconds.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.cep_http import CepProvider, _parse_brasilapi, _parse_viacep
+
+
+class MockCepServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.delay = delay
+        self.requests = Counter()
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def providers(self) -> tuple[CepProvider, ...]:
+        """ViaCEP and BrasilAPI providers pointed at this server."""
+        return (
+            CepProvider('viacep', f'{self.base_url}/ws/{{cep}}/json/', _parse_viacep),
+            CepProvider('brasilapi', f'{self.base_url}/api/cep/v1/{{cep}}', _parse_brasilapi),
+        )
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            self.requests[key] += 1
+            return self.requests[key]
+
+    def __enter__(self) -> 'MockCepServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    # Send each response in one write, without Nagle delays
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        viacep = re.fullmatch(r'/ws/(\d{8})/json/', self.path)
+        brasilapi = re.fullmatch(r'/api/cep/v1/(\d{8})', self.path)
+        if not (viacep or brasilapi):
+            return self._send(404, {'message': 'not found'})
+        cep = (viacep or brasilapi).group(1)
+        attempt = self.server.count(cep)
+
+        if cep.startswith('555') and attempt <= int(cep[-1]):
+            return self._send(503, {'message': 'unavailable'})
+        if cep.startswith('999'):
+            return self._send(200, {'erro': True}) if viacep else self._send(404, {'message': 'CEP não encontrado'})
+        if viacep:
+            return self._send(
+                200,
+                {'cep': f'{cep[:5]}-{cep[5:]}', 'logradouro': f'Rua {cep}', 'bairro': 'Centro', 'localidade': 'São Paulo', 'uf': 'SP'},
+            )
+        return self._send(200, {'cep': cep, 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Centro', 'street': f'Rua {cep}'})
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
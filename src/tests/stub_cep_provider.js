@@ -0,0 +1,44 @@
+// Local stand-in for cep-promise used by the CEP worker tests.
+//
+// - CEPs starting with 999 are rejected like an unknown CEP.
+// - CEP 66666666 kills the worker process while the file named by
+//   CEP_STUB_CRASH_FILE exists, deleting the file first, so the next attempt succeeds.
+// - CEPs starting with 555 fail like an unreachable service (a cep-promise
+//   service_error) as many times as their last digit, counted per process,
+//   and then succeed.
+// - Every lookup waits CEP_STUB_DELAY_MS milliseconds (default 0).
+import { existsSync, unlinkSync } from "node:fs";
+
+const delay = Number(process.env.CEP_STUB_DELAY_MS || 0);
+const attempts = new Map();
+
+export default async function lookupCep(cep) {
+    if (cep === "66666666" && process.env.CEP_STUB_CRASH_FILE && existsSync(process.env.CEP_STUB_CRASH_FILE)) {
+        unlinkSync(process.env.CEP_STUB_CRASH_FILE);
+        process.exit(1);
+    }
+    await new Promise((resolve) => setTimeout(resolve, delay));
+    if (cep.startsWith("555")) {
+        const attempt = (attempts.get(cep) || 0) + 1;
+        attempts.set(cep, attempt);
+        if (attempt <= Number(cep.at(-1))) {
+            throw Object.assign(new Error("Todos os serviços de CEP retornaram erro."), {
+                type: "service_error",
+                errors: [{ message: "Erro ao se conectar com o serviço.", service: "stub" }],
+            });
+        }
+    }
+    if (cep.startsWith("999")) {
+        throw new Error("CEP NAO ENCONTRADO");
+    }
+    return {
+        cep,
+        state: "SP",
+        city: "São Paulo",
+        neighborhood: "Centro",
+        street: `Rua ${cep}`,
+        service: "stub",
+        pid: process.pid,
+        attempts: attempts.get(cep) || 1,
+    };
+}
@@ -0,0 +1,45 @@
+"""Tests for the AliasTable weighted sampler."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.utils.alias_table import AliasTable
+
+
+def test_draw_frequencies_match_weights() -> None:
+    random.seed(1)
+    table = AliasTable(['a', 'b', 'c'], [1, 2, 7])
+    counts = Counter(table.draw_many(20_000))
+    assert counts['a'] / 20_000 == pytest.approx(0.1, abs=0.01)
+    assert counts['b'] / 20_000 == pytest.approx(0.2, abs=0.01)
+    assert counts['c'] / 20_000 == pytest.approx(0.7, abs=0.01)
+
+
+def test_zero_weight_is_never_drawn() -> None:
+    table = AliasTable(['never', 'always'], [0.0, 3.5])
+    assert set(table.draw_many(1000)) == {'always'}
+    assert table.draw() == 'always'
+
+
+def test_draw_indices_are_in_range() -> None:
+    table = AliasTable(list(range(50)), [i + 1 for i in range(50)])
+    indices = table.draw_indices(500)
+    assert len(indices) == 500
+    assert all(0 <= i < 50 for i in indices)
+    assert len(table) == 50
+
+
+@pytest.mark.parametrize(
+    ('values', 'weights', 'error'),
+    [
+        ([], [], IndexError),
+        (['a'], [1, 2], ValueError),
+        (['a', 'b'], [1, -1], ValueError),
+        (['a', 'b'], [0, 0], ValueError),
+    ],
+)
+def test_invalid_tables_are_rejected(values, weights, error) -> None:
+    with pytest.raises(error):
+        AliasTable(values, weights)
@@ -0,0 +1,122 @@
+"""Tests for the SQLite CEP lookup cache."""
+
+import asyncio
+
+import pytest
+
+from src.utils.cep_cache import CepCache, get_cep_cache, normalize_cep
+from src.utils.cep_wrapper import workers_for_multiple_cep
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakePool:
+    """Stands in for CepWorkerPool and records every lookup."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def lookup(self, cep: str) -> dict:
+        self.calls.append(cep)
+        if cep.startswith('999'):
+            return {'error': 'CEP NAO ENCONTRADO', 'cep': cep}
+        return {'cep': cep, 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Centro', 'street': f'Rua {cep}', 'service': 'fake'}
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    with CepCache(tmp_path / 'cache' / 'ceps.sqlite3', ttl=100, error_ttl=10, clock=clock) as cep_cache:
+        yield cep_cache
+
+
+def test_normalize_cep() -> None:
+    assert normalize_cep('01001-000') == '01001000'
+    assert normalize_cep(1001000) == '01001000'
+
+
+def test_ttl_and_negative_caching(cache, clock) -> None:
+    cache.put_many(
+        {
+            '01001-000': {'cep': '01001000', 'street': 'Praça da Sé', 'city': 'São Paulo', 'state': 'SP', 'extra': 'ignored'},
+            '99999999': {'error': 'CEP NAO ENCONTRADO', 'cep': '99999999'},
+        }
+    )
+    found = cache.get_many(['01001000', '99999-999'])
+    assert found['01001000'] == {
+        'cep': '01001000',
+        'street': 'Praça da Sé',
+        'neighborhood': None,
+        'city': 'São Paulo',
+        'state': 'SP',
+        'service': None,
+    }
+    assert found['99999999'] == {'error': 'CEP NAO ENCONTRADO', 'cep': '99999999'}
+
+    clock.now += 11  # past the error TTL only
+    assert set(cache.get_many(['01001000', '99999999'])) == {'01001000'}
+    clock.now += 90  # past the TTL too
+    assert cache.get_many(['01001000']) == {}
+    assert cache.purge_expired() == 2
+
+    assert (cache.hits, cache.misses) == (3, 2)
+    assert cache.hit_rate == pytest.approx(0.6)
+
+
+def test_retryable_errors_are_not_cached(cache) -> None:
+    cache.put_many({'01001000': {'error': 'Node CEP worker crashed', 'cep': '01001000', 'retryable': True}})
+    assert cache.get_many(['01001000']) == {}
+
+
+def test_cache_persists_across_instances(tmp_path, clock) -> None:
+    path = tmp_path / 'ceps.sqlite3'
+    with CepCache(path, clock=clock) as first:
+        first.put_many({'01001000': {'cep': '01001000', 'street': 'Praça da Sé'}})
+    with CepCache(path, clock=clock) as second:
+        assert second.get_many(['01001000'])['01001000']['street'] == 'Praça da Sé'
+
+
+def test_workers_only_look_up_misses(cache) -> None:
+    pool = FakePool()
+    ceps = ['01001000', '99900000', '01002000']
+
+    first = asyncio.run(workers_for_multiple_cep(ceps, pool=pool, cache=cache))
+    second = asyncio.run(workers_for_multiple_cep([*ceps, '01003000'], pool=pool, cache=cache))
+
+    assert pool.calls == [*ceps, '01003000']
+    assert second[:3] == [
+        {'cep': '01001000', 'street': 'Rua 01001000', 'neighborhood': 'Centro', 'city': 'São Paulo', 'state': 'SP', 'service': 'fake'},
+        {'error': 'CEP NAO ENCONTRADO', 'cep': '99900000'},
+        {'cep': '01002000', 'street': 'Rua 01002000', 'neighborhood': 'Centro', 'city': 'São Paulo', 'state': 'SP', 'service': 'fake'},
+    ]
+    assert [result.get('street') for result in first] == [result.get('street') for result in second[:3]]
+    assert (cache.hits, cache.misses) == (3, 4)
+
+
+def test_duplicate_ceps_are_looked_up_once() -> None:
+    pool = FakePool()
+    ceps = ['01001000', '01002-000', '01001-000', '1001000', '01002000']
+
+    results = asyncio.run(workers_for_multiple_cep(ceps, pool=pool))
+
+    assert pool.calls == ['01001000', '01002000']
+    assert [result['street'] for result in results] == ['Rua 01001000', 'Rua 01002000', 'Rua 01001000', 'Rua 01001000', 'Rua 01002000']
+    results[0]['street'] = 'changed'
+    assert results[2]['street'] == 'Rua 01001000'
+
+
+def test_get_cep_cache_is_shared(tmp_path) -> None:
+    first = get_cep_cache(tmp_path / 'shared.sqlite3', ttl=5)
+    second = get_cep_cache(tmp_path / 'shared.sqlite3', ttl=7)
+    assert first is second
+    assert second.ttl == 7
@@ -0,0 +1,86 @@
+"""Tests for the pure-Python HTTP CEP backend, run against a local mock server."""
+
+import asyncio
+
+import pytest
+
+from src.tests.mock_cep_server import MockCepServer
+from src.utils.cep_http import HttpCepPool
+from src.utils.cep_wrapper import CepBackend, CepLookupPool, create_cep_pool, workers_for_multiple_cep
+from src.utils.retry_policy import RetryPolicy
+
+
+@pytest.fixture
+def server():
+    with MockCepServer() as mock_server:
+        yield mock_server
+
+
+def _pool(server: MockCepServer, **kwargs) -> HttpCepPool:
+    return HttpCepPool(providers=server.providers(), **kwargs)
+
+
+def test_lookups_reuse_keep_alive_connections(server) -> None:
+    async def run() -> list[dict]:
+        async with _pool(server, size=2) as pool:
+            return await workers_for_multiple_cep([f'0100{i:04d}' for i in range(30)], max_workers=8, pool=pool)
+
+    results = asyncio.run(run())
+    assert results[3] == {
+        'cep': '01000003',
+        'state': 'SP',
+        'city': 'São Paulo',
+        'neighborhood': 'Centro',
+        'street': 'Rua 01000003',
+        'service': 'viacep',
+    }
+    # 30 requests over at most 2 connections to the first provider
+    assert server.connections <= 2
+
+
+def test_falls_back_to_the_next_provider(server) -> None:
+    async def run() -> dict:
+        async with _pool(server, retry_policy=RetryPolicy(max_attempts=1)) as pool:
+            return await pool.lookup('55500001')
+
+    result = asyncio.run(run())
+    assert result['service'] == 'brasilapi'
+    assert server.requests == {'55500001': 2}
+
+
+def test_unknown_and_failing_ceps(server) -> None:
+    policy = RetryPolicy(max_attempts=2, base_delay=0)
+
+    async def run() -> tuple[dict, dict, HttpCepPool]:
+        async with _pool(server, retry_policy=policy) as pool:
+            return await pool.lookup('99900000'), await pool.lookup('55500009'), pool
+
+    missing, failing, pool = asyncio.run(run())
+    assert missing == {'error': 'CEP NAO ENCONTRADO', 'cep': '99900000'}
+    assert failing['retryable']
+    assert 'HTTP 503' in failing['error']
+    assert pool.retries == 1
+
+
+def test_unreachable_provider_is_retryable() -> None:
+    with MockCepServer() as server:
+        providers = server.providers()
+    # The server is shut down: every connection is refused
+    result = asyncio.run(
+        workers_for_multiple_cep(['01001000'], pool=HttpCepPool(providers=providers, retry_policy=RetryPolicy(max_attempts=1)))
+    )
+    assert result[0]['retryable']
+
+
+def test_create_cep_pool() -> None:
+    assert isinstance(create_cep_pool(CepBackend.HTTP, size=3), HttpCepPool)
+    assert create_cep_pool('http').size == 4
+
+
+def test_backends_must_implement_the_whole_interface() -> None:
+    class StartOnlyPool(CepLookupPool):
+        async def start(self) -> None:
+            pass
+
+    with pytest.raises(TypeError, match='abstract'):
+        StartOnlyPool()
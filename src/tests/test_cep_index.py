@@ -0,0 +1,142 @@
+"""Tests for the memory-mapped CEP address index."""
+
+import json
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.sampler import SampleOptions, SamplerEngine
+from src.utils.cep_cache import CepCache
+from src.utils.cep_index import CepIndex, build_cep_index, get_cep_index, read_address_file
+
+RECORDS = [
+    {'cep': '01001-000', 'street': 'Praça da Sé', 'neighborhood': 'Sé', 'city': 'São Paulo', 'state': 'SP'},
+    {'cep': '13010000', 'street': 'Rua Barão de Jaguara', 'neighborhood': 'Centro', 'city': 'Campinas', 'state': 'SP'},
+    {'cep': 20040002, 'street': 'Avenida Rio Branco', 'neighborhood': 'Centro', 'city': 'Rio de Janeiro', 'state': 'RJ'},
+    {'cep': '69005-000', 'street': 'Rua Eduardo Ribeiro', 'neighborhood': 'Centro', 'city': 'Manaus', 'state': 'AM'},
+    {'cep': '99999999', 'error': 'CEP NAO ENCONTRADO'},
+    {'cep': 'not a cep', 'street': 'Skipped'},
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / 'index' / 'ceps.bin'
+    assert build_cep_index(RECORDS, path) == 4
+    return path
+
+
+def test_lookups(index_path) -> None:
+    with CepIndex(index_path) as index:
+        assert len(index) == 4
+        assert index.keys.tolist() == [1001000, 13010000, 20040002, 69005000]
+        assert index.get('69005000') == {
+            'cep': '69005000',
+            'street': 'Rua Eduardo Ribeiro',
+            'neighborhood': 'Centro',
+            'city': 'Manaus',
+            'state': 'AM',
+        }
+        assert index.get('01001-000')['street'] == 'Praça da Sé'
+        assert index.get('01001001') is None
+        assert '20040-002' in index
+        assert '99999999' not in index
+        assert index.find(['13010-000', '', '00000000', np.int64(20040002)]).tolist() == [1, -1, -1, 2]
+        assert index.find(np.array([69005000, -1, 1001000])).tolist() == [3, -1, 0]
+
+
+def test_nearest_and_snap_stay_in_range(index_path) -> None:
+    with CepIndex(index_path) as index:
+        ceps = np.array([1500000, 13139999, 23000000, 69005000, -1])
+        low = np.array([1000000, 13000000, 20000000, 69000000, 0])
+        high = np.array([5999999, 13139999, 20040001, 69099999, 99999999])
+        assert index.nearest(ceps, low, high).tolist() == [0, 1, -1, 3, -1]
+        assert index.snap(ceps, low, high).tolist() == [1001000, 13010000, 23000000, 69005000, -1]
+
+
+def test_last_record_wins_and_empty_index(tmp_path) -> None:
+    path = tmp_path / 'ceps.bin'
+    build_cep_index([*RECORDS, {'cep': '01001000', 'street': 'Praça da Sé, lado ímpar'}], path)
+    with CepIndex(path) as index:
+        assert index.get('01001000') == {
+            'cep': '01001000',
+            'street': 'Praça da Sé, lado ímpar',
+            'neighborhood': '',
+            'city': '',
+            'state': '',
+        }
+
+    build_cep_index([], path)
+    with CepIndex(path) as index:
+        assert len(index) == 0
+        assert index.get('01001000') is None
+        assert index.snap(np.array([1001000]), np.array([0]), np.array([99999999])).tolist() == [1001000]
+
+
+def test_rejects_other_files(tmp_path) -> None:
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not an index at all, not even close')
+    with pytest.raises(ValueError, match='Not a CEP index'):
+        CepIndex(path)
+
+
+def test_get_cep_index_remaps_rebuilt_files(index_path) -> None:
+    first = get_cep_index(index_path)
+    assert get_cep_index(index_path) is first
+    build_cep_index(RECORDS[:1], index_path)
+    assert len(get_cep_index(index_path)) == 1
+
+
+def test_read_address_file_aliases(tmp_path) -> None:
+    csv_path = tmp_path / 'ceps.csv'
+    csv_path.write_text('CEP;Logradouro;Bairro;Localidade;UF\n69005-000;Rua Eduardo Ribeiro;Centro;Manaus;AM\n', encoding='utf-8')
+    jsonl_path = tmp_path / 'ceps.jsonl'
+    jsonl_path.write_text(json.dumps({'cep': '01001000', 'street': 'Praça da Sé', 'bairro': 'Sé'}) + '\n\n', encoding='utf-8')
+
+    assert list(read_address_file(csv_path, delimiter=';')) == [
+        {'cep': '69005-000', 'street': 'Rua Eduardo Ribeiro', 'neighborhood': 'Centro', 'city': 'Manaus', 'state': 'AM'}
+    ]
+    assert list(read_address_file(jsonl_path)) == [
+        {'cep': '01001000', 'street': 'Praça da Sé', 'neighborhood': 'Sé', 'city': None, 'state': None}
+    ]
+
+
+def test_build_cep_index_command(tmp_path) -> None:
+    cache_path = tmp_path / 'cache.sqlite3'
+    with CepCache(cache_path) as cache:
+        cache.put_many({record['cep']: record for record in RECORDS[:2]})
+        cache.put_many({'99999999': {'error': 'CEP NAO ENCONTRADO', 'cep': '99999999'}})
+    import_path = tmp_path / 'import.jsonl'
+    import_path.write_text(json.dumps({'cep': '13010000', 'logradouro': 'Rua Imported', 'uf': 'SP'}) + '\n', encoding='utf-8')
+    output = tmp_path / 'index.bin'
+
+    result = CliRunner().invoke(
+        app, ['build-cep-index', '--cep-cache', str(cache_path), '--import', str(import_path), '--output', str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    assert 'Indexed 2 CEPs' in result.output
+    with CepIndex(output) as index:
+        assert index.get('01001000')['street'] == 'Praça da Sé'
+        assert index.get('13010000')['street'] == 'Rua Imported'
+
+    result = CliRunner().invoke(app, ['build-cep-index', '--no-cep-cache', '--output', str(output)])
+    assert result.exit_code == 1
+    assert 'nothing to index' in result.output
+
+
+def test_offline_addresses_come_from_the_index(engine_data_paths, tmp_path) -> None:
+    index_path = tmp_path / 'ceps.bin'
+    build_cep_index(RECORDS, index_path)
+    engine = SamplerEngine(**engine_data_paths)
+
+    records = engine.generate(200, SampleOptions(all_data=True, cep_index_path=index_path))
+
+    expected = {
+        'São Paulo': ('01001-000', 'Praça da Sé', 'Sé'),
+        'Campinas': ('13010-000', 'Rua Barão de Jaguara', 'Centro'),
+        'Rio de Janeiro': ('20040-002', 'Avenida Rio Branco', 'Centro'),
+    }
+    for record in records:
+        assert (record['cep'], record['street'], record['neighborhood']) == expected[record['city']]
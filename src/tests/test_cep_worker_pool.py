@@ -0,0 +1,128 @@
+"""Tests for the persistent Node CEP worker pool, run against a local stub provider."""
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.utils.cep_wrapper import CepWorkerPool, workers_for_multiple_cep
+from src.utils.retry_policy import RetryPolicy
+
+STUB_PROVIDER = Path(__file__).with_name('stub_cep_provider.js')
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='Node is not installed')
+
+
+def _pool(size: int = 2, retry_policy: RetryPolicy | None = None, **env: str) -> CepWorkerPool:
+    return CepWorkerPool(size=size, env={'CEP_PROVIDER_MODULE': str(STUB_PROVIDER), **env}, retry_policy=retry_policy)
+
+
+def test_lookups_are_multiplexed_over_persistent_workers() -> None:
+    async def run() -> list[dict]:
+        async with _pool(size=2) as pool:
+            return await workers_for_multiple_cep([f'0100{i:04d}' for i in range(40)], max_workers=8, pool=pool)
+
+    results = asyncio.run(run())
+    assert [result['street'] for result in results] == [f'Rua 0100{i:04d}' for i in range(40)]
+    # 40 lookups served by the same two processes
+    assert len({result['pid'] for result in results}) == 2
+
+
+def test_provider_errors_are_returned_per_cep() -> None:
+    async def run() -> list[dict]:
+        async with _pool(size=1) as pool:
+            return [await pool.lookup('99900000'), await pool.lookup('01001000')]
+
+    missing, found = asyncio.run(run())
+    assert missing == {'error': 'CEP NAO ENCONTRADO', 'cep': '99900000'}
+    assert found['city'] == 'São Paulo'
+
+
+def test_concurrent_lookups_of_one_cep_share_a_request() -> None:
+    async def run() -> tuple[list[dict], int]:
+        async with _pool(size=2, CEP_STUB_DELAY_MS='50') as pool:
+            results = await asyncio.gather(*(pool.lookup(cep) for cep in ['01001-000', '01001000', '1001000', '01002000']))
+            return results, pool.coalesced
+
+    results, coalesced = asyncio.run(run())
+    assert coalesced == 2
+    assert [result['street'] for result in results] == ['Rua 01001000'] * 3 + ['Rua 01002000']
+    # Every caller gets its own copy of the shared result
+    assert results[0] is not results[1]
+
+
+def test_crashed_worker_is_restarted_and_lookup_retried(tmp_path) -> None:
+    crash_file = tmp_path / 'crash'
+    crash_file.touch()
+
+    async def run() -> tuple[list[dict], int]:
+        async with _pool(size=1, CEP_STUB_CRASH_FILE=str(crash_file), CEP_STUB_DELAY_MS='50') as pool:
+            results = await asyncio.gather(pool.lookup('01001000'), pool.lookup('66666666'), pool.lookup('01002000'))
+            return results, pool.restarts
+
+    results, restarts = asyncio.run(run())
+    assert restarts == 1
+    assert [result['cep'] for result in results] == ['01001000', '66666666', '01002000']
+    assert all('error' not in result for result in results)
+
+
+def test_lookup_gives_up_after_max_attempts(tmp_path) -> None:
+    async def run() -> dict:
+        policy = RetryPolicy(max_attempts=2, base_delay=0)
+        pool = CepWorkerPool(size=1, env={'CEP_PROVIDER_MODULE': str(tmp_path / 'missing.js')}, retry_policy=policy)
+        async with pool:
+            return await pool.lookup('01001000')
+
+    result = asyncio.run(run())
+    assert result['cep'] == '01001000'
+    assert 'failed after 2 attempts' in result['error']
+    assert result['retryable']
+
+
+def test_transient_provider_errors_are_retried_with_backoff() -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=0)
+
+    async def run() -> tuple[list[dict], int]:
+        async with _pool(size=1, retry_policy=policy) as pool:
+            results = [await pool.lookup(cep) for cep in ['55500002', '55500003', '99900000']]
+            return results, pool.retries
+
+    (recovered, exhausted, missing), retries = asyncio.run(run())
+    assert recovered['attempts'] == 3
+    assert exhausted['retryable']
+    assert exhausted['error'].startswith('CEP lookup failed after 3 attempts: Todos os serviços')
+    # Unknown CEPs are an answer, not a failure: no retry
+    assert missing == {'error': 'CEP NAO ENCONTRADO', 'cep': '99900000'}
+    assert retries == 4
+
+
+def test_circuit_breaker_fails_fast() -> None:
+    policy = RetryPolicy(max_attempts=2, base_delay=0, breaker_threshold=0.5, breaker_window=4, breaker_min_calls=4)
+
+    async def run() -> tuple[list[dict], CepWorkerPool]:
+        async with _pool(size=1, retry_policy=policy) as pool:
+            return await workers_for_multiple_cep([f'5550{i:03d}9' for i in range(6)], max_workers=1, pool=pool), pool
+
+    results, pool = asyncio.run(run())
+    # Two CEPs use up the window with failures, the rest are rejected without a request
+    assert [result['error'].startswith('CEP lookup failed') for result in results] == [True, True, False, False, False, False]
+    assert all('circuit breaker is open' in result['error'] for result in results[2:])
+    assert all(result['retryable'] for result in results)
+    assert pool.circuit_breaker.opened == 1
+
+
+def test_missing_node_gives_error_results() -> None:
+    async def run() -> list[dict]:
+        return await workers_for_multiple_cep(['01001000'], pool_size=1)
+
+    original = CepWorkerPool.__init__
+
+    def init_without_node(self, *args, **kwargs) -> None:
+        original(self, *args, node='definitely-not-node', **kwargs)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(CepWorkerPool, '__init__', init_without_node)
+        results = asyncio.run(run())
+    assert results[0]['cep'] == '01001000'
+    assert 'Could not start the node CEP lookup pool' in results[0]['error']
@@ -0,0 +1,99 @@
+"""Tests for the precompiled data bundle."""
+
+import os
+import pickle
+
+from typer.testing import CliRunner
+
+from src import data_bundle
+from src.cli import app
+from src.data_bundle import bundle_is_current, load_bundle, source_fingerprint, write_bundle
+from src.sampler import SampleOptions, SamplerEngine
+
+
+def _compile(engine_data_paths, path):
+    engine = SamplerEngine(**engine_data_paths)
+    sources = source_fingerprint(**engine_data_paths, locations_path=None)
+    write_bundle(path, engine.location_sampler, engine.name_sampler, sources)
+    return engine, sources
+
+
+def test_engine_loads_from_the_bundle(engine_data_paths, tmp_path) -> None:
+    bundle_path = tmp_path / 'cache' / 'bundle.pickle'
+    built, _ = _compile(engine_data_paths, bundle_path)
+
+    engine = SamplerEngine(**engine_data_paths, bundle_path=bundle_path)
+
+    assert engine.name_sampler.name_data is None  # Restored, not built from JSON
+    assert engine.name_sampler.np_rng is not built.name_sampler.np_rng
+    assert engine.location_sampler.city_for_cep('13010-000') == ('Campinas', 'SP')
+    assert engine.location_sampler.city_data_by_name['Campinas'] == {
+        key: value for key, value in built.location_sampler.city_data_by_name['Campinas'].items() if key in data_bundle._RUNTIME_CITY_FIELDS
+    }
+    records = engine.generate(50, SampleOptions(all_data=True))
+    assert len(records) == 50
+    assert records[0].keys() == built.generate(1, SampleOptions(all_data=True))[0].keys()
+    assert {record['city'] for record in records} <= {'São Paulo', 'Campinas', 'Rio de Janeiro'}
+
+
+def test_stale_bundles_are_ignored(engine_data_paths, tmp_path, capsys) -> None:
+    bundle_path = tmp_path / 'bundle.pickle'
+    _, sources = _compile(engine_data_paths, bundle_path)
+    assert bundle_is_current(bundle_path, sources)
+
+    surnames_path = engine_data_paths['surnames_path']
+    stat = surnames_path.stat()
+    os.utime(surnames_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    stale = source_fingerprint(**engine_data_paths, locations_path=None)
+    assert not bundle_is_current(bundle_path, stale)
+    assert load_bundle(bundle_path, stale) is None
+
+    engine = SamplerEngine(**engine_data_paths, bundle_path=bundle_path)
+    assert engine.name_sampler.name_data is not None
+    assert 'out of date' in capsys.readouterr().out
+
+
+def test_other_versions_and_files_are_ignored(engine_data_paths, tmp_path, monkeypatch) -> None:
+    bundle_path = tmp_path / 'bundle.pickle'
+    _, sources = _compile(engine_data_paths, bundle_path)
+    monkeypatch.setattr(data_bundle, 'BUNDLE_VERSION', data_bundle.BUNDLE_VERSION + 1)
+    assert load_bundle(bundle_path, sources) is None
+
+    bundle_path.write_bytes(pickle.dumps({'format': 'something else'}))
+    assert load_bundle(bundle_path, sources) is None
+    bundle_path.write_bytes(b'not a pickle')
+    assert load_bundle(bundle_path, sources) is None
+    assert load_bundle(tmp_path / 'missing.pickle', sources) is None
+
+
+def test_compile_data_command(engine_data_paths, tmp_path) -> None:
+    output = tmp_path / 'bundle.pickle'
+    args = [f'--{key.replace("_", "-")}' for key in engine_data_paths]
+
+    result = CliRunner().invoke(
+        app,
+        [
+            'compile-data',
+            *(item for arg, path in zip(args, engine_data_paths.values(), strict=True) for item in (arg, str(path))),
+            '--output',
+            str(output),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert 'Data compiled' in result.output
+    assert bundle_is_current(output, source_fingerprint(**engine_data_paths, locations_path='src/data/locations_data.json'))
+
+
+def test_bundle_arrays_are_views_of_the_mapped_file(engine_data_paths, tmp_path) -> None:
+    bundle_path = tmp_path / 'bundle.pickle'
+    built, sources = _compile(engine_data_paths, bundle_path)
+
+    location_sampler, name_sampler = load_bundle(bundle_path, sources)
+
+    for array in (location_sampler._batch_city_prob, location_sampler._batch_cep_begins, *location_sampler.state_table.arrays()):
+        assert not array.flags.owndata
+        assert not array.flags.writeable
+    assert location_sampler.state_table.arrays()[0].tolist() == built.location_sampler.state_table.arrays()[0].tolist()
+    assert location_sampler.state_table.draw() in location_sampler.state_names
+    assert all(0 <= i < len(location_sampler.state_names) for i in location_sampler.state_table.draw_indices(20))
@@ -0,0 +1,55 @@
+"""Tests for the vectorized CPF/CNPJ/PIS/CEI batch generators."""
+
+import numpy as np
+import pytest
+
+from src.document_sampler import DocumentSampler
+from src.utils.cei import format_cei, random_cei_batch, validate_cei
+from src.utils.cnpj import format_cnpj, random_cnpj_batch, validate_cnpj
+from src.utils.cpf import format_cpf, random_cpf_batch, validate_cpf
+from src.utils.pis import format_pis, random_pis_batch, validate_pis
+from src.utils.util import digits_to_strings
+
+GENERATORS = [
+    (random_cpf_batch, validate_cpf, format_cpf, 11),
+    (random_cnpj_batch, validate_cnpj, format_cnpj, 14),
+    (random_pis_batch, validate_pis, format_pis, 11),
+    (random_cei_batch, validate_cei, format_cei, 12),
+]
+
+
+@pytest.mark.parametrize(('batch', 'validate', 'fmt', 'length'), GENERATORS)
+def test_batch_documents_are_valid(batch, validate, fmt, length) -> None:
+    raw = batch(5_000, formatted=False, rng=np.random.default_rng(0))
+    assert len(raw) == 5_000
+    for document in raw:
+        assert len(document) == length
+        assert document.isdigit()
+        assert validate(document)
+
+
+@pytest.mark.parametrize(('batch', 'validate', 'fmt', 'length'), GENERATORS)
+def test_batch_formatting_matches_single_formatter(batch, validate, fmt, length) -> None:
+    raw = batch(200, formatted=False, rng=np.random.default_rng(1))
+    formatted = batch(200, formatted=True, rng=np.random.default_rng(1))
+    assert formatted == [fmt(document) for document in raw]
+
+
+def test_stems_follow_single_generator_ranges() -> None:
+    rng = np.random.default_rng(2)
+    assert all(cpf[0] != '0' for cpf in random_cpf_batch(1_000, formatted=False, rng=rng))
+    assert {cnpj[8:12] for cnpj in random_cnpj_batch(1_000, formatted=False, rng=rng)} == {'0001', '0002', '0003', '0004', '0005'}
+    assert all(11 <= int(cei[:2]) <= 53 for cei in random_cei_batch(1_000, formatted=False, rng=rng))
+
+
+def test_digits_to_strings_checks_template() -> None:
+    assert digits_to_strings(np.array([[1, 2], [3, 4]]), '#-#') == ['1-2', '3-4']
+    with pytest.raises(ValueError, match='needs 3 digits'):
+        digits_to_strings(np.array([[1, 2]]), '###')
+
+
+def test_document_sampler_batch() -> None:
+    sampler = DocumentSampler()
+    assert all(validate_cpf(cpf) for cpf in sampler.generate_batch('cpf', 10))
+    with pytest.raises(ValueError, match='No batch generator'):
+        sampler.generate_batch('rg', 10)
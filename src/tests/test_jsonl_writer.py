@@ -0,0 +1,84 @@
+"""Tests for the buffered JSONL writer."""
+
+import gzip
+import json
+
+import pytest
+
+from src.utils import jsonl_writer
+from src.utils.jsonl_writer import JsonlWriter, dumps_records
+
+RECORDS = [{'name': 'João', 'city': 'São Paulo', 'cep': '01000-000', 'index': i} for i in range(50)]
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_serializers_write_the_same_compact_lines(monkeypatch, use_orjson) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(jsonl_writer, 'orjson', None)
+    elif jsonl_writer.orjson is None:
+        pytest.skip('orjson is not installed')
+
+    data = dumps_records(RECORDS[:2])
+
+    assert (
+        data
+        == (
+            '{"name":"João","city":"São Paulo","cep":"01000-000","index":0}\n'
+            '{"name":"João","city":"São Paulo","cep":"01000-000","index":1}\n'
+        ).encode()
+    )
+
+
+def test_writer_buffers_until_the_block_is_full(tmp_path) -> None:
+    path = tmp_path / 'out' / 'records.jsonl'
+    writer = JsonlWriter(path, append=False, buffer_size=1024)
+
+    writer.write(RECORDS[:5])
+    assert path.read_bytes() == b''  # Still buffered
+    writer.write(RECORDS[5:])
+    assert path.stat().st_size >= 1024
+    writer.close()
+
+    assert [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()] == RECORDS
+    assert writer.written == len(RECORDS)
+
+
+def test_writer_appends_or_overwrites(tmp_path) -> None:
+    path = tmp_path / 'records.jsonl'
+    for append in (False, True):
+        with JsonlWriter(path, append=append) as writer:
+            writer.write(RECORDS[:3])
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 6
+
+    with JsonlWriter(path, append=False) as writer:
+        writer.write(RECORDS[:1])
+    assert len(path.read_text(encoding='utf-8').splitlines()) == 1
+
+
+def test_gzip_output_is_compressed_in_independent_members(tmp_path) -> None:
+    path = tmp_path / 'records.jsonl.gz'
+    with JsonlWriter(path, append=False, buffer_size=256, compress_threads=2) as writer:
+        writer.write(RECORDS)
+    with JsonlWriter(path) as writer:
+        writer.write(RECORDS[:2])
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == RECORDS + RECORDS[:2]
+
+
+def test_zstd_output_round_trips(tmp_path) -> None:
+    zstandard = pytest.importorskip('zstandard')
+    path = tmp_path / 'records.jsonl.zst'
+    with JsonlWriter(path, append=False, buffer_size=256) as writer:
+        writer.write(RECORDS)
+
+    with path.open('rb') as f:
+        data = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read()
+    assert [json.loads(line) for line in data.splitlines()] == RECORDS
+
+
+def test_zstd_output_needs_zstandard(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(jsonl_writer, 'zstandard', None)
+    with pytest.raises(ValueError, match='zstandard'):
+        JsonlWriter(tmp_path / 'records.jsonl.zst')
+    assert not (tmp_path / 'records.jsonl.zst').exists()
@@ -0,0 +1,90 @@
+"""Tests for BrazilianLocationSampler.sample_batch."""
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.br_location_class import BrazilianLocationSampler
+
+
+@pytest.fixture
+def location_sampler(engine_data_paths) -> BrazilianLocationSampler:
+    return BrazilianLocationSampler(engine_data_paths['json_path'])
+
+
+def test_cities_belong_to_their_state(location_sampler) -> None:
+    batch = location_sampler.sample_batch(2_000, np.random.default_rng(0))
+    for state, city in zip(batch.states.tolist(), batch.cities.tolist(), strict=True):
+        city_name = location_sampler.batch_city_names[city]
+        assert location_sampler.city_data_by_name[city_name]['city_uf'] == location_sampler.batch_state_abbrs[state]
+
+
+def test_ceps_fall_within_city_range(location_sampler) -> None:
+    batch = location_sampler.sample_batch(2_000, np.random.default_rng(1))
+    for city, cep in zip(batch.cities.tolist(), batch.ceps.tolist(), strict=True):
+        city_data = location_sampler.city_data_by_name[location_sampler.batch_city_names[city]]
+        assert int(city_data['cep_range_begins'].replace('-', '')) <= cep <= int(city_data['cep_range_ends'].replace('-', ''))
+
+
+def test_frequencies_follow_weights(location_sampler) -> None:
+    n = 50_000
+    batch = location_sampler.sample_batch(n, np.random.default_rng(2))
+    cities = Counter(location_sampler.batch_city_names[c] for c in batch.cities.tolist())
+    assert cities['Rio de Janeiro'] / n == pytest.approx(0.4, abs=0.02)
+    assert cities['São Paulo'] / n == pytest.approx(0.3, abs=0.02)
+    assert cities['Campinas'] / n == pytest.approx(0.3, abs=0.02)
+
+
+def test_same_generator_seed_is_reproducible(location_sampler) -> None:
+    first = location_sampler.sample_batch(100, np.random.default_rng(3))
+    second = location_sampler.sample_batch(100, np.random.default_rng(3))
+    for a, b in zip(first, second, strict=True):
+        assert np.array_equal(a, b)
+
+
+def test_format_ceps(location_sampler) -> None:
+    ceps = np.array([1000000, 13001234, -1])
+    assert location_sampler.format_ceps(ceps) == ['01000-000', '13001-234', '']
+    assert location_sampler.format_ceps(ceps, with_dash=False) == ['01000000', '13001234', '']
+
+
+def test_city_for_cep(location_sampler) -> None:
+    assert location_sampler.city_for_cep('01001-000') == ('São Paulo', 'SP')
+    assert location_sampler.city_for_cep(13139999) == ('Campinas', 'SP')
+    assert location_sampler.city_for_cep('20000000') == ('Rio de Janeiro', 'RJ')
+    for missing in ['12999-999', '23800-000', '00000-000', '', 'not a cep', '123456789']:
+        assert location_sampler.city_for_cep(missing) is None
+
+
+def test_cities_for_ceps_matches_the_drawn_cities(location_sampler) -> None:
+    batch = location_sampler.sample_batch(2_000, np.random.default_rng(4))
+    expected = [location_sampler.batch_city_names[c] for c in batch.cities.tolist()]
+    assert [city for city, _ in location_sampler.cities_for_ceps(batch.ceps)] == expected
+
+    ceps = [*location_sampler.format_ceps(batch.ceps[:5]), '99999-999', 1001000]
+    assert location_sampler.cities_for_ceps(ceps) == [location_sampler.city_for_cep(cep) for cep in ceps]
+
+
+def test_narrowest_overlapping_range_wins(location_sampler) -> None:
+    assert location_sampler.city_for_cep('05050-000') == ('São Paulo', 'SP')
+    location_sampler.update_cities(
+        {
+            'Osasco': {
+                'city_name': 'Osasco',
+                'city_uf': 'SP',
+                'population_percentage_state': 0.1,
+                'cep_range_begins': '05000-000',
+                'cep_range_ends': '05099-999',
+            },
+            'Valinhos': {'city_name': 'Valinhos', 'city_uf': 'SP', 'population_percentage_state': 0.1, 'ceps': ['13050-123']},
+        }
+    )
+    assert location_sampler.cities_for_ceps(['04999-999', '05000-000', '05099-999', '05100-000', '13050-122', '13050-123']) == [
+        ('São Paulo', 'SP'),
+        ('Osasco', 'SP'),
+        ('Osasco', 'SP'),
+        ('São Paulo', 'SP'),
+        ('Campinas', 'SP'),
+        ('Valinhos', 'SP'),
+    ]
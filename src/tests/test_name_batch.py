@@ -0,0 +1,81 @@
+"""Tests for the batch name API of BrazilianNameSampler."""
+
+import json
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.br_name_class import BrazilianNameSampler, NameComponents, TimePeriod
+
+
+@pytest.fixture
+def name_data() -> dict:
+    return {
+        'common_names_percentage': {
+            period.value: {'names': {'Ana': {'percentage': 3.0}, 'Bia': {'percentage': 1.0}}, 'total': 2} for period in TimePeriod
+        },
+        'surnames': {
+            'Santos': {'percentage': 1.0},
+            'Oliveira': {'percentage': 1.0},
+            'Junior': {'percentage': 1.0},
+            'Borges': {'percentage': 1.0},
+        },
+    }
+
+
+@pytest.fixture
+def sampler(tmp_path, name_data) -> BrazilianNameSampler:
+    path = tmp_path / 'middle.json'
+    data = {'percentage_with_second': 25.0, 'second_names': {'Clara': {'count': 1, 'percentage': 1.0}}}
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return BrazilianNameSampler(name_data, middle_names_path=path)
+
+
+def test_components_have_every_part(sampler) -> None:
+    names = sampler.get_random_names(200, with_only_one_surname=False, return_components=True, rng=np.random.default_rng(0))
+    assert len(names) == 200
+    for components in names:
+        assert isinstance(components, NameComponents)
+        assert components.first_name in {'Ana', 'Bia'}
+        assert components.middle_name in {None, 'Clara'}
+        assert len(components.surname.split()) >= 2
+
+
+def test_middle_name_rate_follows_percentage(sampler) -> None:
+    names = sampler.get_random_names(20_000, return_components=True, rng=np.random.default_rng(1))
+    rate = sum(components.middle_name == 'Clara' for components in names) / 20_000
+    assert rate == pytest.approx(0.25, abs=0.02)
+    assert all(components.middle_name == 'Clara' for components in sampler.get_random_names(50, always_middle=True, return_components=True))
+
+
+def test_prefixes_match_single_draws(sampler) -> None:
+    """The rendered first-surname table reproduces the distribution of _apply_prefix."""
+    n = 40_000
+    batch = Counter(sampler.get_random_surnames(n, with_only_one_surname=True, rng=np.random.default_rng(2)))
+    random.seed(2)
+    single = Counter(sampler._apply_prefix(random.choice(['Santos', 'Oliveira', 'Junior', 'Borges'])) for _ in range(n))
+    assert set(batch) == set(single)
+    for value, count in single.items():
+        assert batch[value] / n == pytest.approx(count / n, abs=0.01)
+    assert batch['dos Santos'] / n == pytest.approx(0.25 * 0.85 * 0.85 / 0.9, abs=0.01)
+
+
+def test_second_surname_takes_no_prefix(sampler) -> None:
+    for surname in sampler.get_random_surnames(500, rng=np.random.default_rng(3)):
+        second = surname.rsplit(' ', 1)[1]
+        assert second in {'Santos', 'Oliveira', 'Jr.', 'Borges'}
+    assert {surname.rsplit(' ', 1)[1] for surname in sampler.get_random_surnames(500, raw=True)} <= {'SANTOS', 'OLIVEIRA', 'JR', 'BORGES'}
+
+
+def test_raw_and_string_output(sampler) -> None:
+    for name in sampler.get_random_names(100, raw=True, include_surname=False):
+        assert name == name.upper()
+        assert name.split()[0] in {'ANA', 'BIA'}
+    assert set(sampler.get_random_names(20, only_middle=True)) == {'Clara'}
+
+
+def test_same_generator_seed_is_reproducible(sampler) -> None:
+    first = sampler.get_random_names(100, rng=np.random.default_rng(4))
+    assert sampler.get_random_names(100, rng=np.random.default_rng(4)) == first
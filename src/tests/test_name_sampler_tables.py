@@ -0,0 +1,76 @@
+"""Tests for the pre-computed alias tables of BrazilianNameSampler."""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from src.br_name_class import BrazilianNameSampler, TimePeriod
+
+
+@pytest.fixture
+def weighted_data() -> dict:
+    return {
+        'common_names_percentage': {
+            period.value: {'names': {'ANA': {'percentage': 3.0}, 'BIA': {'percentage': 1.0}}, 'total': 2} for period in TimePeriod
+        },
+        'surnames': {
+            'ALVES': {'percentage': 9.0},
+            'BORGES': {'percentage': 1.0},
+            'top_40': {'CUNHA': {'percentage': 1.0}},
+        },
+    }
+
+
+@pytest.fixture
+def middle_names_path(tmp_path):
+    path = tmp_path / 'middle.json'
+    data = {
+        'percentage_with_second': 100.0,
+        'second_names': {
+            'Clara': {'count': 1, 'percentage': 1.0},
+            'Zero': {'count': 0, 'percentage': 0.0},
+            'Broken': {'count': 0, 'percentage': 'n/a'},
+        },
+    }
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path
+
+
+def test_tables_built_once(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    assert set(sampler.name_tables) == {period.value for period in TimePeriod}
+    assert sampler.surname_table.values == ['ALVES', 'BORGES']
+    assert sampler.top_40_table.values == ['CUNHA']
+
+    # Draws use the tables, not the raw data
+    sampler.name_data = None
+    sampler.surname_data = None
+    assert sampler.get_random_name(include_surname=True)
+
+
+def test_draws_follow_weights(weighted_data) -> None:
+    random.seed(0)
+    sampler = BrazilianNameSampler(weighted_data)
+    counts = Counter(sampler.get_random_name(include_surname=False) for _ in range(4000))
+    assert set(counts) == {'ANA', 'BIA'}
+    assert 0.7 < counts['ANA'] / 4000 < 0.8
+
+
+def test_top_40_uses_its_own_table(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    assert sampler.get_random_surname(top_40=True, with_only_one_surname=True) == 'CUNHA'
+
+
+def test_middle_names_skip_invalid_and_zero_weights(weighted_data, middle_names_path) -> None:
+    sampler = BrazilianNameSampler(weighted_data, middle_names_path)
+    assert sampler.middle_name_table.values == ['Clara']
+    assert {sampler._get_random_middle_name() for _ in range(20)} == {'Clara'}
+
+
+def test_prefix_tables_cover_known_surnames(weighted_data) -> None:
+    sampler = BrazilianNameSampler(weighted_data)
+    assert set(sampler.prefix_tables) == set(BrazilianNameSampler.SURNAME_PREFIXES)
+    for _ in range(50):
+        assert sampler._apply_prefix('Nascimento') in {'do Nascimento', 'dos Nascimento'}
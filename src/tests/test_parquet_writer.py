@@ -0,0 +1,74 @@
+"""Tests for the columnar Parquet/Arrow output."""
+
+import pytest
+
+from src.sampler import SampleOptions, SamplerEngine
+from src.utils import parquet_writer
+from src.utils.parquet_writer import DICTIONARY_FIELDS, RECORD_FIELDS, ParquetWriter, chunks_to_table, records_to_batch
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+STATES = [('São Paulo', 'SP', 'Campinas'), ('Rio de Janeiro', 'RJ', 'Niterói')]
+RECORDS = [
+    {field: f'{field}-{i}' for field in RECORD_FIELDS} | dict(zip(('state', 'state_abbr', 'city'), STATES[i % 2], strict=True))
+    for i in range(25)
+]
+
+
+def test_low_cardinality_columns_are_dictionary_encoded() -> None:
+    batch = records_to_batch(RECORDS)
+
+    assert batch.schema.names == list(RECORD_FIELDS)
+    assert {field.name for field in batch.schema if pa.types.is_dictionary(field.type)} == set(DICTIONARY_FIELDS)
+    assert batch.column('state').dictionary.to_pylist() == ['São Paulo', 'Rio de Janeiro']
+    assert batch.to_pylist() == RECORDS
+
+
+def test_chunks_share_one_dictionary() -> None:
+    table = chunks_to_table([RECORDS[:1], RECORDS[1:]])
+
+    assert table.num_rows == len(RECORDS)
+    first, second = table.column('city').chunks
+    assert first.dictionary.equals(second.dictionary)
+
+
+def test_writer_streams_full_row_groups(tmp_path) -> None:
+    path = tmp_path / 'out' / 'records.parquet'
+    writer = ParquetWriter(path, row_group_size=10)
+    for start in range(0, len(RECORDS), 7):
+        writer.write(RECORDS[start : start + 7])
+        assert writer._buffered < 10  # Full row groups are written out at once
+    writer.close()
+
+    metadata = pq.ParquetFile(path).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [10, 10, 5]
+    table = pq.read_table(path)
+    assert pa.types.is_dictionary(table.schema.field('state').type)
+    assert table.to_pylist() == RECORDS
+    assert writer.written == len(RECORDS)
+
+
+def test_writer_overwrites_existing_files(tmp_path) -> None:
+    path = tmp_path / 'records.parquet'
+    for records in (RECORDS, RECORDS[:3]):
+        with ParquetWriter(path) as writer:
+            writer.write(records)
+    assert pq.read_table(path).num_rows == 3
+
+
+def test_parquet_output_needs_pyarrow(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(parquet_writer, 'pa', None)
+    with pytest.raises(ValueError, match='pyarrow'):
+        ParquetWriter(tmp_path / 'records.parquet')
+
+
+def test_engine_generates_arrow_tables(engine_data_paths) -> None:
+    engine = SamplerEngine(**engine_data_paths)
+
+    table = engine.generate_table(23, SampleOptions(all_data=True), chunk_size=10)
+
+    assert table.num_rows == 23
+    assert table.schema.names == list(RECORD_FIELDS)
+    assert [len(chunk) for chunk in table.column('cpf').chunks] == [10, 10, 3]
+    assert set(table.column('state_abbr').to_pylist()) <= {'SP', 'RJ'}
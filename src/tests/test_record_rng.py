@@ -0,0 +1,73 @@
+"""Tests for the counter-based record streams and the injectable random sources."""
+
+import random
+
+import pytest
+
+from src.br_rg_class import BrazilianRG
+from src.sampler import SampleOptions, SamplerEngine
+from src.utils.address_for_offline import AddressProvider_for_offline
+from src.utils.cei import random_cei
+from src.utils.cnpj import random_cnpj
+from src.utils.cpf import random_cpf
+from src.utils.phone import generate_phone_number
+from src.utils.pis import random_pis
+from src.utils.record_rng import block_rng
+
+
+def test_block_streams_depend_only_on_seed_and_block() -> None:
+    first = block_rng(42, 7)
+    again = block_rng(42, 7)
+    assert first.np_rng.random(5).tolist() == again.np_rng.random(5).tolist()
+    assert first.record_seeds(3) == again.record_seeds(3)
+
+    draws = {tuple(block_rng(seed, block).np_rng.integers(1 << 62, size=4).tolist()) for seed in (1, 2) for block in (0, 1, 2)}
+    assert len(draws) == 6
+
+
+def test_negative_seeds_and_blocks_are_rejected() -> None:
+    with pytest.raises(ValueError, match='negative'):
+        block_rng(-1, 0)
+    with pytest.raises(ValueError, match='negative'):
+        block_rng(0, -1)
+
+
+@pytest.mark.parametrize(
+    'generate',
+    [
+        lambda rng: random_cpf(rng=rng),
+        lambda rng: random_cnpj(rng=rng),
+        lambda rng: random_pis(rng=rng),
+        lambda rng: random_cei(rng=rng),
+        lambda rng: generate_phone_number(rng=rng),
+        lambda rng: BrazilianRG(state='MG', include_issuer=True).generate(rng=rng),
+        lambda rng: AddressProvider_for_offline(rng).street_prefix() + AddressProvider_for_offline(rng).building_number(),
+    ],
+)
+def test_scalar_generators_draw_from_the_injected_rng(generate) -> None:
+    values = [generate(random.Random(3)) for _ in range(3)]
+    assert values[0] == values[1] == values[2]
+
+
+def test_scalar_samplers_draw_from_the_injected_rng(engine_data_paths) -> None:
+    engine = SamplerEngine(**engine_data_paths)
+
+    def draw(rng: random.Random) -> tuple:
+        return (
+            engine.location_sampler.get_random_location(rng=rng),
+            engine.name_sampler.get_random_name(rng=rng),
+            engine.name_sampler.get_random_surname(rng=rng),
+        )
+
+    assert draw(random.Random(5)) == draw(random.Random(5))
+
+
+def test_a_shard_does_not_depend_on_earlier_generation(engine_data_paths) -> None:
+    options = SampleOptions(all_data=True)
+    fresh = SamplerEngine(**engine_data_paths)
+    used = SamplerEngine(**engine_data_paths)
+    used.generate(30, options)
+    random.random()
+
+    assert used.generate_shard(options, seed=11, shard=3, shard_size=8) == fresh.generate_shard(options, seed=11, shard=3, shard_size=8)
+    assert fresh.generate_shard(options, seed=11, shard=4, shard_size=8) != fresh.generate_shard(options, seed=11, shard=3, shard_size=8)
@@ -0,0 +1,76 @@
+"""Tests for the CEP lookup retry policy and circuit breaker."""
+
+import random
+
+import pytest
+
+from src.utils.retry_policy import CircuitBreaker, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_backoff_grows_exponentially_up_to_the_cap() -> None:
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5, jitter=0)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+
+def test_jitter_stays_within_bounds() -> None:
+    policy = RetryPolicy(base_delay=1, max_delay=1, jitter=0.5)
+    rng = random.Random(0)
+    delays = [policy.backoff(1, rng) for _ in range(1000)]
+    assert 0.5 <= min(delays) < max(delays) <= 1
+
+
+def test_next_delay_respects_attempts_and_elapsed_time() -> None:
+    policy = RetryPolicy(max_attempts=3, base_delay=1, jitter=0, max_elapsed=2.5)
+    assert policy.next_delay(1, elapsed=0) == 1
+    assert policy.next_delay(2, elapsed=1) is None  # would wait until 3s
+    assert policy.next_delay(2, elapsed=0.5) == 2
+    assert policy.next_delay(3, elapsed=0) is None
+
+
+def test_invalid_policy() -> None:
+    with pytest.raises(ValueError, match='at least one attempt'):
+        RetryPolicy(max_attempts=0)
+    with pytest.raises(ValueError, match='jitter'):
+        RetryPolicy(jitter=2)
+
+
+def test_circuit_breaker_opens_probes_and_closes() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=0.5, window=4, min_calls=4, cooldown=10, clock=clock)
+
+    for succeeded in [True, False, True, False]:
+        assert breaker.allow()
+        if succeeded:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 2
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failure_rate == 0
+
+
+def test_disabled_circuit_breaker_never_opens() -> None:
+    breaker = RetryPolicy(breaker_threshold=0, breaker_min_calls=1).circuit_breaker()
+    for _ in range(100):
+        breaker.record_failure()
+    assert breaker.allow()
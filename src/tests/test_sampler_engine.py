@@ -0,0 +1,370 @@
+"""Tests for the SamplerEngine and the sample() wrapper around it."""
+
+import asyncio
+import json
+
+import pytest
+
+from src import sampler as sampler_module
+from src.utils import cep_wrapper
+from src.utils.cep_cache import get_cep_cache
+from src.utils.cep_wrapper import CepBackend
+from src.sampler import SampleOptions, SamplerEngine, get_engine, iter_samples, sample, save_stream_to_jsonl, save_to_jsonl_file
+from src.utils.parquet_writer import OutputFormat
+
+RECORD_KEYS = {
+    'name',
+    'middle_name',
+    'surnames',
+    'city',
+    'state',
+    'state_abbr',
+    'cep',
+    'street',
+    'neighborhood',
+    'building_number',
+    'cpf',
+    'rg',
+    'pis',
+    'cnpj',
+    'cei',
+    'phone',
+}
+
+
+class SlowFirstPool:
+    """Stands in for a CEP lookup pool; the first CEP looked up answers last."""
+
+    def __init__(self, *_args, **_kwargs) -> None:
+        self.calls = []
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def lookup(self, cep: str) -> dict:
+        self.calls.append(cep)
+        if len(self.calls) == 1:
+            await asyncio.sleep(0.05)
+        return {'cep': cep, 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Centro', 'street': f'Rua {cep}', 'service': 'fake'}
+
+
+@pytest.fixture
+def engine(engine_data_paths) -> SamplerEngine:
+    return SamplerEngine(**engine_data_paths)
+
+
+def _sample_kwargs(engine_data_paths) -> dict:
+    """Keyword arguments for sample() with every flag at its CLI default."""
+    options = SampleOptions()
+    kwargs = {name: getattr(options, name) for name in SampleOptions.__dataclass_fields__}
+    kwargs.update(engine_data_paths)
+    kwargs.update(q=None, locations_path=None, save_to_jsonl=None)
+    return kwargs
+
+
+def test_all_data_overrides_flags() -> None:
+    """all_data switches every document on and every only_* flag off."""
+    options = SampleOptions(only_cpf=True, always_pis=False, all_data=True)
+    assert options.always_pis
+    assert options.always_middle
+    assert not options.only_cpf
+
+
+def test_generate_returns_full_records(engine) -> None:
+    records = engine.generate(5, SampleOptions(all_data=True))
+    assert len(records) == 5
+    for record in records:
+        assert set(record) == RECORD_KEYS
+        assert record['state_abbr'] in {'SP', 'RJ'}
+        assert record['name'] == 'TEST'
+        assert record['cpf'] and record['pis'] and record['cnpj'] and record['cei']
+
+
+def test_generate_is_reusable(engine) -> None:
+    """The same engine can serve several batches without reloading data."""
+    first = engine.generate(3, SampleOptions())
+    second = engine.generate(4, SampleOptions(only_document=True))
+    assert len(first) == 3
+    assert len(second) == 4
+    assert all(record['name'] == '' for record in second)
+
+
+def test_get_engine_is_cached(engine_data_paths, monkeypatch) -> None:
+    monkeypatch.setattr(sampler_module, '_ENGINES', {})
+    first = get_engine(**engine_data_paths)
+    assert get_engine(**engine_data_paths) is first
+
+
+def test_sample_uses_given_engine(engine, engine_data_paths, monkeypatch, tmp_path) -> None:
+    """sample() must not build a new engine when one is passed in."""
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError('engine should not be rebuilt')
+
+    monkeypatch.setattr(sampler_module, 'get_engine', fail)
+    output = tmp_path / 'out.jsonl'
+    kwargs = _sample_kwargs(engine_data_paths)
+    kwargs.update(qty=3, save_to_jsonl=str(output))
+    results = sample(**kwargs, engine=engine)
+
+    assert len(results) == 3
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == results
+
+
+def test_iter_samples_yields_bounded_chunks(engine) -> None:
+    chunks = list(iter_samples(25, SampleOptions(), chunk_size=10, engine=engine))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_iter_samples_reports_overall_progress(engine) -> None:
+    seen = []
+    for _ in engine.iter_samples(6, SampleOptions(), chunk_size=4, progress_callback=lambda done, _stage=None: seen.append(done)):
+        pass
+    assert max(seen) == 6
+    assert all(0 <= done <= 6 for done in seen)
+
+
+def test_save_stream_overwrites_only_once(engine, tmp_path) -> None:
+    output = tmp_path / 'out.jsonl'
+    output.write_text('stale\n', encoding='utf-8')
+    written = save_stream_to_jsonl(engine.iter_samples(7, SampleOptions(), chunk_size=3), str(output), append=False)
+    assert written == 7
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 7
+
+
+def test_save_to_jsonl_file_writes_synchronously(engine, tmp_path) -> None:
+    output = tmp_path / 'out.jsonl'
+    records = engine.generate(3, SampleOptions())
+    save_to_jsonl_file(records, str(output), append=False)
+    assert [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()] == records
+
+
+def test_sample_streams_without_collecting(engine, engine_data_paths, tmp_path) -> None:
+    output = tmp_path / 'out.jsonl'
+    kwargs = _sample_kwargs(engine_data_paths)
+    kwargs.update(qty=12, save_to_jsonl=str(output))
+    assert sample(**kwargs, engine=engine, return_results=False) is None
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 12
+
+
+def test_locations_are_drawn_in_one_batch(engine, monkeypatch) -> None:
+    calls = []
+    original = engine.location_sampler.sample_batch
+
+    def counting_batch(n, rng=None):
+        calls.append(n)
+        return original(n, rng)
+
+    monkeypatch.setattr(engine.location_sampler, 'sample_batch', counting_batch)
+    engine.generate(8, SampleOptions(all_data=True))
+    assert calls == [8]
+
+
+def test_record_fields_share_one_location(engine) -> None:
+    """Phone DDD, CEP and city all come from the same draw."""
+    ddd_by_city = {'São Paulo': '11', 'Campinas': '19', 'Rio de Janeiro': '21'}
+    cep_prefix_by_city = {'São Paulo': '0', 'Campinas': '13', 'Rio de Janeiro': '2'}
+    for record in engine.generate(30, SampleOptions(all_data=True)):
+        assert record['phone'].startswith(f'({ddd_by_city[record["city"]]})')
+        assert record['cep'].startswith(cep_prefix_by_city[record['city']])
+        assert record['state_abbr'] == ('RJ' if record['city'] == 'Rio de Janeiro' else 'SP')
+
+
+def test_only_flags_limit_documents(engine) -> None:
+    record = engine.generate(1, SampleOptions(only_cpf=True, only_fone=True))[0]
+    assert record['cpf']
+    assert record['phone']
+    assert record['rg'] == ''
+    assert record['name'] == ''
+
+
+def test_write_jsonl_streams_records_as_lookups_complete(engine, engine_data_paths, monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(sampler_module, 'create_cep_pool', SlowFirstPool)
+    output = tmp_path / 'out.jsonl'
+    kwargs = _sample_kwargs(engine_data_paths)
+    kwargs.update(qty=20, save_to_jsonl=str(output), make_api_call=True)
+    results = sample(**kwargs, engine=engine)
+
+    written = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert len(written) == 20
+    # The slow lookup did not hold back the others: its record was written last
+    assert written[-1]['street'] == results[0]['street']
+    # The returned records keep their generation order
+    assert sorted(written, key=lambda record: record['cpf']) == sorted(results, key=lambda record: record['cpf'])
+
+
+def test_stream_falls_back_to_a_pool_of_the_chosen_backend(engine, monkeypatch, tmp_path) -> None:
+    class UnstartablePool(SlowFirstPool):
+        async def start(self) -> None:
+            raise OSError('no backend')
+
+    backends = []
+
+    def create_pool(backend, *_args, **_kwargs) -> SlowFirstPool:
+        backends.append(backend)
+        return SlowFirstPool()
+
+    monkeypatch.setattr(sampler_module, 'create_cep_pool', UnstartablePool)
+    monkeypatch.setattr(cep_wrapper, 'create_cep_pool', create_pool)
+    options = SampleOptions(make_api_call=True, cep_backend=CepBackend.HTTP)
+
+    written = asyncio.run(engine.write_jsonl(3, options, str(tmp_path / 'out.jsonl'), append=False))
+
+    assert written == 3
+    assert backends == [CepBackend.HTTP]
+
+
+class ConcurrencyProbePool(SlowFirstPool):
+    """Records the largest number of lookups in flight at once."""
+
+    def __init__(self, *_args, **_kwargs) -> None:
+        super().__init__()
+        self.in_flight = self.peak = 0
+
+    async def lookup(self, cep: str) -> dict:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return {'cep': cep, 'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Centro', 'street': 'Rua A', 'service': 'fake'}
+
+
+@pytest.mark.parametrize(('pool_size', 'peak'), [(2, 10), (16, 32), (40, 80)])
+def test_lookup_concurrency_grows_with_the_pool_size(pool_size, peak) -> None:
+    pool = ConcurrencyProbePool()
+
+    async def run() -> None:
+        ceps = [f'{i:05d}-000' for i in range(200)]
+        async for _ in sampler_module.iter_address_data(ceps, make_api_call=True, cep_pool_size=pool_size, cep_pool=pool):
+            pass
+
+    asyncio.run(run())
+    assert pool.peak == peak
+
+
+def test_write_jsonl_with_a_tiny_queue(engine, tmp_path) -> None:
+    output = tmp_path / 'out.jsonl'
+    indexes = []
+    written = asyncio.run(
+        engine.write_jsonl(
+            25, SampleOptions(), str(output), append=False, chunk_size=10, queue_size=1, on_record=lambda i, _record: indexes.append(i)
+        )
+    )
+    assert written == 25
+    assert indexes == list(range(25))
+    assert len(output.read_text(encoding='utf-8').splitlines()) == 25
+
+
+def test_write_jsonl_reraises_producer_errors(engine, monkeypatch, tmp_path) -> None:
+    def fail(*_args, **_kwargs):
+        raise ValueError('boom')
+
+    monkeypatch.setattr(engine, '_prepare_records', fail)
+    with pytest.raises(ValueError, match='boom'):
+        asyncio.run(engine.write_jsonl(5, SampleOptions(), str(tmp_path / 'out.jsonl')))
+
+
+def test_seeded_shards_do_not_depend_on_the_number_of_workers(engine) -> None:
+    options = SampleOptions(all_data=True)
+
+    def run(workers: int, seed: int) -> list[dict]:
+        return [record for shard in engine.iter_shards(25, options, workers=workers, seed=seed, shard_size=7) for record in shard]
+
+    single = run(1, 1234)
+    assert len(single) == 25
+    assert run(1, 1234) == single
+    assert run(3, 1234) == single
+    assert run(1, 4321) != single
+
+
+def test_sample_with_workers_writes_shards_in_order(engine_data_paths, engine, tmp_path) -> None:
+    output = tmp_path / 'out.jsonl'
+    kwargs = _sample_kwargs(engine_data_paths)
+    kwargs.update(qty=12, save_to_jsonl=str(output))
+
+    results = sample(**kwargs, engine=engine, workers=2, seed=7)
+
+    assert [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()] == results
+    assert sample(**{**kwargs, 'save_to_jsonl': None}, engine=engine, seed=7) == results
+
+
+@pytest.mark.parametrize('seed', [None, 7])
+def test_sample_writes_parquet(engine_data_paths, engine, tmp_path, seed) -> None:
+    pq = pytest.importorskip('pyarrow.parquet')
+    output = tmp_path / 'out.parquet'
+    kwargs = _sample_kwargs(engine_data_paths)
+    kwargs.update(qty=12, save_to_jsonl=str(output), all_data=True)
+
+    results = sample(**kwargs, engine=engine, seed=seed, output_format=OutputFormat.PARQUET)
+
+    assert pq.read_table(output).to_pylist() == results
+
+
+def test_any_range_of_a_seeded_dataset_can_be_regenerated(engine) -> None:
+    options = SampleOptions(all_data=True)
+
+    def run(n: int, offset: int = 0, workers: int = 1) -> list[dict]:
+        shards = engine.iter_shards(n, options, workers=workers, seed=99, shard_size=6, offset=offset)
+        return [record for shard in shards for record in shard]
+
+    dataset = run(30)
+    assert run(4) == dataset[:4]
+    assert run(9, offset=5) == dataset[5:14]
+    assert run(1, offset=29) == dataset[29:]
+    assert run(13, offset=8, workers=2) == dataset[8:21]
+
+
+def test_a_seeded_range_only_looks_up_its_own_records(engine, monkeypatch) -> None:
+    pools = []
+
+    def create_pool(*_args, **_kwargs) -> SlowFirstPool:
+        pools.append(SlowFirstPool())
+        return pools[-1]
+
+    monkeypatch.setattr(sampler_module, 'create_cep_pool', create_pool)
+    options = SampleOptions(all_data=True, make_api_call=True)
+
+    shards = list(engine.iter_shards(1, options, seed=5, offset=1234))
+
+    assert [len(shard) for shard in shards] == [1]
+    assert [cep.replace('-', '') for pool in pools for cep in pool.calls] == [shards[0][0]['cep'].replace('-', '')]
+
+
+def test_shards_share_one_cep_lookup_pool(engine, monkeypatch) -> None:
+    pools = []
+
+    def create_pool(*_args, **_kwargs) -> SlowFirstPool:
+        pools.append(SlowFirstPool())
+        return pools[-1]
+
+    monkeypatch.setattr(sampler_module, 'create_cep_pool', create_pool)
+    monkeypatch.setattr(cep_wrapper, 'create_cep_pool', create_pool)
+    options = SampleOptions(all_data=True, make_api_call=True)
+
+    shards = list(engine.iter_shards(30, options, seed=1, shard_size=10))
+
+    assert [len(shard) for shard in shards] == [10, 10, 10]
+    assert len(pools) == 1
+    assert len(pools[0].calls) == len({record['cep'] for shard in shards for record in shard})
+
+
+def test_cep_cache_counters_include_lookups_made_by_workers(engine, tmp_path) -> None:
+    cache_path = tmp_path / 'cep_cache.sqlite3'
+    offline = [engine.generate_shard(SampleOptions(all_data=True), seed=4, shard=shard, shard_size=5) for shard in (0, 1)]
+    cache = get_cep_cache(cache_path)
+    cache.put_many({record['cep']: {'cep': record['cep'], 'city': 'Cached'} for shard in offline for record in shard})
+    options = SampleOptions(all_data=True, make_api_call=True, cep_cache_path=cache_path)
+
+    shards = list(engine.iter_shards(10, options, workers=2, seed=4, shard_size=5))
+
+    assert all(record['city'] == 'Cached' for shard in shards for record in shard)
+    assert (cache.hits, cache.misses) == (sum(len({record['cep'] for record in shard}) for shard in offline), 0)
+
+
+def test_an_offset_needs_a_seed(engine) -> None:
+    with pytest.raises(ValueError, match='needs a seed'):
+        next(engine.iter_shards(5, SampleOptions(), offset=3))
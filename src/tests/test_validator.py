@@ -0,0 +1,96 @@
+"""Tests for the batch validation kernels and the bulk file validator."""
+
+import json
+
+import numpy as np
+import pytest
+from typer.testing import CliRunner
+
+from src.cli import app
+from src.utils.cei import random_cei_batch, validate_cei, validate_cei_batch
+from src.utils.cnpj import random_cnpj_batch, validate_cnpj, validate_cnpj_batch
+from src.utils.cpf import random_cpf_batch, validate_cpf, validate_cpf_batch
+from src.utils.pis import random_pis_batch, validate_pis, validate_pis_batch
+from src.validator import DocumentKind, FileFormat, detect_format, validate_file
+
+KERNELS = [
+    (random_cpf_batch, validate_cpf_batch, validate_cpf),
+    (random_cnpj_batch, validate_cnpj_batch, validate_cnpj),
+    (random_pis_batch, validate_pis_batch, validate_pis),
+    (random_cei_batch, validate_cei_batch, validate_cei),
+]
+
+
+def _break_check_digit(document: str) -> str:
+    return document[:-1] + str((int(document[-1]) + 1) % 10)
+
+
+@pytest.mark.parametrize(('generate', 'validate_batch', 'validate_one'), KERNELS)
+def test_batch_kernel_matches_wrapper(generate, validate_batch, validate_one) -> None:
+    valid = generate(50, rng=np.random.default_rng(0)) + generate(50, formatted=False, rng=np.random.default_rng(1))
+    documents = valid + [_break_check_digit(document) for document in valid] + ['', 'abc', '0' * 14, valid[0] + '9']
+    result = validate_batch(documents)
+    assert result.tolist() == [validate_one(document) for document in documents]
+    assert result[: len(valid)].all()
+    assert not result[len(valid) :].any()
+
+
+def test_padding_and_punctuation() -> None:
+    # Valid CPF with a leading zero that was lost on export
+    assert validate_cpf_batch(['1234567890', '012.345.678-90', 1234567890]).tolist() == [True, True, True]
+    assert validate_cpf_batch(['1234567890'], autopad=False).tolist() == [False]
+    assert validate_cpf('1234567890')
+    assert not validate_cpf('1234567890', autopad=False)
+
+
+@pytest.fixture
+def documents_jsonl(tmp_path):
+    cpfs = random_cpf_batch(25, rng=np.random.default_rng(2))
+    cpfs[3] = _break_check_digit(cpfs[3])
+    path = tmp_path / 'people.jsonl'
+    lines = [json.dumps({'cpf': cpf, 'name': 'X'}) for cpf in cpfs]
+    lines[10] = json.dumps({'name': 'no cpf'})
+    lines[20] = '{not json'
+    lines.insert(5, '')  # blank lines are not records
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_validate_jsonl_reports_invalid_rows(documents_jsonl) -> None:
+    report = validate_file(documents_jsonl, DocumentKind.CPF, 'cpf', chunk_size=7)
+    assert report.total == 25
+    assert report.valid == 22
+    assert report.invalid_rows == [4, 11, 21]
+
+
+def test_validate_csv(tmp_path) -> None:
+    cnpjs = random_cnpj_batch(12, rng=np.random.default_rng(3))
+    cnpjs[0] = '11.111.111/1111-11'
+    path = tmp_path / 'companies.csv'
+    path.write_text('name;cnpj\n' + ''.join(f'"Empresa; {i}";{cnpj}\n' for i, cnpj in enumerate(cnpjs)), encoding='utf-8')
+    report = validate_file(path, 'cnpj', 'cnpj', delimiter=';', chunk_size=5)
+    assert (report.total, report.invalid, report.invalid_rows) == (12, 1, [1])
+
+    with pytest.raises(ValueError, match='not found in CSV header'):
+        validate_file(path, 'cnpj', 'missing', delimiter=';')
+
+
+def test_workers_give_the_same_report(documents_jsonl) -> None:
+    single = validate_file(documents_jsonl, DocumentKind.CPF, 'cpf', chunk_size=4)
+    parallel = validate_file(documents_jsonl, DocumentKind.CPF, 'cpf', chunk_size=4, workers=2)
+    assert parallel == single
+
+
+def test_detect_format() -> None:
+    assert detect_format('a.jsonl') == FileFormat.JSONL
+    assert detect_format('a.CSV') == FileFormat.CSV
+    with pytest.raises(ValueError, match='Cannot detect file format'):
+        detect_format('a.txt')
+
+
+def test_validate_command(documents_jsonl, tmp_path) -> None:
+    invalid_rows_file = tmp_path / 'invalid.txt'
+    result = CliRunner().invoke(app, ['validate', str(documents_jsonl), '--kind', 'cpf', '--invalid-rows-file', str(invalid_rows_file)])
+    assert result.exit_code == 0, result.output
+    assert 'Invalid rows: 4, 11, 21' in result.output
+    assert invalid_rows_file.read_text(encoding='utf-8').split() == ['4', '11', '21']
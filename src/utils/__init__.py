@@ -1 +1 @@
-__all__ = ['cnpj', 'cei', 'pis', 'cpf']
+__all__ = ['alias_table', 'cei', 'cnpj', 'cpf', 'pis']
@@ -590,6 +590,13 @@ class AddressProvider_for_offline:
         'Itaipu',
     )
 
+    def __init__(self, rng: random.Random | None = None):
+        """
+        Args:
+            rng: Random source of every draw; defaults to the random module
+        """
+        self.rng = rng or random
+
     def street_prefix(self) -> str:
         """
         :example: 'rua'
@@ -618,7 +625,7 @@ class AddressProvider_for_offline:
         Returns:
             A random element from the sequence
         """
-        return random.choice(elements)
+        return self.rng.choice(elements)
 
     def building_number(self) -> str:
         """
@@ -627,7 +634,7 @@ class AddressProvider_for_offline:
         Returns:
             A random building number as a string
         """
-        return str(random.randint(1, 999))
+        return str(self.rng.randint(1, 999))
 
     def last_name(self) -> str:
         """
@@ -0,0 +1,149 @@
+"""
+Walker/Vose alias tables for constant-time weighted sampling.
+
+"""
+
+import random
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+
+class AliasTable:
+    """Weighted sampler that draws in O(1) regardless of the number of values.
+
+    The table is built once in O(n) with Vose's method. Each draw then costs a
+    single uniform random number: pick a column uniformly, and keep it or jump
+    to its alias depending on the column's acceptance probability.
+    """
+
+    __slots__ = ('_alias', '_arrays', '_prob', 'values')
+
+    def __init__(self, values: Sequence[Any], weights: Sequence[float]):
+        """Build the alias table.
+
+        Args:
+            values: Values to sample from
+            weights: Non-negative weight of each value (need not be normalized)
+
+        Raises:
+            ValueError: If values and weights differ in length, a weight is negative,
+                or the weights do not sum to a positive total
+            IndexError: If values is empty
+        """
+        if len(values) != len(weights):
+            raise ValueError('values and weights must have the same length')
+        if not values:
+            raise IndexError('Cannot build an alias table from an empty sequence')
+        if any(w < 0 for w in weights):
+            raise ValueError('Weights must be non-negative')
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError('Total of weights must be greater than zero')
+
+        n = len(values)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            # The large column donates what the small one was missing
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is full up to floating point error
+
+        self.values = list(values)
+        self._prob = prob
+        self._alias = alias
+        self._arrays = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Pickled as NumPy arrays, which protocol 5 can store out-of-band (see src.data_bundle)
+        prob, alias = self.arrays()
+        return {'values': self.values, 'prob': prob, 'alias': alias}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.values = state['values']
+        self._arrays = (state['prob'], state['alias'])
+        # Memoryviews index to plain Python numbers as fast as lists do, without copying the arrays
+        self._prob = memoryview(state['prob'])
+        self._alias = memoryview(state['alias'])
+
+    def draw_index(self, rng: random.Random | None = None) -> int:
+        """Draw the index of one value, from rng or the random module."""
+        u = (rng or random).random() * len(self._prob)
+        i = int(u)
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def draw(self, rng: random.Random | None = None) -> Any:
+        """Draw one value, from rng or the random module."""
+        return self.values[self.draw_index(rng)]
+
+    def draw_indices(self, k: int, rng: random.Random | None = None) -> list[int]:
+        """Draw k indices.
+
+        Args:
+            k: Number of indices to draw
+            rng: Optional random source (defaults to the random module)
+
+        Returns:
+            List of k indices into values
+        """
+        n = len(self._prob)
+        prob = self._prob
+        alias = self._alias
+        rand = (rng or random).random
+        indices = []
+        for _ in range(k):
+            u = rand() * n
+            i = int(u)
+            indices.append(i if u - i < prob[i] else alias[i])
+        return indices
+
+    def draw_many(self, k: int, rng: random.Random | None = None) -> list[Any]:
+        """Draw k values.
+
+        Args:
+            k: Number of values to draw
+            rng: Optional random source (defaults to the random module)
+
+        Returns:
+            List of k values
+        """
+        values = self.values
+        return [values[i] for i in self.draw_indices(k, rng)]
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the acceptance probabilities and aliases as NumPy arrays.
+
+        Returns:
+            Tuple of (float64 probabilities, int64 alias indices)
+        """
+        if self._arrays is None:
+            self._arrays = (np.asarray(self._prob, dtype=np.float64), np.asarray(self._alias, dtype=np.int64))
+        return self._arrays
+
+    def sample_indices(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Draw n indices in one vectorized call.
+
+        Args:
+            n: Number of indices to draw
+            rng: NumPy random generator
+
+        Returns:
+            int64 array of n indices into values
+        """
+        prob, alias = self.arrays()
+        u = rng.random(n) * len(prob)
+        columns = u.astype(np.int64)
+        return np.where(u - columns < prob[columns], columns, alias[columns])
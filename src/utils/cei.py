@@ -4,7 +4,9 @@
 import random
 import re
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, digit_matrix, digits_to_strings, pad_id, random_digits
 
 """
 Functions for working with Brazilian CEI identifiers.
@@ -17,22 +19,20 @@ CEI_WEIGHTS = [7, 4, 1, 8, 5, 2, 1, 6, 3, 7, 4]
 
 def validate_cei(cei, autopad=True):
     """Check whether CEI is valid. Optionally pad if too short."""
-    cei = clean_id(cei)
+    return bool(validate_cei_batch([clean_id(cei)], autopad=autopad)[0])
 
-    # all complete CEI are 12 digits long
-    if len(cei) < 12:
-        if not autopad:
-            return False
-        cei = pad_cei(cei)
 
-    elif len(cei) > 12:
-        return False
+def validate_cei_batch(ceis, autopad=True):
+    """Check which CEIs in a sequence are valid. Optionally pad if too short.
 
-    if cei == '000000000000':
-        return False
-
-    digits = [int(k) for k in cei]  # identifier digits
-    return _cei_check(digits[:-1]) == digits[-1]
+    Returns:
+        Boolean NumPy array, one entry per CEI
+    """
+    # all complete CEI are 12 digits long
+    digits, valid = digit_matrix(ceis, 12, autopad=autopad)
+    valid &= digits.any(axis=1)  # 000000000000 is not a valid CEI
+    valid &= _cei_check_batch(digits[:, :11]) == digits[:, 11]
+    return valid
 
 
 def cei_check_digit(cei):
@@ -59,16 +59,33 @@ def pad_cei(cei, validate=False):
     return padded
 
 
-def random_cei(formatted=True):
-    """Create a random, valid CEI identifier."""
-    uf = random.randint(11, 53)
-    stem = f'{uf}{random.randint(100000000, 999999999)}'
+def random_cei(formatted=True, rng=None):
+    """Create a random, valid CEI identifier, drawn from rng (a random.Random) or the random module."""
+    rng = rng or random
+    uf = rng.randint(11, 53)
+    stem = f'{uf}{rng.randint(100000000, 999999999)}'
     cei = f'{stem}{cei_check_digit(stem)}'
     if formatted:
         return format_cei(cei)
     return cei
 
 
+def random_cei_batch(n, formatted=True, rng=None):
+    """Create n random, valid CEI identifiers at once.
+
+    Same distribution as random_cei: a UF code from 11 to 53 followed by a
+    9-digit number.
+    """
+    rng = rng or np.random.default_rng()
+    digits = np.empty((n, 12), dtype=np.int64)
+    uf = rng.integers(11, 54, size=n)
+    digits[:, 0] = uf // 10
+    digits[:, 1] = uf % 10
+    digits[:, 2:11] = random_digits(n, 9, rng)
+    digits[:, 11] = _cei_check_batch(digits[:, :11])
+    return digits_to_strings(digits, '##.###.#####/##' if formatted else '#' * 12)
+
+
 def _cei_check(digits):
     """Calculate check digit from iterable of integers."""
     digsum = sum(w * k for w, k in zip(CEI_WEIGHTS, digits))
@@ -76,3 +93,10 @@ def _cei_check(digits):
     if modulo == 0:
         return 0
     return 10 - modulo
+
+
+def _cei_check_batch(digits):
+    """Vectorized _cei_check over the rows of an (n, 11) digit matrix."""
+    digsum = digits @ np.array(CEI_WEIGHTS)
+    modulo = (digsum % 100 // 10 + digsum % 10) % 10
+    return np.where(modulo == 0, 0, 10 - modulo)
@@ -0,0 +1,182 @@
+"""
+Persistent SQLite cache for CEP lookups.
+
+Keyed by the normalized 8-digit CEP. Successful lookups are kept for `ttl`
+seconds; provider errors (e.g. unknown CEPs) are cached too, for the shorter
+`error_ttl`, so dead CEPs are not looked up again on every run.
+"""
+
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .util import clean_id
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'ptbr_sampler' / 'cep_cache.sqlite3'
+DEFAULT_TTL_HOURS = 30 * 24
+DEFAULT_ERROR_TTL_HOURS = 24
+
+# Address fields stored for each CEP
+CACHED_FIELDS = ('cep', 'street', 'neighborhood', 'city', 'state', 'service')
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+def normalize_cep(cep: str | int) -> str:
+    """Return the CEP as 8 digits, restoring leading zeros lost on the way."""
+    return clean_id(cep).zfill(8)
+
+
+class CepCache:
+    """
+    On-disk cache of CEP lookup results with hit and miss counters.
+
+    Results carrying `retryable` (worker crashes, Node not starting) say
+    nothing about the CEP itself and are never cached.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL_HOURS * 3600,
+        error_ttl: float = DEFAULT_ERROR_TTL_HOURS * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file (parent directories are created)
+            ttl: Seconds a successful lookup stays valid
+            error_ttl: Seconds a failed lookup stays valid
+            clock: Time source, injectable for tests
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cep_cache (
+                cep_key TEXT PRIMARY KEY,
+                cep TEXT,
+                street TEXT,
+                neighborhood TEXT,
+                city TEXT,
+                state TEXT,
+                service TEXT,
+                error TEXT,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def __enter__(self) -> 'CepCache':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_many(self, ceps: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Look up cached results and count hits and misses.
+
+        Args:
+            ceps: CEPs in any format
+
+        Returns:
+            Mapping of normalized CEP to cached result, for the unexpired hits only
+        """
+        keys = list(dict.fromkeys(normalize_cep(cep) for cep in ceps))
+        now = self.clock()
+        found = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start : start + _QUERY_BATCH]
+            rows = self._conn.execute(
+                f'SELECT cep_key, {", ".join(CACHED_FIELDS)}, error FROM cep_cache '  # noqa: S608
+                f'WHERE expires_at > ? AND cep_key IN ({", ".join("?" * len(batch))})',
+                [now, *batch],
+            )
+            for cep_key, *values, error in rows:
+                if error is not None:
+                    found[cep_key] = {'error': error, 'cep': values[0]}
+                else:
+                    found[cep_key] = dict(zip(CACHED_FIELDS, values, strict=True))
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, results: dict[str, dict[str, Any]]) -> None:
+        """
+        Store lookup results.
+
+        Args:
+            results: Mapping of CEP (any format) to the result returned by the lookup
+        """
+        now = self.clock()
+        rows = []
+        for cep, result in results.items():
+            if result.get('retryable'):
+                continue
+            error = result.get('error')
+            expires_at = now + (self.error_ttl if error is not None else self.ttl)
+            rows.append((normalize_cep(cep), *(result.get(field) for field in CACHED_FIELDS), error, expires_at))
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO cep_cache (cep_key, {", ".join(CACHED_FIELDS)}, error, expires_at) '  # noqa: S608
+                f'VALUES ({", ".join("?" * (len(CACHED_FIELDS) + 3))})',
+                rows,
+            )
+
+    def iter_addresses(self) -> Iterator[dict[str, Any]]:
+        """Yield every successful lookup stored, expired or not, e.g. to build a `CepIndex`.
+
+        Streets and neighborhoods rarely change, so entries past their TTL are
+        still good enough for offline use.
+        """
+        rows = self._conn.execute(f'SELECT cep_key, {", ".join(CACHED_FIELDS)} FROM cep_cache WHERE error IS NULL')  # noqa: S608
+        for cep_key, *values in rows:
+            yield {**dict(zip(CACHED_FIELDS, values, strict=True)), 'cep': cep_key}
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        with self._conn:
+            return self._conn.execute('DELETE FROM cep_cache WHERE expires_at <= ?', (self.clock(),)).rowcount
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# Caches opened by get_cep_cache, one per database file
+_CACHES: dict[Path, CepCache] = {}
+
+
+def get_cep_cache(
+    path: str | Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL_HOURS * 3600, error_ttl: float = DEFAULT_ERROR_TTL_HOURS * 3600
+) -> CepCache:
+    """
+    Return the shared CepCache for a database file, opening it on first use.
+
+    Reusing the instance keeps one connection and one set of hit/miss counters
+    per run; the TTLs of an already open cache are updated in place.
+    """
+    key = Path(path).resolve()
+    cache = _CACHES.get(key)
+    if cache is None:
+        cache = _CACHES[key] = CepCache(key, ttl=ttl, error_ttl=error_ttl)
+    cache.ttl = ttl
+    cache.error_ttl = error_ttl
+    return cache
@@ -0,0 +1,255 @@
+"""
+Pure-Python CEP lookups over HTTP.
+
+`HttpCepPool` queries the public CEP web services directly, on asyncio streams,
+so no Node runtime or process per lookup is needed. Each provider keeps its own
+keep-alive connections and concurrency limit, and providers are tried in order
+until one knows the CEP, the way cep-promise falls back between services.
+"""
+
+import asyncio
+import json
+import random
+import ssl
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from .cep_wrapper import DEFAULT_POOL_SIZE, CepLookupPool
+from .retry_policy import RetryPolicy
+
+# Seconds allowed for one HTTP exchange, connecting included
+DEFAULT_HTTP_TIMEOUT = 10.0
+
+_USER_AGENT = 'ptbr-sampler'
+
+
+class CepHttpError(ConnectionError):
+    """Raised when a provider cannot be reached or answers with a server error."""
+
+
+@dataclass(frozen=True)
+class CepProvider:
+    """A CEP web service.
+
+    `url` is a template with a `{cep}` placeholder (8 digits). `parse` turns the
+    HTTP status and decoded JSON body into a cep-promise style address
+    dictionary, or None when the service says the CEP does not exist.
+    """
+
+    name: str
+    url: str
+    parse: Callable[[int, Any], dict[str, Any] | None]
+
+
+def _parse_viacep(status: int, payload: Any) -> dict[str, Any] | None:
+    if status == 400 or not isinstance(payload, dict) or payload.get('erro'):
+        return None
+    return {
+        'cep': payload.get('cep', '').replace('-', ''),
+        'state': payload.get('uf', ''),
+        'city': payload.get('localidade', ''),
+        'neighborhood': payload.get('bairro', ''),
+        'street': payload.get('logradouro', ''),
+        'service': 'viacep',
+    }
+
+
+def _parse_brasilapi(status: int, payload: Any) -> dict[str, Any] | None:
+    if status == 404 or not isinstance(payload, dict):
+        return None
+    return {
+        'cep': payload.get('cep', ''),
+        'state': payload.get('state', ''),
+        'city': payload.get('city', ''),
+        'neighborhood': payload.get('neighborhood', ''),
+        'street': payload.get('street', ''),
+        'service': 'brasilapi',
+    }
+
+
+VIACEP = CepProvider('viacep', 'https://viacep.com.br/ws/{cep}/json/', _parse_viacep)
+BRASILAPI = CepProvider('brasilapi', 'https://brasilapi.com.br/api/cep/v1/{cep}', _parse_brasilapi)
+DEFAULT_PROVIDERS = (VIACEP, BRASILAPI)
+
+
+class _HostConnections:
+    """Keep-alive HTTP/1.1 connections to one origin, at most `limit` in use at once."""
+
+    def __init__(self, url: str, limit: int, timeout: float):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.opened = 0
+        self._ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self._limit = asyncio.Semaphore(limit)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def get(self, target: str) -> tuple[int, bytes]:
+        """Send a GET request and return (status, body).
+
+        Raises:
+            OSError: If the exchange failed, also on a fresh connection
+        """
+        async with self._limit:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    status, body, keep_alive = await asyncio.wait_for(self._exchange(reader, writer, target), self.timeout)
+                except (OSError, EOFError, ValueError) as e:
+                    writer.close()
+                    if reused:
+                        continue  # The server closed the idle connection; retry on another one
+                    if isinstance(e, OSError):
+                        raise
+                    raise CepHttpError(f'Malformed HTTP response from {self.host}: {e!s}') from e
+                except asyncio.CancelledError:
+                    writer.close()  # The response may still arrive; the connection cannot be reused
+                    raise
+                if keep_alive:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, body
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl, server_hostname=self.host if self._ssl else None), self.timeout
+        )
+        self.opened += 1
+        return connection
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str) -> tuple[int, bytes, bool]:
+        writer.write(
+            f'GET {target} HTTP/1.1\r\nHost: {self.host_header}\r\nUser-Agent: {_USER_AGENT}\r\nAccept: application/json\r\n\r\n'.encode()
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError('connection closed before the response')
+        version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+        headers = {}
+        while (line := await reader.readline()) not in {b'\r\n', b'\n', b''}:
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            # Body delimited by the end of the connection
+            body = await reader.read()
+            keep_alive = False
+        return int(status), body, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        parts = []
+        while size := int((await reader.readline()).split(b';')[0], 16):
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # CRLF after each chunk
+        # Skip the trailer section
+        while (await reader.readline()) not in {b'\r\n', b'\n', b''}:
+            pass
+        return b''.join(parts)
+
+    def close(self) -> None:
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+
+class HttpCepPool(CepLookupPool):
+    """
+    CEP lookups made from Python over pooled keep-alive HTTP connections.
+
+    Providers are queried in order: the first one that knows the CEP answers it.
+    A CEP that a provider reports as unknown is an answer, not a failure, and is
+    not retried; only when no provider could answer is the error `retryable`.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        providers: tuple[CepProvider, ...] = DEFAULT_PROVIDERS,
+        timeout: float = DEFAULT_HTTP_TIMEOUT,
+        retry_policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            size: Maximum concurrent requests, and kept-alive connections, per provider
+            providers: Services queried, in order
+            timeout: Seconds allowed for one HTTP exchange
+            retry_policy: Backoff and circuit breaker settings (RetryPolicy defaults if None)
+            clock: Time source for the elapsed time and the circuit breaker, injectable for tests
+            rng: Random source for the backoff jitter
+        """
+        if size < 1:
+            raise ValueError('Pool size must be at least 1')
+        if not providers:
+            raise ValueError('At least one CEP provider is needed')
+        super().__init__(retry_policy, clock, rng)
+        self.size = size
+        self.providers = tuple(providers)
+        self.timeout = timeout
+        self._connections: dict[str, _HostConnections] = {}
+
+    @property
+    def connections_opened(self) -> int:
+        return sum(connections.opened for connections in self._connections.values())
+
+    async def start(self) -> None:
+        # Connections are opened on first use and then kept alive
+        self._connections = {provider.name: _HostConnections(provider.url, self.size, self.timeout) for provider in self.providers}
+
+    async def close(self) -> None:
+        for connections in self._connections.values():
+            connections.close()
+        self._connections = {}
+
+    async def _query(self, provider: CepProvider, cep: str) -> dict[str, Any] | None:
+        """Ask one provider about a CEP; None means it does not know it.
+
+        Raises:
+            OSError: If the provider cannot be reached or fails
+        """
+        url = urlsplit(provider.url.format(cep=cep))
+        target = url.path + (f'?{url.query}' if url.query else '')
+        status, body = await self._connections[provider.name].get(target)
+        # 400 and 404 are how the services answer for malformed and unknown CEPs
+        if not (200 <= status < 300 or status in {400, 404}):
+            raise CepHttpError(f'HTTP {status}')
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError as e:
+            if status < 300:
+                raise CepHttpError(f'Invalid JSON in HTTP {status} response') from e
+            payload = None
+        return provider.parse(status, payload)
+
+    async def _request(self, cep: str) -> dict[str, Any]:
+        failures = []
+        answered = False
+        for provider in self.providers:
+            try:
+                result = await self._query(provider, cep)
+            except OSError as e:
+                failures.append(f'{provider.name}: {e!s}')
+                continue
+            if result is not None:
+                return {'result': result}
+            answered = True
+        if answered:
+            return {'error': 'CEP NAO ENCONTRADO', 'retryable': False}
+        return {'error': f'Todos os serviços de CEP retornaram erro. {"; ".join(failures)}', 'retryable': True}
@@ -0,0 +1,293 @@
+"""
+Offline CEP address index.
+
+`build_cep_index` compiles CEP -> (street, neighborhood, city, state) entries,
+harvested from the CEP lookup cache or imported from a CSV/JSONL file, into a
+sorted binary file. `CepIndex` memory-maps that file and answers lookups by
+binary search over the CEP column, so nothing is parsed at startup and batches
+of lookups run as one vectorized `searchsorted`.
+
+File layout (all integers little-endian uint32):
+
+    header         magic, version, entry count, string count
+    keys           entry count CEPs as integers, sorted
+    fields         entry count x 4 string ids (street, neighborhood, city, state)
+    string ends    string count end offsets into the string data
+    string data    UTF-8 bytes of every distinct string, id 0 being ''
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .util import cep_to_int, ceps_to_ints
+
+DEFAULT_INDEX_PATH = Path.home() / '.cache' / 'ptbr_sampler' / 'cep_index.bin'
+
+# Address fields stored for each CEP, in file order
+INDEX_FIELDS = ('street', 'neighborhood', 'city', 'state')
+
+# Column names accepted when importing a file, first the canonical one, then ViaCEP and Portuguese names
+FIELD_ALIASES = {
+    'cep': ('cep', 'postal_code', 'zipcode'),
+    'street': ('street', 'logradouro', 'rua'),
+    'neighborhood': ('neighborhood', 'bairro'),
+    'city': ('city', 'localidade', 'cidade', 'municipio'),
+    'state': ('state', 'uf', 'estado'),
+}
+
+_MAGIC = b'PTBRCEPI'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIII4x')
+_UINT32 = np.dtype('<u4')
+
+
+def build_cep_index(records: Iterable[dict[str, Any]], path: str | Path = DEFAULT_INDEX_PATH) -> int:
+    """
+    Compile address records into a CEP index file.
+
+    Records without a valid CEP, and lookup errors, are skipped. When a CEP
+    appears more than once, the last record wins, so sources can be chained
+    from the least to the most trusted.
+
+    Args:
+        records: Dictionaries with `cep` and any of `street`, `neighborhood`, `city` and `state`
+        path: Index file to write (parent directories are created); replaced atomically
+
+    Returns:
+        Number of CEPs in the index
+    """
+    entries: dict[int, tuple[str, ...]] = {}
+    for record in records:
+        key = cep_to_int(record.get('cep'))
+        if key < 0 or 'error' in record:
+            continue
+        entries[key] = tuple(str(record.get(field) or '').strip() for field in INDEX_FIELDS)
+
+    strings = {'': 0}
+    keys = np.fromiter(sorted(entries), dtype=_UINT32, count=len(entries))
+    fields = np.empty((len(entries), len(INDEX_FIELDS)), dtype=_UINT32)
+    for row, key in enumerate(keys.tolist()):
+        fields[row] = [strings.setdefault(value, len(strings)) for value in entries[key]]
+
+    data = [value.encode('utf-8') for value in strings]
+    string_ends = np.cumsum([len(value) for value in data], dtype=np.int64)
+    if string_ends[-1] > np.iinfo(_UINT32).max:
+        raise ValueError('CEP index strings exceed 4 GiB')
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(keys), len(data)))
+        f.write(keys.tobytes())
+        f.write(fields.tobytes())
+        f.write(string_ends.astype(_UINT32).tobytes())
+        f.write(b''.join(data))
+    tmp_path.replace(path)
+    return len(keys)
+
+
+def read_address_file(path: str | Path, delimiter: str = ',') -> Iterator[dict[str, Any]]:
+    """
+    Stream address records from a CSV or JSONL file for `build_cep_index`.
+
+    Column names are matched case-insensitively against `FIELD_ALIASES`, so
+    files in ViaCEP's shape (`logradouro`, `bairro`, `localidade`, `uf`) are
+    read as they are. Files ending in .jsonl or .ndjson are read as JSON lines,
+    anything else as CSV with a header row.
+
+    Yields:
+        Dictionaries with the canonical field names
+    """
+    path = Path(path)
+    with path.open(encoding='utf-8', newline='') as file:
+        if path.suffix.lower() in {'.jsonl', '.ndjson'}:
+            rows = (json.loads(line) for line in file if line.strip())
+        else:
+            rows = csv.DictReader(file, delimiter=delimiter)
+        for row in rows:
+            lowered = {str(name).strip().lower(): value for name, value in row.items()}
+            yield {
+                field: next((lowered[alias] for alias in aliases if lowered.get(alias) not in {None, ''}), None)
+                for field, aliases in FIELD_ALIASES.items()
+            }
+
+
+class CepIndex:
+    """
+    Read-only, memory-mapped view of a file written by `build_cep_index`.
+
+    Opening costs a header read whatever the file size, and the pages are
+    shared with every other process mapping the same file. Row numbers
+    returned by `find` and `nearest` are positions in the sorted CEP column.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_INDEX_PATH):
+        """
+        Args:
+            path: Index file written by `build_cep_index`
+
+        Raises:
+            OSError: If the file cannot be opened
+            ValueError: If the file is not a CEP index
+        """
+        self.path = Path(path)
+        with self.path.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f'Not a CEP index file: {self.path}')
+        magic, version, count, string_count = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise ValueError(f'Not a CEP index file (or an unsupported version): {self.path}')
+
+        offset = _HEADER.size
+        self.keys = np.frombuffer(self._mmap, dtype=_UINT32, count=count, offset=offset)
+        offset += self.keys.nbytes
+        self._fields = np.frombuffer(self._mmap, dtype=_UINT32, count=count * len(INDEX_FIELDS), offset=offset)
+        self._fields = self._fields.reshape(count, len(INDEX_FIELDS))
+        offset += self._fields.nbytes
+        self._string_ends = np.frombuffer(self._mmap, dtype=_UINT32, count=string_count, offset=offset)
+        self._strings_start = offset + 4 * string_count
+        self._strings: dict[int, str] = {}
+        # Plain memoryviews for scalar lookups, which NumPy's per-call overhead would dominate
+        if sys.byteorder == 'little':
+            view = memoryview(self._mmap)
+            self._key_view = view[_HEADER.size : _HEADER.size + self.keys.nbytes].cast('I')
+            self._field_view = view[_HEADER.size + self.keys.nbytes : offset].cast('I')
+        else:
+            self._key_view, self._field_view = self.keys, self._fields.reshape(-1)
+
+    def __enter__(self) -> 'CepIndex':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, cep: str | int) -> bool:
+        return self.get(cep) is not None
+
+    def _string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            start = self._strings_start + (int(self._string_ends[string_id - 1]) if string_id else 0)
+            end = self._strings_start + int(self._string_ends[string_id])
+            value = self._strings[string_id] = self._mmap[start:end].decode('utf-8')
+        return value
+
+    def record(self, row: int) -> dict[str, str]:
+        """Return the entry at a row as an address dictionary with an 8-digit `cep`."""
+        start = row * len(INDEX_FIELDS)
+        address = {'cep': f'{self._key_view[row]:08d}'}
+        for field, string_id in zip(INDEX_FIELDS, self._field_view[start : start + len(INDEX_FIELDS)], strict=True):
+            address[field] = self._string(string_id)
+        return address
+
+    def get(self, cep: str | int) -> dict[str, str] | None:
+        """Return the address of a CEP, or None if it is not in the index."""
+        key = cep_to_int(cep)
+        row = bisect_left(self._key_view, key)
+        if key < 0 or row == len(self._key_view) or self._key_view[row] != key:
+            return None
+        return self.record(row)
+
+    def find(self, ceps: Iterable[str | int] | np.ndarray) -> np.ndarray:
+        """
+        Find the rows of many CEPs at once.
+
+        Args:
+            ceps: CEPs in any format, or an integer array such as `LocationBatch.ceps`
+
+        Returns:
+            Row of each CEP in the index, -1 where it is missing
+        """
+        keys = ceps_to_ints(ceps)
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        rows = np.searchsorted(self.keys, keys.clip(0).astype(_UINT32))
+        clipped = np.minimum(rows, len(self.keys) - 1)
+        return np.where((keys >= 0) & (self.keys[clipped] == keys), clipped, -1)
+
+    def nearest(self, ceps: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """
+        Find, for each CEP, the closest indexed CEP within [low, high].
+
+        Used to move a CEP drawn at random from a city's range onto a real one
+        from the same range. Ties go to the higher CEP.
+
+        Args:
+            ceps: Integer CEPs (-1 for none)
+            low: Lowest acceptable CEP, per CEP
+            high: Highest acceptable CEP, per CEP
+
+        Returns:
+            Row of the closest acceptable entry per CEP, -1 where there is none
+        """
+        keys = np.asarray(ceps, dtype=np.int64)
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        index_keys = self.keys
+        right = np.searchsorted(index_keys, keys.clip(0).astype(_UINT32))
+        left = right - 1
+        right_keys = index_keys[np.minimum(right, len(index_keys) - 1)].astype(np.int64)
+        left_keys = index_keys[np.maximum(left, 0)].astype(np.int64)
+        right_ok = (right < len(index_keys)) & (right_keys >= low) & (right_keys <= high)
+        left_ok = (left >= 0) & (left_keys >= low) & (left_keys <= high)
+        take_right = right_ok & (~left_ok | (right_keys - keys <= keys - left_keys))
+        rows = np.where(take_right, right, np.where(left_ok, left, -1))
+        return np.where(keys >= 0, rows, -1)
+
+    def snap(self, ceps: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """
+        Move each CEP onto the closest indexed CEP within [low, high].
+
+        Args:
+            ceps: Integer CEPs, e.g. `LocationBatch.ceps`
+            low: Lowest acceptable CEP, per CEP
+            high: Highest acceptable CEP, per CEP
+
+        Returns:
+            New integer CEP array, unchanged where no indexed CEP is in range
+        """
+        rows = self.nearest(ceps, low, high)
+        return np.where(rows >= 0, self.keys[rows.clip(0)] if len(self.keys) else 0, ceps)
+
+    def close(self) -> None:
+        # NumPy views pin the buffer; drop them before unmapping
+        if isinstance(self._key_view, memoryview):
+            self._key_view.release()
+            self._field_view.release()
+        self.keys = self._fields = self._string_ends = self._key_view = self._field_view = None
+        self._mmap.close()
+
+
+# Indexes opened by get_cep_index, one per file
+_INDEXES: dict[Path, CepIndex] = {}
+
+
+def get_cep_index(path: str | Path = DEFAULT_INDEX_PATH) -> CepIndex:
+    """
+    Return the shared CepIndex for a file, mapping it on first use.
+
+    The file is mapped again if it was rebuilt since (`build_cep_index` replaces it).
+    """
+    key = Path(path).resolve()
+    index = _INDEXES.get(key)
+    if index is None or index.mtime_ns != key.stat().st_mtime_ns:
+        index = _INDEXES[key] = CepIndex(key)
+    return index
@@ -0,0 +1,55 @@
+// Long-lived CEP lookup worker used by cep_wrapper.CepWorkerPool.
+//
+// Reads one JSON request per line from stdin: {"id": 1, "cep": "01001000"}
+// Writes one JSON response per line to stdout: {"id": 1, "result": {...}}
+// or {"id": 1, "error": "message", "retryable": false}. Requests are handled
+// concurrently, so responses may come back out of order; the id ties them to
+// their request.
+//
+// An error is retryable when it says nothing about the CEP itself: the
+// provider set `retryable`, or cep-promise reported a service error (every
+// service failed) without any service answering that the CEP does not exist.
+//
+// CEP_PROVIDER_MODULE overrides the lookup module (default: cep-promise).
+// It must default-export a function that takes a CEP and returns a promise.
+import { isAbsolute } from "node:path";
+import { createInterface } from "node:readline";
+import { pathToFileURL } from "node:url";
+
+const providerPath = process.env.CEP_PROVIDER_MODULE || "./cep-promise-node/dist/cep-promise.min.js";
+const providerUrl = isAbsolute(providerPath) ? pathToFileURL(providerPath) : new URL(providerPath, import.meta.url);
+const { default: lookupCep } = await import(providerUrl);
+
+function isRetryable(error) {
+    if (typeof error.retryable === "boolean") {
+        return error.retryable;
+    }
+    if (error.type !== "service_error") {
+        return false;
+    }
+    return !(error.errors || []).some((serviceError) => /encontrado/i.test(serviceError.message || ""));
+}
+
+function respond(response) {
+    process.stdout.write(JSON.stringify(response) + "\n");
+}
+
+const lines = createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+lines.on("line", async (line) => {
+    if (!line.trim()) {
+        return;
+    }
+    let request;
+    try {
+        request = JSON.parse(line);
+    } catch (error) {
+        respond({ id: null, error: `Invalid request: ${error.message}` });
+        return;
+    }
+    try {
+        respond({ id: request.id, result: await lookupCep(request.cep) });
+    } catch (error) {
+        respond({ id: request.id, error: error.message, retryable: isRetryable(error) });
+    }
+});
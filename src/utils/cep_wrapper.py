@@ -1,133 +1,475 @@
 import asyncio
+import itertools
 import json
-import subprocess
+import os
+import random
 import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from enum import Enum
+from pathlib import Path
 from typing import Any
 
+from .cep_cache import CepCache, normalize_cep
+from .retry_policy import RetryPolicy
 
-async def get_cep_data(cep: str) -> dict[str, Any]:
+# Node script that serves CEP lookups over stdin/stdout, one JSON object per line
+CEP_WORKER_SCRIPT = Path(__file__).with_name('cep_worker.js')
+# Number of Node processes per pool, or of HTTP connections per provider
+DEFAULT_POOL_SIZE = 4
+# Concurrent lookups kept in flight by default, and per worker of larger pools
+DEFAULT_MAX_LOOKUPS = 10
+LOOKUPS_PER_WORKER = 2
+
+
+def lookups_for_pool(pool_size: int) -> int:
+    """Return how many concurrent lookups keep every worker of a pool of pool_size busy."""
+    return max(DEFAULT_MAX_LOOKUPS, pool_size * LOOKUPS_PER_WORKER)
+
+
+class CepWorkerCrashed(ConnectionError):
+    """Raised for requests that were pending when their Node worker exited."""
+
+
+class _NodeCepWorker:
+    """One long-lived `node cep_worker.js` process.
+
+    Requests are written to the process as JSON lines and matched with their
+    responses by id, so a single worker serves many lookups concurrently.
     """
-    Retrieves address information for a single CEP using cep_service.js
-    which directly imports from the cep-promise package.
 
-    Args:
-        cep: A CEP (string).
+    def __init__(self, command: list[str], env: dict[str, str] | None = None):
+        self.command = command
+        self.env = env
+        self.process = None
+        self.pending: dict[int, asyncio.Future] = {}
+        self.last_error = ''
+        self._readers = []
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self._readers[0].done()
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self.env,
+        )
+        self._readers = [asyncio.create_task(self._read_responses()), asyncio.create_task(self._read_errors())]
+
+    async def request(self, request_id: int, cep: str) -> dict[str, Any]:
+        """Send one lookup and wait for its response line.
+
+        Raises:
+            CepWorkerCrashed: If the worker exits before answering
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            self.process.stdin.write(json.dumps({'id': request_id, 'cep': cep}).encode('utf-8') + b'\n')
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self.pending.pop(request_id, None)
+            raise CepWorkerCrashed(f'Node CEP worker is not accepting requests: {e!s}') from e
+        return await future
+
+    async def _read_responses(self) -> None:
+        try:
+            while line := await self.process.stdout.readline():
+                try:
+                    response = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Not a response line (e.g. stray output from the provider)
+                future = self.pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            # EOF: the worker exited, so nothing pending will ever be answered
+            error = CepWorkerCrashed(f'Node CEP worker exited: {self.last_error or "no error output"}')
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+
+    async def _read_errors(self) -> None:
+        # Drain stderr so the worker never blocks on a full pipe; keep the last line for error messages
+        while line := await self.process.stderr.readline():
+            self.last_error = line.decode('utf-8', errors='replace').strip() or self.last_error
+
+    async def close(self) -> None:
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        await asyncio.gather(*self._readers, return_exceptions=True)
 
-    Returns:
-        A dictionary containing the address information.
-        Returns an error dictionary if there is an issue after 100 retry attempts.
+
+class CepLookupPool(ABC):
     """
-    # Ensure cep is a string
-    cep = str(cep)
+    Base class of the CEP lookup backends.
 
-    max_retries = 100
-    retry_count = 0
+    Subclasses implement `start`, `close` and `_request`, a single attempt at
+    one CEP. This class adds what every backend shares: concurrent lookups of
+    the same CEP share a single request, failed attempts are retried with the
+    backoff of `retry_policy`, and the pool's circuit breaker fails lookups
+    fast once too many recent attempts failed.
 
-    while retry_count < max_retries:
-        try:
-            # Use the cep_service.js directly
-            process = await asyncio.create_subprocess_exec(
-                'node',
-                'src/utils/cep_service.js',
-                cep,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_output = stderr.decode('utf-8').strip() if stderr else 'No error details available'
-                retry_count += 1
-                if retry_count >= max_retries:
-                    return {'error': f'Error calling cep_service.js after {max_retries} retries: {error_output}', 'cep': cep}
-                await asyncio.sleep(0.01)  # Small delay between retries
-                continue  # Skip to next iteration
-
-            result = json.loads(stdout.decode('utf-8'))
-
-            # If result is a list with one item, return that item
-            if isinstance(result, list) and len(result) == 1:
-                return result[0]
-            return result
-
-        except subprocess.CalledProcessError as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                return {'error': f'Error calling cep_service.js after {max_retries} retries: {e}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
-
-        except json.JSONDecodeError as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                return {'error': f'Error decoding JSON after {max_retries} retries: {e}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
-
-        except Exception as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                return {'error': f'Unexpected error after {max_retries} retries: {e!s}', 'cep': cep}
-            await asyncio.sleep(0.01)  # Small delay between retries
-
-
-async def workers_for_multiple_cep(ceps: list[str], max_workers: int = 10) -> list[dict[str, Any]]:
+    Use as an async context manager:
+
+        async with CepWorkerPool(size=4) as pool:
+            data = await pool.lookup('01001000')
     """
-    Process multiple CEPs concurrently using a worker pool.
 
-    Args:
-        ceps: List of CEP strings to process
-        max_workers: Maximum number of concurrent workers
+    def __init__(
+        self,
+        retry_policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            retry_policy: Backoff and circuit breaker settings (RetryPolicy defaults if None)
+            clock: Time source for the elapsed time and the circuit breaker, injectable for tests
+            rng: Random source for the backoff jitter
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = self.retry_policy.circuit_breaker(clock)
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.retries = 0
+        self.coalesced = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> 'CepLookupPool':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Start the backend's workers or connections."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop the backend, letting in-flight lookups finish first."""
+
+    @abstractmethod
+    async def _request(self, cep: str) -> dict[str, Any]:
+        """Make one attempt at looking up a normalized CEP.
+
+        Returns:
+            {'result': address dictionary} on success, or {'error': message, 'retryable': bool}
+
+        Raises:
+            OSError: If the backend itself failed; the attempt is retried
+        """
+
+    async def lookup(self, cep: str) -> dict[str, Any]:
+        """
+        Look up one CEP.
+
+        A lookup for a CEP that is already in flight waits for that request
+        instead of sending another one.
+
+        Returns:
+            The provider's address dictionary, or an error dictionary if the
+            lookup failed or the backend kept failing (marked `retryable`,
+            since it says nothing about the CEP itself)
+        """
+        key = normalize_cep(cep)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._in_flight[key] = asyncio.ensure_future(self._lookup(key))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so that a cancelled caller does not cancel the request for the others
+        return dict(await asyncio.shield(future))
+
+    async def _lookup(self, cep: str) -> dict[str, Any]:
+        started = self.clock()
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                return {'error': 'CEP lookups are failing, circuit breaker is open', 'cep': cep, 'retryable': True}
+            attempt += 1
+            try:
+                response = await self._request(cep)
+            except OSError as e:
+                error = f'{type(self).__name__} failed: {e!s}'
+            else:
+                if 'error' not in response:
+                    self.circuit_breaker.record_success()
+                    return response['result']
+                if not response.get('retryable'):
+                    # The provider answered; the error is about the CEP itself
+                    self.circuit_breaker.record_success()
+                    return {'error': response['error'], 'cep': cep}
+                error = response['error']
+
+            self.circuit_breaker.record_failure()
+            delay = self.retry_policy.next_delay(attempt, self.clock() - started, self.rng)
+            if delay is None:
+                return {'error': f'CEP lookup failed after {attempt} attempts: {error}', 'cep': cep, 'retryable': True}
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+
+class CepWorkerPool(CepLookupPool):
+    """
+    Pool of long-lived Node CEP workers.
 
-    Returns:
-        List of dictionaries containing address information for each CEP
+    Node startup and module loading are paid once per worker instead of once
+    per CEP. Lookups go to the worker with the fewest pending requests, and a
+    worker that crashes is restarted before the lookup is retried.
     """
-    # Use worker pool approach for individual processing
-    queue = asyncio.Queue()
 
-    # Add all CEPs to the queue
-    for cep in ceps:
-        await queue.put(cep)
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        script: str | Path = CEP_WORKER_SCRIPT,
+        node: str = 'node',
+        env: dict[str, str] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """
+        Args:
+            size: Number of Node processes
+            script: Worker script speaking the JSON lines protocol
+            node: Node executable
+            env: Extra environment variables for the workers (e.g. CEP_PROVIDER_MODULE)
+            retry_policy: Backoff and circuit breaker settings (RetryPolicy defaults if None)
+            clock: Time source for the elapsed time and the circuit breaker, injectable for tests
+            rng: Random source for the backoff jitter
+        """
+        if size < 1:
+            raise ValueError('Pool size must be at least 1')
+        super().__init__(retry_policy, clock, rng)
+        self.size = size
+        self.command = [node, str(script)]
+        self.env = {**os.environ, **env} if env else None
+        self.restarts = 0
+        self._workers: list[_NodeCepWorker] = []
+        self._ids = itertools.count()
+        self._restart_lock = None
+
+    async def start(self) -> None:
+        """Start every worker.
+
+        Raises:
+            OSError: If the Node executable cannot be started
+        """
+        self._restart_lock = asyncio.Lock()
+        self._workers = [_NodeCepWorker(self.command, self.env) for _ in range(self.size)]
+        try:
+            await asyncio.gather(*(worker.start() for worker in self._workers))
+        except OSError:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        """Stop every worker, letting in-flight lookups finish first."""
+        await asyncio.gather(*(worker.close() for worker in self._workers), return_exceptions=True)
+        self._workers = []
+
+    async def _pick_worker(self) -> _NodeCepWorker:
+        """Return the live worker with the fewest pending lookups, restarting dead ones first."""
+        if not all(worker.alive for worker in self._workers):
+            async with self._restart_lock:
+                for i, worker in enumerate(self._workers):
+                    if not worker.alive:
+                        await worker.close()
+                        self._workers[i] = _NodeCepWorker(self.command, self.env)
+                        await self._workers[i].start()
+                        self.restarts += 1
+        return min(self._workers, key=lambda worker: len(worker.pending))
+
+    async def _request(self, cep: str) -> dict[str, Any]:
+        # CepWorkerCrashed, or a worker that cannot be restarted, raise OSError
+        worker = await self._pick_worker()
+        return await worker.request(next(self._ids), cep)
+
+
+class CepBackend(str, Enum):
+    """Ways of looking up CEPs"""
+
+    NODE = 'node'
+    HTTP = 'http'
+
+
+def create_cep_pool(
+    backend: CepBackend = CepBackend.NODE, size: int = DEFAULT_POOL_SIZE, retry_policy: RetryPolicy | None = None
+) -> CepLookupPool:
+    """
+    Build an unstarted lookup pool for a backend.
 
-    # Results container with mapping to preserve order
-    results_dict = {}
+    Args:
+        backend: `node` runs cep-promise in Node workers; `http` queries the providers directly from Python
+        size: Number of Node workers, or of connections per provider for `http`
+        retry_policy: Backoff and circuit breaker settings (RetryPolicy defaults if None)
+    """
+    if CepBackend(backend) == CepBackend.HTTP:
+        from .cep_http import HttpCepPool
 
-    # Worker function that processes CEPs from the queue
-    async def worker():
-        while not queue.empty():
-            try:
-                # Get a CEP from the queue
-                cep = await queue.get()
+        return HttpCepPool(size=size, retry_policy=retry_policy)
+    return CepWorkerPool(size=size, retry_policy=retry_policy)
 
-                # Process the CEP using get_cep_data function
-                result = await get_cep_data(cep)
 
-                # Store the result with the CEP as key to preserve order
-                results_dict[cep] = result
+async def get_cep_data(cep: str, pool: CepLookupPool | None = None, backend: CepBackend = CepBackend.NODE) -> dict[str, Any]:
+    """
+    Retrieves address information for a single CEP, through the Node CEP
+    worker (which imports from the cep-promise package) or over HTTP.
 
-                # Mark task as done
-                queue.task_done()
-            except Exception as e:
-                # Handle any exceptions in the worker
-                results_dict[cep] = {'error': f'Worker error processing CEP: {e!s}', 'cep': cep}
-                queue.task_done()
+    Args:
+        cep: A CEP (string).
+        pool: Optional running lookup pool; a one-worker pool of `backend` is started otherwise.
+        backend: Backend used when no pool is given
 
-    # Create worker tasks
-    tasks = []
-    for _ in range(min(max_workers, len(ceps))):
-        task = asyncio.create_task(worker())
-        tasks.append(task)
+    Returns:
+        A dictionary containing the address information.
+        Returns an error dictionary if the lookup fails.
+    """
+    if pool is not None:
+        return await pool.lookup(cep)
+    return (await workers_for_multiple_cep([cep], pool_size=1, backend=backend))[0]
+
+
+async def workers_for_multiple_cep(
+    ceps: list[str],
+    max_workers: int = DEFAULT_MAX_LOOKUPS,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool: CepLookupPool | None = None,
+    cache: CepCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    backend: CepBackend = CepBackend.NODE,
+) -> list[dict[str, Any]]:
+    """
+    Process multiple CEPs concurrently, multiplexed over a lookup pool.
 
-    # Wait for the queue to be fully processed
-    await queue.join()
+    Each distinct CEP is looked up once, however often it repeats in `ceps`,
+    and its result is copied to every position that asked for it.
 
-    # Cancel any remaining worker tasks
-    for task in tasks:
-        task.cancel()
+    Args:
+        ceps: List of CEP strings to process
+        max_workers: Maximum number of concurrent lookups
+        pool_size: Size of the pool started when no pool is given (Node processes, or connections per provider)
+        pool: Optional running lookup pool to reuse
+        cache: Optional CepCache consulted first; only its misses are looked up, and their results stored
+        retry_policy: Retry and circuit breaker settings of the pool started when no pool is given
+        backend: Backend of the pool started when no pool is given
+
+    Returns:
+        List of dictionaries containing address information for each CEP
+    """
+    results: list[dict[str, Any]] = [{}] * len(ceps)
+    async for index, result in iter_cep_results(ceps, max_workers, pool_size, pool, cache, retry_policy, backend):
+        results[index] = result
+    return results
+
+
+async def iter_cep_results(
+    ceps: list[str],
+    max_workers: int = DEFAULT_MAX_LOOKUPS,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    pool: CepLookupPool | None = None,
+    cache: CepCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    backend: CepBackend = CepBackend.NODE,
+) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+    """
+    Look up multiple CEPs and yield each result as soon as it is available.
 
-    # Wait for all tasks to be cancelled
-    await asyncio.gather(*tasks, return_exceptions=True)
+    Like `asyncio.as_completed`, results come in completion order: cache hits
+    first, then each lookup as it returns, so one slow CEP does not hold back
+    the others. Takes the same arguments as `workers_for_multiple_cep`.
 
-    # Convert results dict back to list in the original order
-    return [results_dict.get(cep, {'error': 'CEP processing failed', 'cep': cep}) for cep in ceps]
+    Yields:
+        Tuples of (position in `ceps`, address dictionary), once per position
+    """
+    positions: dict[str, list[int]] = {}
+    for index, cep in enumerate(ceps):
+        positions.setdefault(normalize_cep(cep), []).append(index)
+
+    cached = cache.get_many(positions) if cache is not None else {}
+    for key, result in cached.items():
+        for index in positions[key]:
+            yield index, dict(result)
+
+    misses = [key for key in positions if key not in cached]
+    if not misses:
+        return
+    fetched = {}
+    try:
+        async for key, result in _iter_unique_lookups(misses, max_workers, pool_size, pool, retry_policy, backend):
+            fetched[key] = result
+            # Fan the result back out, one copy per record
+            for index in positions[key]:
+                yield index, dict(result)
+    finally:
+        if cache is not None:
+            cache.put_many(fetched)
+
+
+async def _iter_unique_lookups(
+    ceps: list[str],
+    max_workers: int,
+    pool_size: int,
+    pool: CepLookupPool | None,
+    retry_policy: RetryPolicy | None = None,
+    backend: CepBackend = CepBackend.NODE,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Look up distinct normalized CEPs, yielding (CEP, result) in completion order."""
+    if pool is None:
+        pool = create_cep_pool(backend, size=min(pool_size, len(ceps)), retry_policy=retry_policy)
+        try:
+            await pool.start()
+        except OSError as e:
+            error = f'Could not start the {CepBackend(backend).value} CEP lookup pool: {e!s}'
+            for cep in ceps:
+                yield cep, {'error': error, 'cep': cep, 'retryable': True}
+            return
+        try:
+            async for item in _iter_unique_lookups(ceps, max_workers, pool_size, pool):
+                yield item
+        finally:
+            await pool.close()
+        return
+
+    # Workers share one iterator over the CEPs and hand finished lookups over
+    # through a bounded queue, so they pause when the consumer falls behind
+    pending = iter(ceps)
+    completed: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(maxsize=max_workers)
+
+    async def worker() -> None:
+        for cep in pending:
+            try:
+                result = await pool.lookup(cep)
+            except Exception as e:
+                result = {'error': f'Worker error processing CEP: {e!s}', 'cep': cep, 'retryable': True}
+            await completed.put((cep, result))
+
+    tasks = [asyncio.create_task(worker()) for _ in range(min(max_workers, len(ceps)))]
+    try:
+        for _ in range(len(ceps)):
+            yield await completed.get()
+    finally:
+        # Stop the workers if the consumer stopped early
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def display_cep_info(data):
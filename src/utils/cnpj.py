@@ -4,7 +4,9 @@
 import random
 from collections import namedtuple
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, digit_matrix, digits_to_strings, mod11_check, pad_id, random_digits
 
 """
 Functions for working with Brazilian company identifiers (CNPJ).
@@ -18,34 +20,23 @@ CNPJ = namedtuple('CNPJ', ['cnpj', 'firm', 'establishment', 'check', 'valid'])
 
 def validate_cnpj(cnpj, autopad=True):
     """Check whether CNPJ is valid. Optionally pad if too short."""
-    cnpj = clean_id(cnpj)
+    return bool(validate_cnpj_batch([clean_id(cnpj)], autopad=autopad)[0])
 
-    # all complete CNPJ are 14 digits long
-    if len(cnpj) < 14:
-        if not autopad:
-            return False
-        cnpj = pad_cnpj(cnpj)
 
-    elif len(cnpj) > 14:
-        return False
+def validate_cnpj_batch(cnpjs, autopad=True):
+    """Check which CNPJs in a sequence are valid. Optionally pad if too short.
 
+    Returns:
+        Boolean NumPy array, one entry per CNPJ
+    """
+    # all complete CNPJ are 14 digits long
+    digits, valid = digit_matrix(cnpjs, 14, autopad=autopad)
     # 0 is invalid; smallest valid CNPJ is 191
-    if cnpj == '00000000000000':
-        return False
-
-    digits = [int(k) for k in cnpj[:13]]  # identifier digits
-    # validate the first check digit
-    cs = sum(w * k for w, k in zip(CNPJ_FIRST_WEIGHTS, digits[:-1])) % 11
-    cs = 0 if cs < 2 else 11 - cs
-    if cs != int(cnpj[12]):
-        return False  # first check digit is not correct
-    # validate the second check digit
-    cs = sum(w * k for w, k in zip(CNPJ_SECOND_WEIGHTS, digits)) % 11
-    cs = 0 if cs < 2 else 11 - cs
-    if cs != int(cnpj[13]):
-        return False  # second check digit is not correct
-    # both check digits are correct
-    return True
+    valid &= digits.any(axis=1)
+    # validate both check digits
+    valid &= mod11_check(digits[:, :12] @ np.array(CNPJ_FIRST_WEIGHTS)) == digits[:, 12]
+    valid &= mod11_check(digits[:, :13] @ np.array(CNPJ_SECOND_WEIGHTS)) == digits[:, 13]
+    return valid
 
 
 def cnpj_check_digits(cnpj):
@@ -105,11 +96,29 @@ def parse_cnpj(cnpj, formatted=True):
     return CNPJ(int(cnpj), int(firm), int(estbl), check, valid)
 
 
-def random_cnpj(formatted=True):
-    """Create a random, valid CNPJ identifier."""
-    firm = random.randint(10000000, 99999999)
-    establishment = random.choice(['0001', '0002', '0003', '0004', '0005'])
+def random_cnpj(formatted=True, rng=None):
+    """Create a random, valid CNPJ identifier, drawn from rng (a random.Random) or the random module."""
+    rng = rng or random
+    firm = rng.randint(10000000, 99999999)
+    establishment = rng.choice(['0001', '0002', '0003', '0004', '0005'])
     cnpj = cnpj_from_firm_id(firm, establishment)
     if formatted:
         return format_cnpj(cnpj)
     return cnpj
+
+
+def random_cnpj_batch(n, formatted=True, rng=None):
+    """Create n random, valid CNPJ identifiers at once.
+
+    Same distribution as random_cnpj: an 8-digit firm id and establishment
+    0001-0005. Both check digits come from a single matrix product.
+    """
+    rng = rng or np.random.default_rng()
+    digits = np.zeros((n, 14), dtype=np.int64)
+    digits[:, :8] = random_digits(n, 8, rng)
+    digits[:, 11] = rng.integers(1, 6, size=n)
+    weights = np.array([CNPJ_FIRST_WEIGHTS, CNPJ_SECOND_WEIGHTS[:-1]]).T
+    sums = digits[:, :12] @ weights
+    digits[:, 12] = mod11_check(sums[:, 0])
+    digits[:, 13] = mod11_check(sums[:, 1] + CNPJ_SECOND_WEIGHTS[-1] * digits[:, 12])
+    return digits_to_strings(digits, '##.###.###/####-##' if formatted else '#' * 14)
@@ -4,7 +4,9 @@
 import random
 import re
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, digit_matrix, digits_to_strings, pad_id, random_digits
 
 """
 Functions for working with Brazilian CPF identifiers.
@@ -17,31 +19,23 @@ CPF_WEIGHTS = [1, 2, 3, 4, 5, 6, 7, 8, 9]
 
 def validate_cpf(cpf, autopad=True):
     """Check whether CPF is valid."""
-    cpf = clean_id(cpf)
+    return bool(validate_cpf_batch([clean_id(cpf)], autopad=autopad)[0])
+
 
+def validate_cpf_batch(cpfs, autopad=True):
+    """Check which CPFs in a sequence are valid.
+
+    Returns:
+        Boolean NumPy array, one entry per CPF
+    """
     # all complete CPF are 11 digits long
-    if len(cpf) < 11:
-        if not autopad:
-            return False
-        cpf = pad_cpf(cpf)
-
-    elif len(cpf) > 11:
-        return False
-
-    if cpf == '00000000000':
-        return False
-
-    digits = [int(k) for k in cpf]  # identifier digits
-    # validate the first check digit
-    cs = (sum(w * k for w, k in zip(CPF_WEIGHTS, digits[:-2])) % 11) % 10
-    if cs != digits[-2]:
-        return False  # first check digit is not correct
-    # validate the second check digit
-    cs = (sum(w * k for w, k in zip(CPF_WEIGHTS, digits[1:-1])) % 11) % 10
-    if cs != digits[-1]:
-        return False  # second check digit is not correct
-    # both check digits are correct
-    return True
+    digits, valid = digit_matrix(cpfs, 11, autopad=autopad)
+    valid &= digits.any(axis=1)  # 00000000000 is not a valid CPF
+    # validate both check digits
+    weights = np.array(CPF_WEIGHTS)
+    valid &= digits[:, :9] @ weights % 11 % 10 == digits[:, 9]
+    valid &= digits[:, 1:10] @ weights % 11 % 10 == digits[:, 10]
+    return valid
 
 
 def cpf_check_digits(cpf):
@@ -72,10 +66,28 @@ def pad_cpf(cpf, validate=False):
     return padded
 
 
-def random_cpf(formatted=True):
-    """Create a random, valid CPF identifier."""
-    stem = random.randint(100000000, 999999999)
+def random_cpf(formatted=True, rng=None):
+    """Create a random, valid CPF identifier, drawn from rng (a random.Random) or the random module."""
+    stem = (rng or random).randint(100000000, 999999999)
     cpf = str(stem) + '{0}{1}'.format(*cpf_check_digits(stem))
     if formatted:
         return format_cpf(cpf)
     return cpf
+
+
+def random_cpf_batch(n, formatted=True, rng=None):
+    """Create n random, valid CPF identifiers at once.
+
+    Stems are drawn as an (n, 9) digit matrix, and the weighted sums of both
+    check digits come from a single matrix product.
+    """
+    rng = rng or np.random.default_rng()
+    digits = np.empty((n, 11), dtype=np.int64)
+    digits[:, :9] = random_digits(n, 9, rng)
+    # Column 0 weighs the stem for the first check digit, column 1 the stem's
+    # share of the second one (which skips the leading digit)
+    weights = np.array([CPF_WEIGHTS, [0, *CPF_WEIGHTS[:-1]]]).T
+    sums = digits[:, :9] @ weights
+    digits[:, 9] = sums[:, 0] % 11 % 10
+    digits[:, 10] = (sums[:, 1] + CPF_WEIGHTS[-1] * digits[:, 9]) % 11 % 10
+    return digits_to_strings(digits, '###.###.###-##' if formatted else '#' * 11)
@@ -0,0 +1,180 @@
+"""
+Buffered JSONL writer.
+
+Records are serialized a chunk at a time into one byte buffer, with orjson
+when it is installed, and the buffer is written out in blocks of at least
+`buffer_size` bytes: one write call per block instead of one per record.
+Both serializers produce the same compact UTF-8 lines, so the output does
+not depend on whether orjson is installed.
+
+Files ending in .gz or .zst are compressed on the fly: every block is
+compressed on a thread pool, as an independent gzip member or zstd frame,
+while the caller goes on producing records. zlib and zstd release the GIL,
+so compression overlaps with generation; the members are written in order
+and their concatenation is a valid gzip/zstd stream, as pigz does it.
+"""
+
+import gzip
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up: pip install orjson
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: pip install zstandard, needed for .zst output
+    zstandard = None
+
+# Bytes buffered before they are written to the file (or compressed as one block)
+DEFAULT_BUFFER_SIZE = 1 << 20
+# Threads compressing blocks of .gz/.zst output
+DEFAULT_COMPRESS_THREADS = min(4, os.cpu_count() or 1)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_records(records: Iterable[dict]) -> bytes:
+    """Serialize records as JSONL: one compact JSON object per line, UTF-8 encoded.
+
+    Args:
+        records: Dictionaries of JSON-serializable values
+
+    Returns:
+        The lines, each ending with a newline
+    """
+    if orjson is not None:
+        dumps = orjson.dumps
+        option = orjson.OPT_APPEND_NEWLINE
+        return b''.join([dumps(record, option=option) for record in records])
+    encode = _encoder.encode
+    return ''.join([encode(record) + '\n' for record in records]).encode('utf-8')
+
+
+def _gzip_block(block: bytes) -> bytes:
+    return gzip.compress(block, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _zstd_block(block: bytes) -> bytes:
+    # Compressor objects must not be shared between threads
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(block)
+
+
+def block_compressor(path: str | Path) -> Callable[[bytes], bytes] | None:
+    """Return the function compressing one block of output for this file, from its extension.
+
+    Args:
+        path: Output file; .gz and .zst files are compressed
+
+    Returns:
+        Block compressor, or None for uncompressed output
+
+    Raises:
+        ValueError: For .zst files when the zstandard package is not installed
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.gz':
+        return _gzip_block
+    if suffix == '.zst':
+        if zstandard is None:
+            raise ValueError('Writing .zst files needs the zstandard package (pip install zstandard)')
+        return _zstd_block
+    return None
+
+
+class JsonlWriter:
+    """Append records to a JSONL file through a large in-memory buffer.
+
+    Use as a context manager, or call `close` to write out what is still buffered.
+    Output to .gz and .zst files is compressed in the background (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        append: bool = True,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        compress_threads: int = DEFAULT_COMPRESS_THREADS,
+    ):
+        """Open the file, creating its directory if needed.
+
+        Args:
+            path: JSONL file to write; .gz and .zst files are compressed
+            append: If True, append to an existing file instead of overwriting it
+            buffer_size: Bytes buffered before they are written to the file
+            compress_threads: Number of threads compressing blocks of .gz/.zst output
+
+        Raises:
+            ValueError: For .zst files when the zstandard package is not installed
+        """
+        path = Path(path)
+        self._compress = block_compressor(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unbuffered: the writer does its own buffering
+        self._file = path.open('ab' if append else 'wb', buffering=0)
+        self._buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._executor = None
+        self._pending: deque[Future] = deque()
+        self._max_pending = 2 * max(1, compress_threads)
+        if self._compress is not None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, compress_threads), thread_name_prefix='jsonl-compress')
+
+    def write(self, records: Iterable[dict]) -> None:
+        """Buffer records, writing the buffer out once it holds buffer_size bytes."""
+        records = list(records)
+        self._buffer += dumps_records(records)
+        self.written += len(records)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand everything buffered to the file, or to the compressor threads.
+
+        Compressed blocks are written once they are ready; at most a few are in
+        flight, which bounds memory use when compression is the slower side.
+        """
+        if not self._buffer:
+            return
+        if self._executor is None:
+            self._write(self._buffer)
+        else:
+            self._pending.append(self._executor.submit(self._compress, bytes(self._buffer)))
+            while self._pending and (len(self._pending) >= self._max_pending or self._pending[0].done()):
+                self._write(self._pending.popleft().result())
+        self._buffer.clear()
+
+    def _write(self, data: bytes | bytearray) -> None:
+        view = memoryview(data)
+        while view:
+            # Raw writes may be partial
+            view = view[self._file.write(view) :]
+        view.release()
+
+    def close(self) -> None:
+        """Flush the buffer, wait for the compressed blocks and close the file."""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+            while self._pending:
+                self._write(self._pending.popleft().result())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+            self._file.close()
+
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,170 @@
+"""
+Columnar Parquet/Arrow output.
+
+Records in the `parse_result` format are converted a chunk at a time into
+Arrow record batches with a fixed schema, and written to Parquet one row
+group at a time: at most one row group of records is held in memory,
+whatever the number of records written. city, state and state_abbr take
+few distinct values; they are dictionary-encoded Arrow columns, which
+Parquet stores as dictionary pages and readers load back as categoricals.
+
+pyarrow is optional (pip install pyarrow); without it these functions
+raise a ValueError.
+"""
+
+from collections.abc import Iterable
+from enum import Enum
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: pip install pyarrow, needed for Parquet/Arrow output
+    pa = pq = None
+
+# Columns of a record, in `parse_result` order
+RECORD_FIELDS = (
+    'name',
+    'middle_name',
+    'surnames',
+    'city',
+    'state',
+    'state_abbr',
+    'cep',
+    'street',
+    'neighborhood',
+    'building_number',
+    'cpf',
+    'rg',
+    'pis',
+    'cnpj',
+    'cei',
+    'phone',
+)
+# Low-cardinality columns stored as dictionary indices into their distinct values
+DICTIONARY_FIELDS = ('city', 'state', 'state_abbr')
+# Rows per Parquet row group, and so at most buffered by ParquetWriter
+DEFAULT_ROW_GROUP_SIZE = 100_000
+DEFAULT_COMPRESSION = 'zstd'
+
+
+class OutputFormat(str, Enum):
+    """File formats generated samples can be saved in"""
+
+    JSONL = 'jsonl'
+    PARQUET = 'parquet'
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ValueError('Parquet/Arrow output needs the pyarrow package (pip install pyarrow)')
+
+
+def record_schema() -> 'pa.Schema':
+    """Return the Arrow schema of `parse_result` records: nullable strings, dictionary-encoded where few values repeat.
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    _require_pyarrow()
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([(field, category if field in DICTIONARY_FIELDS else pa.string()) for field in RECORD_FIELDS])
+
+
+def records_to_batch(records: Iterable[dict], schema: 'pa.Schema | None' = None) -> 'pa.RecordBatch':
+    """Convert records to one Arrow record batch, a column at a time.
+
+    Args:
+        records: Dictionaries in the `parse_result` format
+        schema: Schema of the batch (defaults to `record_schema()`)
+
+    Returns:
+        Record batch with one row per record
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    schema = schema or record_schema()
+    records = list(records)
+    columns = [pa.array([record[field.name] for record in records], type=field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def chunks_to_table(chunks: Iterable[Iterable[dict]]) -> 'pa.Table':
+    """Convert chunks of records to one Arrow table, a record batch per chunk.
+
+    Args:
+        chunks: Iterable yielding lists of dictionaries in the `parse_result` format
+
+    Returns:
+        Table whose dictionary columns share one dictionary across batches
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    schema = record_schema()
+    batches = [records_to_batch(chunk, schema) for chunk in chunks]
+    return pa.Table.from_batches(batches, schema=schema).unify_dictionaries()
+
+
+class ParquetWriter:
+    """Write records to a Parquet file in row groups of row_group_size rows.
+
+    Use as a context manager, or call `close` to write out the last, partial row group.
+    Parquet files cannot be appended to: an existing file is overwritten.
+    """
+
+    def __init__(self, path: str | Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE, compression: str = DEFAULT_COMPRESSION):
+        """Open the file, creating its directory if needed.
+
+        Args:
+            path: Parquet file to write
+            row_group_size: Rows per row group; at most this many are buffered
+            compression: Parquet compression codec (e.g. 'zstd', 'snappy' or 'none')
+
+        Raises:
+            ValueError: If pyarrow is not installed
+        """
+        self.schema = record_schema()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._batches: list[pa.RecordBatch] = []
+        self._buffered = 0
+        self.row_group_size = max(1, row_group_size)
+        self.written = 0
+
+    def write(self, records: Iterable[dict]) -> None:
+        """Buffer records, writing a row group each time row_group_size rows are buffered."""
+        batch = records_to_batch(records, self.schema)
+        self._batches.append(batch)
+        self._buffered += batch.num_rows
+        self.written += batch.num_rows
+        if self._buffered >= self.row_group_size:
+            table = pa.Table.from_batches(self._batches, schema=self.schema)
+            full = table.num_rows // self.row_group_size * self.row_group_size
+            self._write_table(table.slice(0, full))
+            self._batches = table.slice(full).to_batches()
+            self._buffered = table.num_rows - full
+
+    def _write_table(self, table: 'pa.Table') -> None:
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def close(self) -> None:
+        """Write the buffered rows as a last row group and close the file."""
+        if self._writer is None:
+            return
+        try:
+            if self._buffered:
+                self._write_table(pa.Table.from_batches(self._batches, schema=self.schema))
+        finally:
+            self._writer.close()
+            self._writer = None
+            self._batches = []
+            self._buffered = 0
+
+    def __enter__(self) -> 'ParquetWriter':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 
 
+import random
 import re
-from random import randint
 
-from .util import clean_id, pad_id
+import numpy as np
+
+from .util import clean_id, digit_matrix, digits_to_strings, mod11_check, pad_id, random_digits
 
 """
 Functions for working with Brazilian PIS/PASEP identifiers.
@@ -17,21 +19,20 @@ PIS_WEIGHTS = [3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
 
 def validate_pis(pis, autopad=True):
     """Check whether PIS/PASEP is valid. Optionally pad if too short."""
-    pis = clean_id(pis)
-
-    # all complete PIS/PASEP are 11 digits long
-    if len(pis) < 11:
-        if not autopad:
-            return False
-        pis = pad_pis(pis)
+    return bool(validate_pis_batch([clean_id(pis)], autopad=autopad)[0])
 
-    elif len(pis) > 11:
-        return False
 
-    if pis == '00000000000':
-        return False
+def validate_pis_batch(pis_list, autopad=True):
+    """Check which PIS/PASEP in a sequence are valid. Optionally pad if too short.
 
-    return int(pis[-1]) == _pis_check(pis)
+    Returns:
+        Boolean NumPy array, one entry per PIS/PASEP
+    """
+    # all complete PIS/PASEP are 11 digits long
+    digits, valid = digit_matrix(pis_list, 11, autopad=autopad)
+    valid &= digits.any(axis=1)  # 00000000000 is not a valid PIS/PASEP
+    valid &= mod11_check(digits[:, :10] @ np.array(PIS_WEIGHTS)) == digits[:, 10]
+    return valid
 
 
 def pis_check_digit(pis):
@@ -62,15 +63,24 @@ def pad_pis(pis, validate=False):
     return padded
 
 
-def random_pis(formatted=True):
-    """Create a random, valid PIS identifier."""
-    pis = randint(1000000000, 9999999999)
+def random_pis(formatted=True, rng=None):
+    """Create a random, valid PIS identifier, drawn from rng (a random.Random) or the random module."""
+    pis = (rng or random).randint(1000000000, 9999999999)
     pis = str(pis) + str(pis_check_digit(pis))
     if formatted:
         return format_pis(pis)
     return pis
 
 
+def random_pis_batch(n, formatted=True, rng=None):
+    """Create n random, valid PIS identifiers at once."""
+    rng = rng or np.random.default_rng()
+    digits = np.empty((n, 11), dtype=np.int64)
+    digits[:, :10] = random_digits(n, 10, rng)
+    digits[:, 10] = mod11_check(digits[:, :10] @ np.array(PIS_WEIGHTS))
+    return digits_to_strings(digits, '###.####.###-#' if formatted else '#' * 11)
+
+
 def _pis_check(pis):
     """Calculate check digit from string."""
     digits = [int(k) for k in pis[:11]]
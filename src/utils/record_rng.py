@@ -0,0 +1,65 @@
+"""
+Counter-based random streams for reproducible generation.
+
+Records are generated in blocks of a fixed size. Block k of a run with seed s
+draws from a Philox generator keyed by s whose 256-bit counter starts at k in
+its top word, so the stream of a block is a pure function of (s, k) and never
+overlaps the stream of another block. Record i belongs to block
+i // block_size: any record can be regenerated from the seed without
+generating the blocks before it.
+
+Within a block, the vectorized stages draw every record's values at once.
+The per-record stages (RG, phone, address) each draw from a generator of
+their own record, seeded from one batch draw for the whole block. A record
+therefore stays the same whichever other records of its block are
+finished, and in whatever order their CEP lookups complete.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Number of records drawn from one block's stream. The random values of a block
+# are always drawn whole, so this bounds the draws wasted at the edges of a
+# regenerated range; only the records in the range are finished.
+DEFAULT_BLOCK_SIZE = 1_000
+
+
+@dataclass(frozen=True)
+class BlockRng:
+    """The random sources of one block of records.
+
+    Vectorized stages (locations, names, CPF/CNPJ/PIS/CEI) draw from np_rng;
+    per-record stages (RG, phone, address) from one `random.Random` per
+    record, seeded from `record_seeds`.
+    """
+
+    np_rng: np.random.Generator
+
+    def record_seeds(self, n: int) -> list[int]:
+        """Draw the seeds of the per-record generators of the block's n records, in one batch."""
+        return self.np_rng.integers(1 << 63, size=n).tolist()
+
+
+def new_seed() -> int:
+    """Draw a fresh 128-bit seed from OS entropy, e.g. for a run without --seed."""
+    return int(np.random.SeedSequence().entropy)
+
+
+def block_rng(seed: int, block: int) -> BlockRng:
+    """Return the random sources of one block of a run.
+
+    Args:
+        seed: Seed of the run
+        block: Index of the block (record index // block size)
+
+    Returns:
+        BlockRng whose draws depend only on seed and block
+
+    Raises:
+        ValueError: If seed or block is negative
+    """
+    if seed < 0 or block < 0:
+        raise ValueError('Seed and block must not be negative')
+    key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+    return BlockRng(np.random.Generator(np.random.Philox(key=key, counter=[0, 0, 0, block])))
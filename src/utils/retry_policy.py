@@ -0,0 +1,165 @@
+"""
+Retry policy and circuit breaker for CEP lookups.
+
+`RetryPolicy` decides how long to wait before retrying a transient failure
+(exponential backoff with jitter, capped per delay and in total elapsed time).
+`CircuitBreaker` tracks the outcome of recent attempts and fails fast once too
+many of them fail, so an unreachable provider costs one quick error per CEP
+instead of a full round of retries each.
+"""
+
+import random
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 0.1
+DEFAULT_MAX_DELAY = 2.0
+DEFAULT_MAX_ELAPSED = 10.0
+DEFAULT_BREAKER_THRESHOLD = 0.5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a sliding window of recent attempts.
+
+    Closed: every attempt is allowed. Once at least `min_calls` of the last
+    `window` attempts were recorded and the share of failures reaches
+    `threshold`, the breaker opens and rejects attempts for `cooldown` seconds.
+    It then lets a single probe through (half-open): a success closes it
+    again, a failure reopens it for another cooldown.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_BREAKER_THRESHOLD,
+        window: int = 50,
+        min_calls: int = 20,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            threshold: Failure rate (0-1] that opens the breaker; 0 disables it
+            window: Number of recent attempts the failure rate is computed over
+            min_calls: Attempts needed in the window before the breaker can open
+            cooldown: Seconds the breaker stays open before letting a probe through
+            clock: Time source, injectable for tests
+        """
+        if not 0 <= threshold <= 1:
+            raise ValueError('Circuit breaker threshold must be between 0 and 1')
+        self.threshold = threshold
+        self.min_calls = min(min_calls, window)
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.opened = 0
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def failure_rate(self) -> float:
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def allow(self) -> bool:
+        """Return whether an attempt may be made now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._outcomes.append(True)
+        if self.state == self.HALF_OPEN:
+            self._outcomes.clear()
+            self.state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        self._outcomes.append(False)
+        if self.state == self.HALF_OPEN or (
+            self.threshold and len(self._outcomes) >= self.min_calls and self.failure_rate >= self.threshold
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened += 1
+        self._opened_at = self.clock()
+        self._probing = False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How transient CEP lookup failures are retried.
+
+    The n-th retry waits `base_delay * multiplier ** (n - 1)` seconds, capped at
+    `max_delay`, of which a random `jitter` share is dropped so that lookups
+    failing together do not retry in lockstep. No retry is made past
+    `max_attempts` attempts or once waiting would exceed `max_elapsed` seconds.
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    max_elapsed: float = DEFAULT_MAX_ELAPSED
+    breaker_threshold: float = DEFAULT_BREAKER_THRESHOLD
+    breaker_window: int = 50
+    breaker_min_calls: int = 20
+    breaker_cooldown: float = DEFAULT_BREAKER_COOLDOWN
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError('Retry policy needs at least one attempt')
+        if self.base_delay < 0 or self.max_delay < 0 or self.max_elapsed < 0:
+            raise ValueError('Retry delays must not be negative')
+        if not 0 <= self.jitter <= 1:
+            raise ValueError('Retry jitter must be between 0 and 1')
+
+    def backoff(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * (rng or random).random())
+
+    def next_delay(self, attempt: int, elapsed: float, rng: random.Random | None = None) -> float | None:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            attempt: Number of attempts made so far
+            elapsed: Seconds spent on the lookup so far
+            rng: Random source for the jitter
+
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt, rng)
+        if elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+    def circuit_breaker(self, clock: Callable[[], float] = time.monotonic) -> CircuitBreaker:
+        """Return a new circuit breaker configured by this policy."""
+        return CircuitBreaker(
+            threshold=self.breaker_threshold,
+            window=self.breaker_window,
+            min_calls=self.breaker_min_calls,
+            cooldown=self.breaker_cooldown,
+            clock=clock,
+        )
@@ -1,5 +1,7 @@
 import re
 
+import numpy as np
+
 """
 Helper functions for validating identifiers.
 
@@ -26,3 +28,91 @@ def pad_id(identifier, fmt):
             identifier = int(identifier)
 
     return fmt % identifier
+
+
+def random_digits(n, width, rng, leading_nonzero=True):
+    """Draw an (n, width) matrix of random digits, one identifier stem per row.
+
+    With leading_nonzero the first digit is 1-9, which is the same as drawing
+    the stem uniformly from 10**(width - 1) to 10**width - 1.
+    """
+    digits = rng.integers(0, 10, size=(n, width), dtype=np.int64)
+    if leading_nonzero and width:
+        digits[:, 0] = rng.integers(1, 10, size=n)
+    return digits
+
+
+def mod11_check(weighted_sum):
+    """Vectorized '0 if sum % 11 < 2 else 11 - sum % 11' check digit."""
+    remainder = weighted_sum % 11
+    return np.where(remainder < 2, 0, 11 - remainder)
+
+
+def digits_to_strings(digits, template):
+    """Render each row of a digit matrix into template, one '#' per digit.
+
+    Works on an ASCII byte matrix, so no per-identifier Python formatting is done.
+    """
+    chars = np.frombuffer(template.encode('ascii'), dtype=np.uint8)
+    slots = np.flatnonzero(chars == ord('#'))
+    if len(slots) != digits.shape[1]:
+        raise ValueError(f'Template {template!r} needs {len(slots)} digits, got {digits.shape[1]}')
+    out = np.empty((len(digits), len(chars)), dtype=np.uint8)
+    out[:] = chars
+    out[:, slots] = digits + ord('0')
+    return out.view(f'S{len(chars)}').ravel().astype(f'U{len(chars)}').tolist()
+
+
+def digit_matrix(identifiers, width, autopad=True):
+    """Turn identifiers into an (n, width) digit matrix, the batch form of clean_id + pad_id.
+
+    Non-digit characters are dropped and the remaining digits are right-aligned,
+    so shorter identifiers get leading zeros. Rows with more than width digits,
+    or with fewer when autopad is False, are flagged as unusable.
+
+    Returns:
+        Tuple of (digit matrix, boolean mask of rows that have a usable length)
+    """
+    values = np.asarray(identifiers, dtype=str)
+    n = len(values)
+    if n == 0 or values.itemsize == 0:
+        chars = np.zeros((n, 0), dtype=np.uint32)
+    else:
+        # A fixed-width unicode array is a matrix of code points
+        chars = values.view(np.uint32).reshape(n, -1)
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+
+    # Fast path: every identifier has its digits in the same places (e.g. all
+    # formatted alike), so the digit columns can be sliced out directly
+    if n and is_digit[0].sum() == width and (is_digit == is_digit[0]).all():
+        return (chars[:, is_digit[0]] - ord('0')).astype(np.int64), np.ones(n, dtype=bool)
+
+    position = np.cumsum(is_digit, axis=1, dtype=np.int16)
+    count = position[:, -1].astype(np.int64) if chars.shape[1] else np.zeros(n, dtype=np.int64)
+
+    usable = count <= width
+    if not autopad:
+        usable &= count == width
+
+    digits = np.zeros((n, width), dtype=np.int64)
+    rows, cols = np.nonzero(is_digit & usable[:, None])
+    digits[rows, width - count[rows] + position[rows, cols] - 1] = chars[rows, cols] - ord('0')
+    return digits, usable
+
+
+def cep_to_int(cep):
+    """Parse a CEP (with or without dash, or an integer that lost its leading zeros) into an integer.
+
+    Returns -1 when the CEP has no digits or more than eight.
+    """
+    digits = clean_id(int(cep) if isinstance(cep, np.integer) else cep) if cep is not None else ''
+    return int(digits) if digits and len(digits) <= 8 else -1
+
+
+def ceps_to_ints(ceps):
+    """Batch cep_to_int: an int64 array with -1 wherever the CEP has more than eight digits."""
+    if isinstance(ceps, np.ndarray) and ceps.dtype.kind in 'iu':
+        keys = ceps.astype(np.int64)
+        return np.where((keys >= 0) & (keys <= 99_999_999), keys, -1)
+    digits, usable = digit_matrix(list(ceps), 8)
+    return np.where(usable, digits @ 10 ** np.arange(7, -1, -1, dtype=np.int64), -1)
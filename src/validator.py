@@ -0,0 +1,211 @@
+"""
+Bulk Document Validator
+
+Streams one column of a JSONL or CSV file and validates it in vectorized chunks,
+optionally spreading the chunks across several processes.
+"""
+
+import csv
+import json
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.cei import validate_cei_batch
+from src.utils.cnpj import validate_cnpj_batch
+from src.utils.cpf import validate_cpf_batch
+from src.utils.pis import validate_pis_batch
+
+# Number of rows validated per chunk
+DEFAULT_VALIDATION_CHUNK_SIZE = 50_000
+
+
+class DocumentKind(str, Enum):
+    """Document types the validator understands"""
+
+    CPF = 'cpf'
+    CNPJ = 'cnpj'
+    PIS = 'pis'
+    CEI = 'cei'
+
+
+class FileFormat(str, Enum):
+    """Input formats the validator can stream"""
+
+    JSONL = 'jsonl'
+    CSV = 'csv'
+
+
+BATCH_VALIDATORS: dict[DocumentKind, Callable[..., np.ndarray]] = {
+    DocumentKind.CPF: validate_cpf_batch,
+    DocumentKind.CNPJ: validate_cnpj_batch,
+    DocumentKind.PIS: validate_pis_batch,
+    DocumentKind.CEI: validate_cei_batch,
+}
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of validating one column of a file.
+
+    Row numbers are 1-based positions of the records in the file: non-blank
+    lines for JSONL, data rows after the header for CSV.
+    """
+
+    kind: DocumentKind
+    column: str
+    total: int = 0
+    valid: int = 0
+    invalid_rows: list[int] = field(default_factory=list)
+
+    @property
+    def invalid(self) -> int:
+        return self.total - self.valid
+
+    def add_chunk(self, first_row: int, valid: np.ndarray) -> None:
+        """Fold the result of one validated chunk into the report."""
+        self.total += len(valid)
+        self.valid += int(np.count_nonzero(valid))
+        self.invalid_rows.extend((np.flatnonzero(~valid) + first_row).tolist())
+
+
+def detect_format(path: str | Path) -> FileFormat:
+    """Guess the file format from its extension.
+
+    Raises:
+        ValueError: If the extension is not .jsonl, .ndjson or .csv
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in {'.jsonl', '.ndjson'}:
+        return FileFormat.JSONL
+    if suffix == '.csv':
+        return FileFormat.CSV
+    raise ValueError(f'Cannot detect file format from extension: {suffix!r} (use --format)')
+
+
+def iter_chunks(
+    path: str | Path, column: str, file_format: FileFormat, chunk_size: int = DEFAULT_VALIDATION_CHUNK_SIZE, delimiter: str = ','
+) -> Iterator[tuple[int, list[str]]]:
+    """Stream a file as chunks of raw records.
+
+    JSONL chunks hold the undecoded lines, so that decoding happens wherever the
+    chunk is validated. CSV chunks hold the values of the column already, since
+    csv records can span several lines.
+
+    Yields:
+        Tuples of (row number of the first record, list of records)
+
+    Raises:
+        ValueError: If a CSV file has no header or the column is not in it
+    """
+    first_row = 1
+    chunk = []
+    with Path(path).open(encoding='utf-8', newline='') as file:
+        if file_format == FileFormat.JSONL:
+            records = (line for line in file if line.strip())
+        else:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError(f'CSV file has no header: {path}')
+            if column not in header:
+                raise ValueError(f'Column {column!r} not found in CSV header: {header}')
+            index = header.index(column)
+            records = (row[index] if index < len(row) else '' for row in reader)
+
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield first_row, chunk
+                first_row += len(chunk)
+                chunk = []
+    if chunk:
+        yield first_row, chunk
+
+
+def validate_values(kind: DocumentKind, values: list, autopad: bool = True) -> np.ndarray:
+    """Validate a list of identifiers; missing values (None) are invalid."""
+    return BATCH_VALIDATORS[kind](['' if value is None else value for value in values], autopad=autopad)
+
+
+def _column_values(lines: list[str], column: str) -> list:
+    """Pull one key out of JSONL lines; undecodable lines and missing keys give None."""
+    values = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = None
+        values.append(record.get(column) if isinstance(record, dict) else None)
+    return values
+
+
+def _validate_chunk(kind: DocumentKind, column: str, file_format: FileFormat, autopad: bool, records: list[str]) -> np.ndarray:
+    """Validate one chunk from `iter_chunks`. Runs in worker processes, so it must stay picklable."""
+    values = _column_values(records, column) if file_format == FileFormat.JSONL else records
+    return validate_values(kind, values, autopad=autopad)
+
+
+def validate_file(
+    path: str | Path,
+    kind: DocumentKind,
+    column: str,
+    file_format: FileFormat | None = None,
+    chunk_size: int = DEFAULT_VALIDATION_CHUNK_SIZE,
+    workers: int = 1,
+    autopad: bool = True,
+    delimiter: str = ',',
+    progress_callback: Callable[[int], None] | None = None,
+) -> ValidationReport:
+    """
+    Validate every value of one column in a JSONL or CSV file.
+
+    The file is read as a stream, so memory use is bounded by the chunk size and
+    the number of chunks in flight, not by the file size.
+
+    Args:
+        path: JSONL or CSV file to validate
+        kind: Type of document stored in the column
+        column: JSON key or CSV header of the column
+        file_format: Input format (detected from the extension by default)
+        chunk_size: Number of rows validated per chunk
+        workers: Number of processes validating chunks (1 validates in this process)
+        autopad: Whether to pad identifiers that lost their leading zeros
+        delimiter: CSV field delimiter
+        progress_callback: Optional callback receiving the number of rows validated so far
+
+    Returns:
+        ValidationReport with the counts and the invalid row numbers
+    """
+    kind = DocumentKind(kind)
+    file_format = FileFormat(file_format) if file_format else detect_format(path)
+    report = ValidationReport(kind=kind, column=column)
+    chunks = iter_chunks(path, column, file_format, chunk_size=chunk_size, delimiter=delimiter)
+
+    def collect(first_row: int, valid: np.ndarray) -> None:
+        report.add_chunk(first_row, valid)
+        if progress_callback:
+            progress_callback(report.total)
+
+    if workers <= 1:
+        for first_row, records in chunks:
+            collect(first_row, _validate_chunk(kind, column, file_format, autopad, records))
+        return report
+
+    # Keep a bounded number of chunks in flight and collect them in file order
+    pending: deque[tuple[int, Future]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for first_row, records in chunks:
+            pending.append((first_row, executor.submit(_validate_chunk, kind, column, file_format, autopad, records)))
+            if len(pending) >= workers * 2:
+                row, future = pending.popleft()
+                collect(row, future.result())
+        while pending:
+            row, future = pending.popleft()
+            collect(row, future.result())
+    return report